@@ -0,0 +1,38 @@
+from typing import Dict, List, Tuple, Optional, Generator
+
+import numpy as np
+
+from .csr import as_csr
+from .dijkstra import best_first_deltas
+from .frames import DeltaFrame, Frame, materialize_colors
+
+HEURISTICS = ("manhattan", "euclidean")
+
+def heuristic_table(graph, goal: int, heuristic: str = "manhattan") -> memoryview:
+    """Distance estimate from every node to goal, computed once from the stored positions.
+
+    Admissible when every edge weight is at least the positional distance it spans:
+    Manhattan on the unit grids, Euclidean on graphs weighted by edge length.
+    """
+    delta = graph.positions - graph.positions[goal]
+    if heuristic == "manhattan":
+        h = np.abs(delta).sum(axis=1)
+    elif heuristic == "euclidean":
+        h = np.hypot(delta[:, 0], delta[:, 1])
+    else:
+        raise ValueError(f"Unknown heuristic: {heuristic}")
+    return memoryview(np.ascontiguousarray(h, dtype=np.float64))
+
+def astar_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None, weights=None,
+                 heuristic: str = "manhattan") -> Generator[DeltaFrame, None, None]:
+    """A* search: Dijkstra's loop keyed on dist + heuristic(node, goal). Same delta frames and meta.
+    Without a goal there is nothing to aim at and it degrades to Dijkstra.
+    """
+    graph = as_csr(positions, edges, neighbors, weights)
+    h = heuristic_table(graph, goal, heuristic) if goal is not None else None
+    return best_first_deltas(graph, start, goal, h)
+
+def astar(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None, weights=None,
+          heuristic: str = "manhattan") -> Generator[Frame, None, None]:
+    """A* yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges, astar_deltas(positions, edges, neighbors, start, goal, weights, heuristic))
@@ -1,47 +1,46 @@
 from typing import Dict, List, Tuple, Optional, Generator
 
-Frame = Tuple[Dict, List[Tuple[int,int]], Dict[int, str], Dict[Tuple[int,int], str], Dict]
+from .csr import adjacency, as_csr
+from .frames import ColorState, DeltaFrame, Frame, materialize_colors
 
-def bfs(positions, edges, neighbors, start: int, goal: Optional[int] = None) -> Generator[Frame, None, None]:
+def bfs_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None) -> Generator[DeltaFrame, None, None]:
     """Breadth-first search on an unweighted graph.
-    Yields frames with node_colors/edge_colors and meta (frontier size, visited count, found flag).
+    Yields delta frames: (node color changes, edge_colors, meta with frontier size, visited count, found flag).
+    `positions` may be a CSRGraph, in which case edges/neighbors are not needed.
     """
     from collections import deque
 
+    offsets, indices, _ = adjacency(as_csr(positions, edges, neighbors))
+
     visited = set()
+    discovered = {start}  # visited or still queued: O(1) membership instead of scanning the deque
     parent = {start: None}
     q = deque([start])
+    state = ColorState(pinned={goal: "#f59e0b"} if goal is not None else None)  # amber goal
 
-    def colors(current=None, frontier=None):
-        node_colors = {}
-        if frontier:
-            for f in frontier:
-                node_colors[f] = "#60a5fa"  # blue frontier
-        for v in visited:
-            node_colors[v] = "#10b981"  # green visited
-        if current is not None:
-            node_colors[current] = "#ef4444"  # red current
-        if goal is not None:
-            node_colors[goal] = "#f59e0b"  # amber goal
-        return node_colors, {}
-
-    node_colors, edge_colors = colors(current=None, frontier=list(q))
-    yield positions, edges, node_colors, edge_colors, {"visited": 0, "frontier": len(q), "found": False}
+    state.set(start, "#60a5fa")  # blue frontier
+    yield state.flush(), {}, {"visited": 0, "frontier": len(q), "found": False}
 
+    previous = None
     while q:
         current = q.popleft()
         if current not in visited:
             visited.add(current)
-            node_colors, edge_colors = colors(current, list(q))
-            yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "frontier": len(q), "found": current == goal}
+            if previous is not None:
+                state.set(previous, "#10b981")  # green visited
+            state.set(current, "#ef4444")  # red current
+            previous = current
+            yield state.flush(), {}, {"visited": len(visited), "frontier": len(q), "found": current == goal}
             if current == goal:
                 break
-            for nxt in neighbors[current]:
-                if nxt not in visited and nxt not in q:
+            for nxt in indices[offsets[current]:offsets[current + 1]]:
+                if nxt not in discovered:
+                    discovered.add(nxt)
                     parent[nxt] = current
                     q.append(nxt)
-                    node_colors, edge_colors = colors(current=None, frontier=list(q))
-                    yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "frontier": len(q), "found": False}
+                    state.set(current, "#10b981")
+                    state.set(nxt, "#60a5fa")
+                    yield state.flush(), {}, {"visited": len(visited), "frontier": len(q), "found": False}
 
     # Final highlight of shortest path if goal reached
     if goal is not None and goal in visited:
@@ -54,7 +53,12 @@ def bfs(positions, edges, neighbors, start: int, goal: Optional[int] = None) ->
         node_colors = {n: "#10b981" for n in visited}
         for n in path:
             node_colors[n] = "#eab308"  # yellow path
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "frontier": 0, "found": True, "path": path}
+        state.reset(node_colors)
+        yield state.flush(), {}, {"visited": len(visited), "frontier": 0, "found": True, "path": path}
     else:
-        node_colors = {n: "#10b981" for n in visited}
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "frontier": 0, "found": False}
+        state.reset({n: "#10b981" for n in visited})
+        yield state.flush(), {}, {"visited": len(visited), "frontier": 0, "found": False}
+
+def bfs(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None) -> Generator[Frame, None, None]:
+    """Breadth-first search yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges, bfs_deltas(positions, edges, neighbors, start, goal))
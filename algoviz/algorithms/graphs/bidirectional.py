@@ -0,0 +1,250 @@
+from typing import Dict, List, Tuple, Optional, Generator, Sequence
+
+from .bfs import bfs_deltas
+from .csr import adjacency, as_csr
+from .dijkstra import best_first_deltas
+from .frames import ColorState, DeltaFrame, Frame, materialize_colors
+from .heap import IndexedHeap
+
+# (frontier, settled) colors of the search from start and of the one from goal
+FORWARD = ("#60a5fa", "#10b981")  # blue / green, as in bfs
+BACKWARD = ("#c084fc", "#2dd4bf")  # purple / teal
+# (frontier, settled) per seed of a multi-source search, cycled
+REGION_COLORS = (("#93c5fd", "#2563eb"), ("#f9a8d4", "#db2777"), ("#6ee7b7", "#059669"), ("#fcd34d", "#d97706"),
+                 ("#c4b5fd", "#7c3aed"), ("#67e8f9", "#0891b2"), ("#fdba74", "#ea580c"), ("#bef264", "#65a30d"))
+
+def _join_path(parents: Tuple[Dict, Dict], forward_end: int, backward_end: int) -> List[int]:
+    """start .. forward_end then backward_end .. goal, following each side's parent links."""
+    path = []
+    cur = forward_end
+    while cur is not None:
+        path.append(cur)
+        cur = parents[0].get(cur)
+    path.reverse()
+    cur = backward_end
+    while cur is not None:
+        if cur != path[-1]:
+            path.append(cur)
+        cur = parents[1].get(cur)
+    return path
+
+def _final_frame(state: ColorState, settled: Tuple, path: Optional[List[int]]) -> Dict[int, str]:
+    node_colors = {n: FORWARD[1] for n in settled[0]}
+    node_colors.update({n: BACKWARD[1] for n in settled[1]})
+    for n in path or ():
+        node_colors[n] = "#eab308"  # yellow path
+    state.reset(node_colors)
+    return state.flush()
+
+def bidirectional_bfs_deltas(positions, edges=None, neighbors=None, start: int = 0,
+                             goal: Optional[int] = None) -> Generator[DeltaFrame, None, None]:
+    """Breadth-first search from start and from goal at once, meeting in the middle.
+
+    Each round expands one whole BFS level of the side with the smaller
+    frontier. The first level that touches the other side's discovered nodes
+    ends the search, and the shortest of the meetings seen in that level is
+    the path. Each side only grows to about half the distance, so on large
+    grids this expands far fewer nodes than bfs. Meta adds "forward" and
+    "backward" expansion counts to bfs's counters. Without a distinct goal
+    it is plain bfs.
+    """
+    if goal is None or goal == start:
+        yield from bfs_deltas(positions, edges, neighbors, start, goal)
+        return
+    from collections import deque
+
+    offsets, indices, _ = adjacency(as_csr(positions, edges, neighbors))
+    depth = ({start: 0}, {goal: 0})  # discovered nodes (settled or queued) and their BFS level
+    parents = ({start: None}, {goal: None})
+    settled = (set(), set())
+    queues = (deque([start]), deque([goal]))
+    colors = (FORWARD, BACKWARD)
+    state = ColorState(pinned={goal: "#f59e0b"})  # amber goal
+
+    def meta(found=False):
+        return {"visited": len(settled[0]) + len(settled[1]), "frontier": len(queues[0]) + len(queues[1]),
+                "forward": len(settled[0]), "backward": len(settled[1]), "found": found}
+
+    state.set(start, FORWARD[0])
+    yield state.flush(), {}, meta()
+
+    best = None  # (length, forward end, backward end) of the shortest meeting so far
+    previous = None
+    while queues[0] and queues[1] and best is None:
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        q, mine, theirs = queues[side], depth[side], depth[1 - side]
+        for _ in range(len(q)):  # exactly the current level
+            u = q.popleft()
+            settled[side].add(u)
+            if previous is not None:
+                state.set(previous[0], colors[previous[1]][1])
+            state.set(u, "#ef4444")  # red current
+            previous = (u, side)
+            yield state.flush(), {}, meta()
+            for v in indices[offsets[u]:offsets[u + 1]]:
+                if v in theirs:
+                    length = mine[u] + 1 + theirs[v]
+                    if best is None or length < best[0]:
+                        best = (length, u, v) if side == 0 else (length, v, u)
+                if v not in mine:
+                    mine[v] = mine[u] + 1
+                    parents[side][v] = u
+                    q.append(v)
+                    state.set(u, colors[side][1])
+                    if v not in theirs:
+                        state.set(v, colors[side][0])
+                    yield state.flush(), {}, meta()
+
+    if best is not None:
+        path = _join_path(parents, best[1], best[2])
+        yield _final_frame(state, settled, path), {}, dict(meta(True), frontier=0, path=path)
+    else:
+        yield _final_frame(state, settled, None), {}, dict(meta(), frontier=0)
+
+def bidirectional_bfs(positions, edges=None, neighbors=None, start: int = 0,
+                      goal: Optional[int] = None) -> Generator[Frame, None, None]:
+    """Bidirectional BFS yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges, bidirectional_bfs_deltas(positions, edges, neighbors, start, goal))
+
+def bidirectional_dijkstra_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None,
+                                  weights=None) -> Generator[DeltaFrame, None, None]:
+    """Dijkstra from start and from goal at once, each on its own indexed heap.
+
+    The side with the smaller heap settles its next node. Every arc into a
+    node the other side has reached is a candidate path, and mu is the
+    shortest one. The search stops once the two heap minima add up to at
+    least mu, because no unsettled node can lead to a shorter path after
+    that. Meta carries dijkstra's counters summed over both sides, plus
+    "forward" and "backward" settled counts. Without a distinct goal it is
+    plain dijkstra.
+    """
+    from array import array
+
+    graph = as_csr(positions, edges, neighbors, weights)
+    if goal is None or goal == start:
+        yield from best_first_deltas(graph, start, goal)
+        return
+    offsets, indices, arc_weights = adjacency(graph)
+    dist = (array("d", [float("inf")]) * graph.num_nodes, array("d", [float("inf")]) * graph.num_nodes)
+    dist[0][start] = 0.0
+    dist[1][goal] = 0.0
+    parents = ({start: None}, {goal: None})
+    settled = (set(), set())
+    heaps = (IndexedHeap(graph.num_nodes), IndexedHeap(graph.num_nodes))
+    heaps[0].push(start, 0.0)
+    heaps[1].push(goal, 0.0)
+    colors = (FORWARD, BACKWARD)
+    state = ColorState(pinned={goal: "#f59e0b"})  # amber goal
+
+    def meta(found=False):
+        return {"visited": len(settled[0]) + len(settled[1]), "queue": len(heaps[0]) + len(heaps[1]),
+                "heap_ops": heaps[0].ops + heaps[1].ops, "forward": len(settled[0]), "backward": len(settled[1]),
+                "found": found}
+
+    state.set(start, FORWARD[0])
+    yield state.flush(), {}, meta()
+
+    mu = float("inf")
+    meet = None  # (forward end, backward end) of the mu path
+    previous = None
+    while heaps[0] and heaps[1] and heaps[0].peek()[0] + heaps[1].peek()[0] < mu:
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        d, u = heaps[side].pop()
+        mine, theirs = dist[side], dist[1 - side]
+        settled[side].add(u)
+        if previous is not None:
+            state.set(previous[0], colors[previous[1]][1])
+        state.set(u, "#ef4444")  # red current
+        previous = (u, side)
+        yield state.flush(), {}, meta()
+        for a in range(offsets[u], offsets[u + 1]):
+            v = indices[a]
+            nd = d + (1.0 if arc_weights is None else arc_weights[a])
+            if nd + theirs[v] < mu:
+                mu = nd + theirs[v]
+                meet = (u, v) if side == 0 else (v, u)
+            if nd < mine[v]:
+                mine[v] = nd
+                parents[side][v] = u
+                heaps[side].push_or_decrease(v, nd)
+                state.set(u, colors[side][1])
+                if theirs[v] == float("inf"):
+                    state.set(v, colors[side][0])
+                yield state.flush(), {}, meta()
+
+    if meet is not None:
+        path = _join_path(parents, *meet)
+        yield _final_frame(state, settled, path), {}, dict(meta(True), queue=0, path=path)
+    else:
+        yield _final_frame(state, settled, None), {}, dict(meta(), queue=0)
+
+def bidirectional_dijkstra(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None,
+                           weights=None) -> Generator[Frame, None, None]:
+    """Bidirectional Dijkstra yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges,
+                              bidirectional_dijkstra_deltas(positions, edges, neighbors, start, goal, weights))
+
+def multi_source_bfs_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None,
+                            sources: Optional[Sequence[int]] = None) -> Generator[DeltaFrame, None, None]:
+    """Breadth-first distance field from several seeds at once (start and goal when sources is None).
+
+    Every seed enters one queue at distance 0, so each node is first reached
+    from its nearest seed and takes that seed's color, which draws the
+    graph's Voronoi regions. Each discovery is a "relax"/"relax_dist" event,
+    so GraphTrace.distances_at() rebuilds the distance field for any step.
+    Meta: "visited", "frontier", "level" (distance of the current node),
+    "seeds" and "found" (always False: there is no target).
+    """
+    from collections import deque
+
+    offsets, indices, _ = adjacency(as_csr(positions, edges, neighbors))
+    if sources is None:
+        sources = [start] if goal is None else [start, goal]
+    seeds = list(dict.fromkeys(int(s) for s in sources))
+    owner = {}  # node -> index of its nearest seed
+    dist = {}
+    visited = set()
+    q = deque()
+    state = ColorState()
+
+    for i, s in enumerate(seeds):
+        owner[s] = i
+        dist[s] = 0
+        q.append(s)
+        state.set(s, REGION_COLORS[i % len(REGION_COLORS)][0])
+        yield state.flush(), {}, {"visited": 0, "frontier": len(q), "level": 0, "seeds": len(seeds), "found": False,
+                                  "relax": s, "relax_dist": 0.0}
+
+    previous = None
+    while q:
+        u = q.popleft()
+        visited.add(u)
+        frontier, done = REGION_COLORS[owner[u] % len(REGION_COLORS)]
+        if previous is not None:
+            state.set(previous, REGION_COLORS[owner[previous] % len(REGION_COLORS)][1])
+        state.set(u, "#ef4444")  # red current
+        previous = u
+        yield state.flush(), {}, {"visited": len(visited), "frontier": len(q), "level": dist[u], "seeds": len(seeds),
+                                  "found": False}
+        for v in indices[offsets[u]:offsets[u + 1]]:
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                owner[v] = owner[u]
+                q.append(v)
+                state.set(u, done)
+                state.set(v, frontier)
+                yield state.flush(), {}, {"visited": len(visited), "frontier": len(q), "level": dist[u],
+                                          "seeds": len(seeds), "found": False, "relax": v, "relax_dist": float(dist[v])}
+
+    node_colors = {n: REGION_COLORS[owner[n] % len(REGION_COLORS)][1] for n in visited}
+    for s in seeds:
+        node_colors[s] = "#eab308"  # yellow seeds
+    state.reset(node_colors)
+    yield state.flush(), {}, {"visited": len(visited), "frontier": 0, "level": max(dist.values(), default=0),
+                              "seeds": len(seeds), "found": False}
+
+def multi_source_bfs(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None,
+                     sources: Optional[Sequence[int]] = None) -> Generator[Frame, None, None]:
+    """Multi-source BFS yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges,
+                              multi_source_bfs_deltas(positions, edges, neighbors, start, goal, sources))
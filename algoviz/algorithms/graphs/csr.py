@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+class CSRGraph:
+    """Undirected graph in compressed sparse row form.
+
+    Node ids are 0..N-1. Neighbors of u are indices[offsets[u]:offsets[u+1]],
+    with matching edge weights (or None for unit weights). positions is an
+    (N, 2) float array of x/y coordinates.
+    """
+
+    __slots__ = ("positions", "offsets", "indices", "weights", "_edges")
+
+    def __init__(self, positions: np.ndarray, offsets: np.ndarray, indices: np.ndarray,
+                 weights: Optional[np.ndarray] = None, edges: Optional[np.ndarray] = None):
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self._edges = edges
+
+    @classmethod
+    def from_edges(cls, positions: np.ndarray, edges: np.ndarray, weights: Optional[np.ndarray] = None) -> "CSRGraph":
+        """Build from an (E, 2) undirected edge array.
+
+        Each node's neighbors keep edge-list order, the same order
+        build_grid_graph's add_edge produces.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        N = len(positions)
+        # Directed arcs interleaved as (u->v, v->u) per edge, then stably grouped by source.
+        src = np.column_stack([edges[:, 0], edges[:, 1]]).reshape(-1)
+        dst = np.column_stack([edges[:, 1], edges[:, 0]]).reshape(-1)
+        order = np.argsort(src, kind="stable")
+        offsets = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=N), out=offsets[1:])
+        arc_weights = None
+        if weights is not None:
+            arc_weights = np.repeat(np.asarray(weights, dtype=np.float64), 2)[order]
+        return cls(positions, offsets, dst[order], arc_weights, edges)
+
+    @classmethod
+    def from_tuple(cls, positions: Dict[int, Tuple[float, float]], edges: List[Tuple[int, int]],
+                   neighbors: Dict[int, List[int]], weights: Optional[Dict[Tuple[int, int], float]] = None) -> "CSRGraph":
+        """Adapter for the (positions, edges, neighbors[, weights]) dict form; node ids must be 0..N-1."""
+        N = len(positions)
+        if set(positions.keys()) != set(range(N)):
+            raise ValueError("CSRGraph needs node ids 0..N-1.")
+        xy = np.asarray([positions[i] for i in range(N)], dtype=np.float64).reshape(N, 2)
+        counts = np.asarray([len(neighbors.get(i, ())) for i in range(N)], dtype=np.int64)
+        offsets = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        indices = np.fromiter((v for i in range(N) for v in neighbors.get(i, ())), dtype=np.int32, count=int(offsets[-1]))
+        arc_weights = None
+        if weights is not None:
+            arc_weights = np.fromiter(
+                (weights.get((u, v), weights.get((v, u), 1.0)) for u in range(N) for v in neighbors.get(u, ())),
+                dtype=np.float64, count=int(offsets[-1]))
+        return cls(xy, offsets, indices, arc_weights, np.asarray(edges, dtype=np.int64).reshape(-1, 2))
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.positions, self.offsets, self.indices]
+        if self.weights is not None:
+            arrays.append(self.weights)
+        if self._edges is not None:
+            arrays.append(self._edges)
+        return sum(a.nbytes for a in arrays)
+
+    def neighbors(self, u: int) -> np.ndarray:
+        return self.indices[self.offsets[u]:self.offsets[u + 1]]
+
+    def edge_array(self) -> np.ndarray:
+        """(E, 2) undirected edges, each listed once."""
+        if self._edges is None:
+            src = np.repeat(np.arange(self.num_nodes), np.diff(self.offsets))
+            keep = src < self.indices
+            self._edges = np.column_stack([src[keep], self.indices[keep]])
+        return self._edges
+
+    def to_tuple(self) -> Tuple[Dict[int, Tuple[float, float]], List[Tuple[int, int]], Dict[int, List[int]]]:
+        """Back to the (positions, edges, neighbors) dict form, for small graphs."""
+        positions = {i: (float(x), float(y)) for i, (x, y) in enumerate(self.positions.tolist())}
+        edges = [tuple(e) for e in self.edge_array().tolist()]
+        idx = self.indices.tolist()
+        off = self.offsets.tolist()
+        neighbors = {i: idx[off[i]:off[i + 1]] for i in range(self.num_nodes)}
+        return positions, edges, neighbors
+
+
+def as_csr(positions, edges=None, neighbors=None, weights=None) -> CSRGraph:
+    """Pass a CSRGraph through; convert the dict tuple form otherwise."""
+    if isinstance(positions, CSRGraph):
+        return positions
+    return CSRGraph.from_tuple(positions, edges, neighbors, weights)
+
+
+def adjacency(graph: CSRGraph) -> Tuple[memoryview, memoryview, Optional[memoryview]]:
+    """(offsets, indices, weights) as memoryviews: cheap per-element access from Python loops."""
+    weights = None if graph.weights is None else memoryview(graph.weights)
+    return memoryview(graph.offsets), memoryview(graph.indices), weights
@@ -1,44 +1,43 @@
 from typing import Dict, List, Tuple, Optional, Generator
 
-Frame = Tuple[Dict, List[Tuple[int,int]], Dict[int, str], Dict[Tuple[int,int], str], Dict]
+from .csr import adjacency, as_csr
+from .frames import ColorState, DeltaFrame, Frame, materialize_colors
 
-def dfs(positions, edges, neighbors, start: int, goal: Optional[int] = None) -> Generator[Frame, None, None]:
-    """Depth-first search (iterative). Yields frames with node_colors and meta."""
+def dfs_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None) -> Generator[DeltaFrame, None, None]:
+    """Depth-first search (iterative). Yields delta frames: (node color changes, edge_colors, meta).
+    `positions` may be a CSRGraph, in which case edges/neighbors are not needed.
+    """
+    offsets, indices, _ = adjacency(as_csr(positions, edges, neighbors))
     stack = [start]
     visited = set()
+    discovered = {start}  # visited or on the stack: O(1) membership instead of scanning the stack
     parent = {start: None}
+    state = ColorState(pinned={goal: "#f59e0b"} if goal is not None else None)  # amber goal
 
-    def colors(current=None, stack_snap=None):
-        node_colors = {}
-        if stack_snap:
-            for s in stack_snap:
-                node_colors[s] = "#60a5fa"  # blue stack nodes
-        for v in visited:
-            node_colors[v] = "#10b981"  # green visited
-        if current is not None:
-            node_colors[current] = "#ef4444"  # red current
-        if goal is not None:
-            node_colors[goal] = "#f59e0b"  # amber goal
-        return node_colors, {}
-
-    node_colors, edge_colors = colors(current=None, stack_snap=list(stack))
-    yield positions, edges, node_colors, edge_colors, {"visited": 0, "stack": len(stack), "found": False}
+    state.set(start, "#60a5fa")  # blue stack nodes
+    yield state.flush(), {}, {"visited": 0, "stack": len(stack), "found": False}
 
+    previous = None
     while stack:
         current = stack.pop()
         if current not in visited:
             visited.add(current)
-            node_colors, edge_colors = colors(current, list(stack))
-            yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "stack": len(stack), "found": current == goal}
+            if previous is not None:
+                state.set(previous, "#10b981")  # green visited
+            state.set(current, "#ef4444")  # red current
+            previous = current
+            yield state.flush(), {}, {"visited": len(visited), "stack": len(stack), "found": current == goal}
             if current == goal:
                 break
             # push neighbors (reverse to get visually consistent order)
-            for nxt in reversed(neighbors[current]):
-                if nxt not in visited and nxt not in stack:
+            for nxt in reversed(indices[offsets[current]:offsets[current + 1]]):
+                if nxt not in discovered:
+                    discovered.add(nxt)
                     parent[nxt] = current
                     stack.append(nxt)
-                    node_colors, edge_colors = colors(current=None, stack_snap=list(stack))
-                    yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "stack": len(stack), "found": False}
+                    state.set(current, "#10b981")
+                    state.set(nxt, "#60a5fa")
+                    yield state.flush(), {}, {"visited": len(visited), "stack": len(stack), "found": False}
 
     # Final (optional path highlight if goal reached)
     if goal is not None and goal in visited:
@@ -51,7 +50,12 @@ def dfs(positions, edges, neighbors, start: int, goal: Optional[int] = None) ->
         node_colors = {n: "#10b981" for n in visited}
         for n in path:
             node_colors[n] = "#eab308"  # yellow path
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "stack": 0, "found": True, "path": path}
+        state.reset(node_colors)
+        yield state.flush(), {}, {"visited": len(visited), "stack": 0, "found": True, "path": path}
     else:
-        node_colors = {n: "#10b981" for n in visited}
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "stack": 0, "found": False}
+        state.reset({n: "#10b981" for n in visited})
+        yield state.flush(), {}, {"visited": len(visited), "stack": 0, "found": False}
+
+def dfs(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None) -> Generator[Frame, None, None]:
+    """Depth-first search yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges, dfs_deltas(positions, edges, neighbors, start, goal))
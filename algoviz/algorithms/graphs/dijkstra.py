@@ -1,51 +1,58 @@
 from typing import Dict, List, Tuple, Optional, Generator
-import heapq
 
-Frame = Tuple[Dict, List[Tuple[int,int]], Dict[int, str], Dict[Tuple[int,int], str], Dict]
+from .csr import adjacency, as_csr
+from .frames import ColorState, DeltaFrame, Frame, materialize_colors
+from .heap import IndexedHeap
 
-def dijkstra(positions, edges, neighbors, start: int, goal: Optional[int] = None, weights=None) -> Generator[Frame, None, None]:
-    """Dijkstra with unit weights by default. Yields frames with node colors and meta distances."""
-    nodelist = list(positions.keys())
-    dist = {n: float("inf") for n in nodelist}
+def best_first_deltas(graph, start: int, goal: Optional[int], heuristic=None) -> Generator[DeltaFrame, None, None]:
+    """Shared Dijkstra/A* loop over a CSRGraph, keyed on dist (Dijkstra) or on
+    (dist + heuristic[node], heuristic[node]) for A*, so f-ties go to the node nearer the goal.
+
+    Meta carries counters ("visited", "queue", "heap_ops") plus the frame's heap event:
+    "pop"/"pop_dist" when a node is settled (expanded), "relax"/"relax_dist" when its
+    distance improves (a push or a decrease-key). GraphTrace.distances_at() rebuilds
+    the full distance table for any step.
+    """
+    from array import array
+
+    offsets, indices, arc_weights = adjacency(graph)
+    dist = array("d", [float("inf")]) * graph.num_nodes
     dist[start] = 0.0
     parent = {start: None}
     visited = set()
-    pq = [(0.0, start)]
-
-    def colors(current=None, pq_nodes=None):
-        node_colors = {}
-        if pq_nodes:
-            for s in pq_nodes:
-                node_colors[s] = "#60a5fa"  # blue in-queue
-        for v in visited:
-            node_colors[v] = "#10b981"  # green settled
-        if current is not None:
-            node_colors[current] = "#ef4444"  # red current
-        if goal is not None:
-            node_colors[goal] = "#f59e0b"  # amber goal
-        return node_colors, {}
+    pq = IndexedHeap(graph.num_nodes)
+    pq.push(start, 0.0 if heuristic is None else (heuristic[start], heuristic[start]))
+    state = ColorState(pinned={goal: "#f59e0b"} if goal is not None else None)  # amber goal
 
-    node_colors, edge_colors = colors(None, [start])
-    yield positions, edges, node_colors, edge_colors, {"visited": 0, "queue": 1, "dist": dict(dist), "found": False}
+    state.set(start, "#60a5fa")  # blue in-queue
+    yield state.flush(), {}, {"visited": 0, "queue": 1, "heap_ops": pq.ops, "found": False, "relax": start, "relax_dist": 0.0}
 
+    previous = None
     while pq:
-        d, u = heapq.heappop(pq)
+        _, u = pq.pop()
         if u in visited:
             continue
+        d = dist[u]
         visited.add(u)
-        node_colors, edge_colors = colors(u, [v for _, v in pq])
-        yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "queue": len(pq), "dist": dict(dist), "found": u == goal}
+        if previous is not None:
+            state.set(previous, "#10b981")  # green settled
+        state.set(u, "#ef4444")  # red current
+        previous = u
+        yield state.flush(), {}, {"visited": len(visited), "queue": len(pq), "heap_ops": pq.ops, "found": u == goal, "pop": u, "pop_dist": d}
         if u == goal:
             break
-        for v in neighbors[u]:
-            w = 1.0 if weights is None else weights.get((u, v), weights.get((v, u), 1.0))
+        for a in range(offsets[u], offsets[u + 1]):
+            v = indices[a]
+            w = 1.0 if arc_weights is None else arc_weights[a]
             nd = d + w
             if nd < dist[v]:
                 dist[v] = nd
                 parent[v] = u
-                heapq.heappush(pq, (nd, v))
-                node_colors, edge_colors = colors(None, [x for _, x in pq])
-                yield positions, edges, node_colors, edge_colors, {"visited": len(visited), "queue": len(pq), "dist": dict(dist), "found": False}
+                pq.push_or_decrease(v, nd if heuristic is None else (nd + heuristic[v], heuristic[v]))
+                state.set(u, "#10b981")
+                if v not in visited:
+                    state.set(v, "#60a5fa")
+                yield state.flush(), {}, {"visited": len(visited), "queue": len(pq), "heap_ops": pq.ops, "found": False, "relax": v, "relax_dist": nd}
 
     # Final path highlight
     if goal is not None and goal in parent:
@@ -58,7 +65,19 @@ def dijkstra(positions, edges, neighbors, start: int, goal: Optional[int] = None
         node_colors = {n: "#10b981" for n in visited}
         for n in path:
             node_colors[n] = "#eab308"  # yellow path
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "queue": 0, "dist": dict(dist), "found": True, "path": path}
+        state.reset(node_colors)
+        yield state.flush(), {}, {"visited": len(visited), "queue": 0, "heap_ops": pq.ops, "found": True, "path": path}
     else:
-        node_colors = {n: "#10b981" for n in visited}
-        yield positions, edges, node_colors, {}, {"visited": len(visited), "queue": 0, "dist": dict(dist), "found": False}
+        state.reset({n: "#10b981" for n in visited})
+        yield state.flush(), {}, {"visited": len(visited), "queue": 0, "heap_ops": pq.ops, "found": False}
+
+def dijkstra_deltas(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None, weights=None) -> Generator[DeltaFrame, None, None]:
+    """Dijkstra with unit weights by default, on an indexed heap with decrease-key.
+    Yields delta frames: (node color changes, edge_colors, meta); see best_first_deltas.
+    `positions` may be a CSRGraph (its own weights are used); the dict form takes a `weights` dict.
+    """
+    return best_first_deltas(as_csr(positions, edges, neighbors, weights), start, goal)
+
+def dijkstra(positions, edges=None, neighbors=None, start: int = 0, goal: Optional[int] = None, weights=None) -> Generator[Frame, None, None]:
+    """Dijkstra yielding full (positions, edges, node_colors, edge_colors, meta) frames."""
+    return materialize_colors(positions, edges, dijkstra_deltas(positions, edges, neighbors, start, goal, weights))
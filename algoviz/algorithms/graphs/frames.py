@@ -0,0 +1,77 @@
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+# Full frame: (positions, edges, node_colors, edge_colors, meta) -- one color map per step.
+Frame = Tuple[Dict, List[Tuple[int, int]], Dict[int, str], Dict[Tuple[int, int], str], Dict]
+# Delta frame: (changes, edge_colors, meta) where changes = {node: new color, or None for the base color}
+Changes = Dict[int, Optional[str]]
+DeltaFrame = Tuple[Changes, Dict[Tuple[int, int], str], Dict]
+
+
+class ColorState:
+    """Current node colors plus the changes made since the last flush().
+
+    Nodes in `pinned` keep their color (e.g. the amber goal) until reset().
+    """
+
+    def __init__(self, pinned: Optional[Dict[int, str]] = None):
+        self.colors: Dict[int, str] = {}
+        self._changes: Changes = {}
+        self._pinned = dict(pinned or {})
+        for node, color in self._pinned.items():
+            self._put(node, color)
+
+    def _put(self, node: int, color: Optional[str]) -> None:
+        if self.colors.get(node) == color:
+            return
+        if color is None:
+            del self.colors[node]
+        else:
+            self.colors[node] = color
+        self._changes[node] = color
+
+    def set(self, node: int, color: Optional[str]) -> None:
+        if node not in self._pinned:
+            self._put(node, color)
+
+    def reset(self, colors: Dict[int, str]) -> None:
+        """Replace the whole map (e.g. the final path frame) and drop the pins."""
+        self._pinned = {}
+        for node in [n for n in self.colors if n not in colors]:
+            self._put(node, None)
+        for node, color in colors.items():
+            self._put(node, color)
+
+    def flush(self) -> Changes:
+        changes, self._changes = self._changes, {}
+        return changes
+
+
+def apply_color_changes(colors: Dict[int, str], changes: Changes) -> Dict[int, str]:
+    """Apply a delta frame's changes to colors in place and return it."""
+    for node, color in changes.items():
+        if color is None:
+            colors.pop(node, None)
+        else:
+            colors[node] = color
+    return colors
+
+
+def materialize_colors(positions, edges, deltas: Iterable[DeltaFrame]) -> Generator[Frame, None, None]:
+    """Compatibility adapter: turn delta frames back into full (positions, edges, node_colors, edge_colors, meta) frames."""
+    colors: Dict[int, str] = {}
+    for changes, edge_colors, meta in deltas:
+        apply_color_changes(colors, changes)
+        yield positions, edges, colors.copy(), edge_colors, meta
+
+
+def color_deltas(frames: Iterable[Frame]) -> Generator[DeltaFrame, None, None]:
+    """Reverse adapter: diff successive full frames into delta frames."""
+    prev: Dict[int, str] = {}
+    for frame in frames:
+        colors = frame[2] or {}
+        changes: Changes = {n: None for n in prev if n not in colors}
+        for n, c in colors.items():
+            if prev.get(n) != c:
+                changes[n] = c
+        prev = colors
+        yield changes, frame[3], frame[4]
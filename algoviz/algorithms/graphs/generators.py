@@ -0,0 +1,201 @@
+"""Vectorized graph generators that build CSRGraph arrays directly.
+
+Grid generators keep build_grid_graph's row-major layout (node r*cols + c at
+(c, -r)), so GraphFigure can draw large ones as a heatmap. Blocked cells of
+an obstacle grid stay in place as isolated nodes; mazes are spanning trees
+of the 4-connected grid, so every cell is reachable from every other.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .csr import CSRGraph
+
+# Per-node edge steps (dr, dc); every undirected edge is listed once, from its upper/left end.
+GRID_STEPS = {
+    4: ((0, 1), (1, 0)),
+    8: ((0, 1), (1, 0), (1, 1), (1, -1)),
+}
+
+
+def grid_positions(rows: int, cols: int) -> np.ndarray:
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    return np.column_stack([c * 1.0, -r * 1.0])
+
+
+def grid_edges(rows: int, cols: int, connectivity: int = 4,
+               open_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(E, 2) edges and their lengths for a rows x cols grid, in node order with GRID_STEPS order per node.
+
+    With open_mask, only edges between open cells are kept, and a diagonal
+    only when both cells it cuts past are open.
+    """
+    if connectivity not in GRID_STEPS:
+        raise ValueError(f"connectivity must be one of {tuple(GRID_STEPS)}, got {connectivity}")
+    steps = GRID_STEPS[connectivity]
+    ids = np.arange(rows * cols)
+    r, c = np.divmod(ids, cols)
+    src = np.repeat(ids[:, None], len(steps), axis=1)
+    dst = np.empty_like(src)
+    ok = np.empty(src.shape, dtype=bool)
+    for k, (dr, dc) in enumerate(steps):
+        dst[:, k] = ids + dr * cols + dc
+        ok[:, k] = (r + dr < rows) & (c + dc >= 0) & (c + dc < cols)
+    if open_mask is not None:
+        is_open = np.append(np.asarray(open_mask, dtype=bool).reshape(-1), False)  # [-1]: closed, for off-grid ids
+        ok &= is_open[np.where(ok, src, -1)] & is_open[np.where(ok, dst, -1)]
+        for k, (dr, dc) in enumerate(steps):
+            if dr and dc:
+                ok[:, k] &= is_open[np.where(ok[:, k], ids + dc, -1)] & is_open[np.where(ok[:, k], ids + cols, -1)]
+    length = np.broadcast_to(np.hypot(*np.asarray(steps, dtype=np.float64).T), src.shape)
+    return np.column_stack([src[ok], dst[ok]]), length[ok]
+
+
+def grid_graph(rows: int, cols: int, connectivity: int = 4, open_mask: Optional[np.ndarray] = None) -> CSRGraph:
+    """4- or 8-connected grid; 8-connected edges are weighted by length (1 or √2), 4-connected ones are unit."""
+    edges, length = grid_edges(rows, cols, connectivity, open_mask)
+    return CSRGraph.from_edges(grid_positions(rows, cols), edges, length if connectivity == 8 else None)
+
+
+def obstacle_grid(rows: int, cols: int, density: float = 0.25, connectivity: int = 4,
+                  seed: Optional[int] = None) -> CSRGraph:
+    """Grid with each cell blocked with probability `density`; the first and last cells stay open
+    so the default endpoints are usable (a path between them is not guaranteed)."""
+    open_mask = np.random.default_rng(seed).random(rows * cols) >= density
+    open_mask[[0, -1]] = True
+    return grid_graph(rows, cols, connectivity, open_mask)
+
+
+def maze_kruskal(rows: int, cols: int, seed: Optional[int] = None) -> CSRGraph:
+    """Randomized Kruskal maze: the minimum spanning tree of the 4-connected grid under random edge ranks.
+
+    Kruskal's union-find loop is sequential, so the same tree is built with
+    Borůvka rounds instead. In each round, every component takes its
+    lowest-ranked outgoing edge, and the merged components are relabelled
+    0..m-1 by pointer jumping. Ranks are distinct, so both algorithms pick
+    the same tree. Each round at least halves the component count, and
+    the edges inside a component are dropped.
+    """
+    n = rows * cols
+    edges, _ = grid_edges(rows, cols)
+    # Highest rank first: the lowest-ranked edge has the largest position
+    order = np.random.default_rng(seed).permutation(len(edges)).astype(np.int32)
+    cu, cv = (np.ascontiguousarray(end)[order] for end in edges.astype(np.int32).T)  # endpoint component labels
+    in_tree = np.zeros(len(edges), dtype=bool)
+    m = n
+    while len(order):
+        # Position of the lowest-ranked edge touching each component
+        positions = np.arange(len(order), dtype=np.int32)
+        best = np.full(m, -1, dtype=np.int32)
+        np.maximum.at(best, cu, positions)
+        np.maximum.at(best, cv, positions)
+        in_tree[order[best]] = True  # the grid is connected, so every component has an outgoing edge
+        ids = np.arange(m, dtype=np.int32)
+        pick_u = cu[best]
+        parent = np.where(pick_u == ids, cv[best], pick_u)
+        # Two components that picked each other share the edge; the smaller id becomes the root
+        root = (parent[parent] == ids) & (ids < parent)
+        parent[root] = ids[root]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        relabel = (np.cumsum(parent == ids, dtype=np.int32) - 1)[parent]
+        m = int(relabel.max()) + 1
+        cu, cv = relabel[cu], relabel[cv]
+        cross = cu != cv
+        order, cu, cv = order[cross], cu[cross], cv[cross]
+    return CSRGraph.from_edges(grid_positions(rows, cols), edges[in_tree])
+
+
+def maze_dfs(rows: int, cols: int, seed: Optional[int] = None) -> CSRGraph:
+    """Randomized depth-first (recursive backtracker) maze, carved from cell 0.
+
+    The walk itself is sequential: a Python loop over precomputed, shuffled
+    neighbor lists, so it is several times slower than maze_kruskal on
+    large grids. Its long winding corridors are what make it worth having.
+    """
+    n = rows * cols
+    ids = np.arange(n)
+    r, c = np.divmod(ids, cols)
+    # Off-grid neighbors point at the sentinel n, which starts out visited
+    nbr = np.column_stack([np.where(r > 0, ids - cols, n), np.where(c + 1 < cols, ids + 1, n),
+                           np.where(r + 1 < rows, ids + cols, n), np.where(c > 0, ids - 1, n)])
+    nbr = np.take_along_axis(nbr, np.argsort(np.random.default_rng(seed).random((n, 4)), axis=1), axis=1)
+    nbr = nbr.tolist()
+    visited = bytearray(n + 1)
+    visited[0] = visited[n] = 1
+    parent = [0] * n
+    node = 0
+    stack = [iter(nbr[0])]
+    push, pop = stack.append, stack.pop
+    while stack:
+        for w in stack[-1]:
+            if not visited[w]:
+                visited[w] = 1
+                parent[w] = node
+                node = w
+                push(iter(nbr[w]))
+                break
+        else:
+            pop()
+            node = parent[node]
+    ids = np.arange(1, n)
+    edges = np.column_stack([np.asarray(parent[1:], dtype=np.int64), ids])
+    edges.sort(axis=1)
+    return CSRGraph.from_edges(grid_positions(rows, cols), edges)
+
+
+def radius_pairs(xy: np.ndarray, radius: float) -> np.ndarray:
+    """All pairs (i < j) of points within `radius`, via a uniform grid spatial index.
+
+    Points are bucketed into radius-sized cells, and a prefix sum over the
+    per-cell counts gives where each cell's points start. Each cell is
+    matched against itself and four of its eight neighbors; the other four
+    are covered from the opposite side. Only nearby pairs are ever measured.
+    """
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    n = len(xy)
+    if n < 2 or radius <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    cell = np.floor((xy - xy.min(axis=0)) / radius).astype(np.int64)
+    height = int(cell[:, 1].max()) + 3  # a spare row on each side, so dy = ±1 never wraps into another column
+    key = (cell[:, 0] + 1) * height + cell[:, 1] + 1  # and a spare column on each side for dx
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    counts = np.bincount(key, minlength=(int(cell[:, 0].max()) + 3) * height)
+    starts = np.cumsum(counts) - counts
+    x, y = (np.ascontiguousarray(axis) for axis in xy[order].T)
+    src_all = np.arange(n)
+    found = []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        target = key + dx * height + dy
+        size = counts[target]
+        total = int(size.sum())
+        if not total:
+            continue
+        src = np.repeat(src_all, size)
+        dst = np.arange(total) + np.repeat(starts[target] - (np.cumsum(size) - size), size)
+        keep = (x[src] - x[dst]) ** 2 + (y[src] - y[dst]) ** 2 <= radius * radius
+        if dx == 0 and dy == 0:
+            keep &= src < dst
+        found.append(np.column_stack([src[keep], dst[keep]]))
+    pairs = order[np.concatenate(found)]
+    pairs.sort(axis=1)
+    return pairs
+
+
+def random_geometric(n: int, degree: float = 6.0, seed: Optional[int] = None) -> CSRGraph:
+    """n uniform points in a √n x √n square, joined when closer than the radius that gives
+    `degree` neighbors on average; edges are weighted by length.
+
+    Node ids follow a column-by-column sweep of the square, so neighbors get
+    nearby ids and traversals touch memory in order.
+    """
+    side = max(1.0, n ** 0.5)
+    xy = np.random.default_rng(seed).uniform(0.0, side, size=(n, 2))
+    radius = float(np.sqrt(degree / np.pi))  # unit point density: π r² neighbors expected
+    xy = xy[np.argsort(np.floor(xy[:, 0] / radius) * side + xy[:, 1])]  # by radius_pairs' cell columns, then y
+    edges = radius_pairs(xy, radius)
+    return CSRGraph.from_edges(xy, edges, np.hypot(*(xy[edges[:, 0]] - xy[edges[:, 1]]).T))
@@ -0,0 +1,107 @@
+from array import array
+from typing import Any, List, Tuple
+
+
+class IndexedHeap:
+    """Binary min-heap of (priority, item) pairs for items 0..capacity-1, with decrease-key.
+
+    Priorities can be any orderable value: floats, or tuples for tie-breaking keys.
+    pos[item] is the item's slot in the heap (-1 when absent), so membership is O(1)
+    and decrease_key sifts the existing entry instead of pushing a stale duplicate.
+    Ties break on the item id, the same order heapq gives (priority, item) tuples.
+    pushes/pops/decreases count heap operations for the HUD.
+    """
+
+    __slots__ = ("_heap", "_pos", "pushes", "pops", "decreases")
+
+    def __init__(self, capacity: int):
+        self._heap: List[Tuple[Any, int]] = []
+        self._pos = array("q", [-1]) * capacity
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: int) -> bool:
+        return self._pos[item] >= 0
+
+    @property
+    def ops(self) -> int:
+        return self.pushes + self.pops + self.decreases
+
+    def peek(self) -> Tuple[Any, int]:
+        return self._heap[0]
+
+    def priority(self, item: int) -> Any:
+        return self._heap[self._pos[item]][0]
+
+    def push(self, item: int, priority: Any) -> None:
+        if self._pos[item] >= 0:
+            raise KeyError(f"{item} is already in the heap")
+        self._heap.append((priority, item))
+        self._pos[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        self.pushes += 1
+
+    def pop(self) -> Tuple[Any, int]:
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        self._pos[top[1]] = -1
+        if heap:
+            heap[0] = last
+            self._pos[last[1]] = 0
+            self._sift_down(0)
+        self.pops += 1
+        return top
+
+    def decrease_key(self, item: int, priority: Any) -> None:
+        i = self._pos[item]
+        if i < 0:
+            raise KeyError(f"{item} is not in the heap")
+        if priority > self._heap[i][0]:
+            raise ValueError("decrease_key cannot raise a priority")
+        self._heap[i] = (priority, item)
+        self._sift_up(i)
+        self.decreases += 1
+
+    def push_or_decrease(self, item: int, priority: Any) -> bool:
+        """Insert item or lower its priority; True if it was a push."""
+        if self._pos[item] >= 0:
+            self.decrease_key(item, priority)
+            return False
+        self.push(item, priority)
+        return True
+
+    def _sift_up(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[1]] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[i] = heap[child]
+            pos[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[1]] = i
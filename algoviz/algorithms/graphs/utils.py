@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 def build_grid_graph(rows: int, cols: int):
     """Return (positions, edges, neighbors) for a 4-neighbor grid graph with unit weights."""
@@ -24,3 +24,88 @@ def build_grid_graph(rows: int, cols: int):
             if r + 1 < rows: add_edge(nid, (r + 1) * cols + c)
 
     return positions, edges, neighbors
+
+def build_grid_csr(rows: int, cols: int):
+    """Vectorized build of the same 4-neighbor grid as build_grid_graph, as a CSRGraph."""
+    from .generators import grid_graph
+
+    return grid_graph(rows, cols)
+
+def build_weighted_grid_graph(rows: int, cols: int, low: int = 1, high: int = 9, seed: Optional[int] = None):
+    """Return (positions, edges, neighbors, weights): the 4-neighbor grid with random integer weights in [low, high]."""
+    import random
+
+    positions, edges, neighbors = build_grid_graph(rows, cols)
+    rng = random.Random(seed)
+    weights = {e: float(rng.randint(low, high)) for e in edges}
+    return positions, edges, neighbors, weights
+
+def build_random_graph(n: int, k: int = 4, seed: Optional[int] = None):
+    """Return (positions, edges, neighbors, weights) for n random points, each joined to its k nearest
+    neighbors, with Euclidean edge lengths as weights."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    side = max(1.0, n ** 0.5)
+    xy = rng.uniform(0.0, side, size=(n, 2))
+    k = max(0, min(k, n - 1))
+    near = np.empty((n, k), dtype=np.int64)
+    for lo in range(0, n, 1024):  # row blocks keep the distance matrix at 1024 x n
+        d = np.hypot(xy[lo:lo + 1024, None, 0] - xy[None, :, 0], xy[lo:lo + 1024, None, 1] - xy[None, :, 1])
+        d[np.arange(len(d)), np.arange(lo, lo + len(d))] = np.inf
+        part = np.argpartition(d, k - 1, axis=1)[:, :k] if k else near[lo:lo + 1024]
+        near[lo:lo + 1024] = np.take_along_axis(part, np.argsort(np.take_along_axis(d, part, axis=1), axis=1), axis=1)
+    pairs = np.column_stack([np.repeat(np.arange(n), k), near.reshape(-1)])
+    pairs = np.unique(np.sort(pairs, axis=1), axis=0)
+    length = np.hypot(*(xy[pairs[:, 0]] - xy[pairs[:, 1]]).T)
+
+    positions = {i: (float(x), float(y)) for i, (x, y) in enumerate(xy.tolist())}
+    neighbors = {i: [] for i in range(n)}
+    edges = []
+    weights = {}
+    for (a, b), w in zip(pairs.tolist(), length.tolist()):
+        edges.append((a, b))
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+        weights[(a, b)] = w
+    return positions, edges, neighbors, weights
+
+def build_weighted_grid_csr(rows: int, cols: int, low: int = 1, high: int = 9, seed: Optional[int] = None):
+    """Vectorized weighted grid as a CSRGraph, with random integer weights in [low, high]."""
+    import numpy as np
+    from .csr import CSRGraph
+
+    grid = build_grid_csr(rows, cols)
+    edges = grid.edge_array()
+    weights = np.random.default_rng(seed).integers(low, high, size=len(edges), endpoint=True).astype(np.float64)
+    return CSRGraph.from_edges(grid.positions, edges, weights)
+
+TOPOLOGIES = ("Grid", "Weighted grid", "Grid (8-connected)", "Grid with obstacles", "Maze (Kruskal)",
+              "Maze (randomized DFS)", "Random geometric", "Random (k-nearest)")
+
+def build_topology(topology: str, rows: int, cols: int, seed: Optional[int] = None, density: float = 0.25):
+    """CSRGraph for one of the Graphs page's TOPOLOGIES; the page and the trace precompute CLI share it.
+
+    density is the blocked-cell probability of "Grid with obstacles".
+    """
+    from . import generators
+
+    if topology == "Grid":
+        return build_grid_csr(rows, cols)
+    if topology == "Weighted grid":
+        return build_weighted_grid_csr(rows, cols, seed=seed)
+    if topology == "Grid (8-connected)":
+        return generators.grid_graph(rows, cols, connectivity=8)
+    if topology == "Grid with obstacles":
+        return generators.obstacle_grid(rows, cols, density, seed=seed)
+    if topology == "Maze (Kruskal)":
+        return generators.maze_kruskal(rows, cols, seed=seed)
+    if topology == "Maze (randomized DFS)":
+        return generators.maze_dfs(rows, cols, seed=seed)
+    if topology == "Random geometric":
+        return generators.random_geometric(rows * cols, seed=seed)
+    if topology == "Random (k-nearest)":
+        from .csr import as_csr
+
+        return as_csr(*build_random_graph(rows * cols, k=4, seed=seed))
+    raise ValueError(f"Unknown topology {topology!r}; expected one of {TOPOLOGIES}.")
@@ -0,0 +1,387 @@
+"""Vectorized batch trace engine.
+
+Produces the same frame sequence as the *_deltas generators, but builds the
+SortTrace event columns with NumPy: a whole bubble-sort pass, insertion step,
+merge or partition is emitted as one block of frames instead of one Python
+tuple per compare/swap. Each block also carries per-frame operation counts
+matching the instrumented generators, so the exact "ops" totals agree too.
+
+The engine speeds up producing frames, not the number of frames an
+algorithm needs. Merge sort reaches 10^5 elements in about a second, and so
+does quick sort on mostly distinct values. Quick sort's Lomuto partition is
+quadratic on repeated values, though. make_input's default values 0..100
+give 662k frames (about 180 MiB RSS) at n = 10^4, and n = 10^5 does not
+fit in memory. Bubble and insertion sort are quadratic on any input.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from algoviz.trace.columns import MetaColumns
+from algoviz.trace.sorting import SortTrace
+
+
+class _Block:
+    """Columns for a run of F consecutive frames."""
+
+    def __init__(self, F: int):
+        self.F = F
+        self.wcount = np.zeros(F, dtype=np.int64)
+        self.hl = np.full((F, 2), -1, dtype=np.int32)
+        self.hl_len = np.zeros(F, dtype=np.int8)
+        self.swapped = np.zeros(F, dtype=bool)
+        self.ops = np.zeros((4, F), dtype=np.int32)  # per-frame reads/writes/comparisons/swaps rows
+        self.meta: Dict[str, Tuple[np.ndarray, np.ndarray, str]] = {}
+        self._writes: List[Tuple[np.ndarray, Sequence[Tuple[np.ndarray, np.ndarray]]]] = []
+
+    def highlight(self, pos, first, second=None) -> None:
+        self.hl[pos, 0] = first
+        if second is None:
+            self.hl_len[pos] = 1
+        else:
+            self.hl[pos, 1] = second
+            self.hl_len[pos] = 2
+
+    def count(self, pos, reads=0, writes=0, comparisons=0, swaps=0) -> None:
+        """Add operations to the frames at `pos` (positions must be distinct within one call)."""
+        for row, amount in enumerate((reads, writes, comparisons, swaps)):
+            if amount:
+                self.ops[row, pos] += amount
+
+    def writes(self, pos: np.ndarray, pairs: Sequence[Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Frames at `pos` write len(pairs) values each: pairs[t] = (indices, values)."""
+        self.wcount[pos] = len(pairs)
+        self._writes.append((np.asarray(pos), pairs))
+
+    def flat_writes(self) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = np.cumsum(self.wcount) - self.wcount
+        total = int(self.wcount.sum())
+        idx = np.empty(total, dtype=np.int64)
+        val = np.empty(total, dtype=np.int64)
+        for pos, pairs in self._writes:
+            for t, (i, v) in enumerate(pairs):
+                idx[offsets[pos] + t] = i
+                val[offsets[pos] + t] = v
+        return idx, val
+
+
+class _Events:
+    """Concatenates frame blocks into SortTrace columns."""
+
+    def __init__(self, data):
+        self.initial = np.asarray(list(data), dtype=np.int64)
+        self.blocks: List[_Block] = []
+
+    def add(self, block: _Block) -> None:
+        self.blocks.append(block)
+
+    def final(self, meta: Dict[str, int]) -> None:
+        block = _Block(1)
+        for key, value in meta.items():
+            block.meta[key] = (np.zeros(1, dtype=np.int64), np.asarray([value]), "int")
+        self.add(block)
+
+    def _cumulative_ops(self) -> np.ndarray:
+        """Running totals, accumulated in place while they fit in int32."""
+        ops = np.concatenate([b.ops for b in self.blocks], axis=1)
+        if ops.sum(axis=1, dtype=np.int64).max() < 2 ** 31:
+            return np.cumsum(ops, axis=1, out=ops)
+        return np.cumsum(ops, axis=1, dtype=np.int64)
+
+    def to_trace(self, keyframe_every: Optional[int] = None) -> SortTrace:
+        starts = np.cumsum([0] + [b.F for b in self.blocks])
+        flat = [b.flat_writes() for b in self.blocks]
+        wcount = np.concatenate([b.wcount for b in self.blocks])
+        columns: Dict[str, list] = {}
+        for start, block in zip(starts, self.blocks):
+            for key, (pos, values, kind) in block.meta.items():
+                col = columns.setdefault(key, [[], [], kind])
+                col[0].append(pos + start)
+                col[1].append(values)
+        meta = MetaColumns.from_arrays({k: (np.concatenate(s), np.concatenate(v), kind) for k, (s, v, kind) in columns.items()})
+        return SortTrace.from_columns(
+            initial=self.initial,
+            write_offsets=np.concatenate([[0], np.cumsum(wcount)]).astype(np.int64),
+            write_idx=np.concatenate([f[0] for f in flat]).astype(np.int32),
+            write_val=np.concatenate([f[1] for f in flat]),
+            highlight=np.concatenate([b.hl for b in self.blocks]),
+            highlight_len=np.concatenate([b.hl_len for b in self.blocks]),
+            swapped=np.concatenate([b.swapped for b in self.blocks]),
+            meta=meta,
+            keyframe_every=keyframe_every,
+            ops=self._cumulative_ops().T,
+        )
+
+
+def _pair_positions(first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Frame positions when item j emits an optional first frame followed by an optional second one."""
+    per = first.astype(np.int64) + second
+    start = np.cumsum(per) - per
+    return start[first], (start + first)[second], int(per.sum())
+
+
+def bubble_sort_trace(data, keyframe_every: Optional[int] = None) -> SortTrace:
+    """Each pass is one vectorized step: the carried element is the running prefix maximum."""
+    events = _Events(data)
+    a = events.initial.copy()
+    n = len(a)
+    for i in range(n):
+        m = n - i - 1
+        if m <= 0:
+            continue
+        carried = np.maximum.accumulate(a[:m])
+        nxt = a[1:m + 1].copy()
+        swap = carried > nxt
+        j = np.arange(m)
+        cmp_pos, sw_pos, F = _pair_positions(np.ones(m, dtype=bool), swap)
+        block = _Block(F)
+        block.highlight(cmp_pos, j, j + 1)
+        block.highlight(sw_pos, j[swap], j[swap] + 1)
+        block.swapped[sw_pos] = True
+        block.writes(sw_pos, [(j[swap], nxt[swap]), (j[swap] + 1, carried[swap])])
+        block.count(cmp_pos, reads=2, comparisons=1)
+        block.count(sw_pos, reads=2, writes=2, swaps=1)
+        block.meta["sorted_tail_len"] = (np.arange(F), np.full(F, i, dtype=np.int64), "int")
+        events.add(block)
+        top = max(carried[-1], a[m])
+        a[:m] = np.where(swap, nxt, carried)
+        a[m] = top
+    events.final({"sorted_tail_len": n})
+    return events.to_trace(keyframe_every)
+
+
+def insertion_sort_trace(data, keyframe_every: Optional[int] = None) -> SortTrace:
+    """Each insertion is one block: the shift distance comes from a binary search of the sorted prefix."""
+    events = _Events(data)
+    a = events.initial.copy()
+    n = len(a)
+    for i in range(1, n):
+        key = a[i]
+        s = i - int(np.searchsorted(a[:i], key, side="right"))
+        F = s + 2
+        block = _Block(F)
+        block.highlight(0, i - 1, i)
+        j = i - 1 - np.arange(s)
+        shift_pos = np.arange(1, s + 1)
+        block.highlight(shift_pos, j, j + 1)
+        block.swapped[1:] = True
+        block.writes(shift_pos, [(j + 1, a[j])])
+        block.highlight(F - 1, i - s)
+        block.writes(np.asarray([F - 1]), [(np.asarray([i - s]), np.asarray([key]))])
+        # Read the key and compare it; each shift re-reads, writes, then compares the next slot.
+        block.count(0, reads=2, comparisons=1)
+        block.count(shift_pos, reads=1, writes=1)
+        block.count(shift_pos[1:], reads=1, comparisons=1)
+        block.count(F - 1, writes=1)
+        if s and i - s - 1 >= 0:
+            block.count(F - 1, reads=1, comparisons=1)
+        meta = np.full(F, i, dtype=np.int64)
+        meta[-1] = i + 1
+        block.meta["sorted_prefix_len"] = (np.arange(F), meta, "int")
+        events.add(block)
+        a[i - s + 1:i + 1] = a[i - s:i].copy()
+        a[i - s] = key
+    events.final({"sorted_prefix_len": n})
+    return events.to_trace(keyframe_every)
+
+
+def _segments(sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(segment id, local index, segment start) for a concatenation of non-empty segments."""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    starts = np.cumsum(sizes) - sizes
+    seg = np.repeat(np.arange(len(sizes)), sizes)
+    return seg, np.arange(int(sizes.sum())) - starts[seg], starts
+
+
+def _seg_cumsum(x: np.ndarray, seg: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Exclusive cumulative sum of x, restarting at every segment."""
+    x = x.astype(np.int64)
+    cs = np.cumsum(x) - x
+    return cs - cs[starts][seg]
+
+
+def _resolve_tape(src: np.ndarray, base: np.ndarray) -> np.ndarray:
+    """Follow src links (each pointing to an earlier slot or itself) by pointer jumping."""
+    while True:
+        nxt = src[src]
+        if np.array_equal(nxt, src):
+            return base[src]
+        src = nxt
+
+
+def merge_sort_trace(data, keyframe_every: Optional[int] = None) -> SortTrace:
+    """All merges of one recursion level are done in one vectorized pass.
+
+    A merge of two sorted runs equals a stable sort of the segment, so a
+    whole level is one lexsort. Frames are then scattered into the
+    generator's post-order (children first, left before right).
+    """
+    events = _Events(data)
+    a = events.initial.copy()
+    n = len(a)
+    levels = []
+    lo, hi = np.asarray([0]), np.asarray([n - 1])
+    while True:
+        keep = lo < hi
+        lo, hi = lo[keep], hi[keep]
+        if not len(lo):
+            break
+        mid = (lo + hi) // 2
+        levels.append((lo, mid, hi))
+        lo, hi = np.concatenate([lo, mid + 1]), np.concatenate([mid, hi])
+
+    done = []
+    for lo, mid, hi in reversed(levels):
+        seg, k, starts = _segments(hi - lo + 1)
+        g = lo[seg] + k
+        v = a[g]
+        order = np.lexsort((v, seg))
+        out = v[order]
+        from_left = g[order] <= mid[seg]
+        left_before = _seg_cumsum(from_left, seg, starts)
+        i_k = lo[seg] + left_before
+        j_k = mid[seg] + 1 + (k - left_before)
+        has_cmp = (i_k <= mid[seg]) & (j_k <= hi[seg])
+        per = has_cmp + 1
+        done.append((lo, hi, seg, g, out, has_cmp, i_k, j_k, _seg_cumsum(per, seg, starts), np.add.reduceat(per, starts)))
+        a[g] = out
+
+    if done:
+        all_lo = np.concatenate([d[0] for d in done])
+        all_hi = np.concatenate([d[1] for d in done])
+        all_F = np.concatenate([d[9] for d in done])
+        post = np.lexsort((-all_lo, all_hi))
+        offset = np.empty(len(post), dtype=np.int64)
+        offset[post] = np.cumsum(all_F[post]) - all_F[post]
+        block = _Block(int(all_F.sum()))
+        node0 = 0
+        for lo, hi, seg, g, out, has_cmp, i_k, j_k, local, F in done:
+            base = offset[node0 + seg] + local
+            node0 += len(lo)
+            block.highlight(base[has_cmp], i_k[has_cmp], j_k[has_cmp])
+            wr_pos = base + has_cmp
+            block.highlight(wr_pos, g)
+            block.swapped[wr_pos] = True
+            block.writes(wr_pos, [(g, out)])
+            block.count(base[has_cmp], reads=2, comparisons=1)
+            block.count(wr_pos, reads=1, writes=1)
+            # Copying the range into the auxiliary buffer happens before the first frame.
+            size = hi - lo + 1
+            first = offset[node0 - len(lo):node0]
+            block.ops[0, first] += size
+            block.ops[1, first] += size
+        ranges = np.empty((block.F, 2), dtype=np.int64)
+        ranges[:, 0] = np.repeat(all_lo[post], all_F[post])
+        ranges[:, 1] = np.repeat(all_hi[post], all_F[post])
+        block.meta["active_range"] = (np.arange(block.F), ranges, "tuple_int")
+        events.add(block)
+    events.final({})
+    return events.to_trace(keyframe_every)
+
+
+def quick_sort_trace(data, keyframe_every: Optional[int] = None) -> SortTrace:
+    """All partitions of one recursion level are done in one vectorized pass.
+
+    In a Lomuto partition the elements greater than the pivot form a queue
+    that rotates on every swap: its front moves to position j. The front
+    value at the r-th swap is slot r of the append-only "tape" of queue
+    pushes, resolved by pointer jumping instead of a per-swap loop. Frames
+    are then scattered into the generator's pre-order (parent first, left
+    before right).
+
+    Elements equal to the pivot all go left, so a run of m equal values
+    takes O(m²) frames. Inputs with few distinct values (such as
+    make_input's default 0..100 range) stay practical only up to about 10^4.
+    """
+    events = _Events(data)
+    a = events.initial.copy()
+    n = len(a)
+    done = []
+    lo, hi = (np.asarray([0]), np.asarray([n - 1])) if n > 1 else (np.zeros(0, dtype=np.int64),) * 2
+    while len(lo):
+        pivots = a[hi].copy()
+        seg, k, starts = _segments(hi - lo)
+        g = lo[seg] + k
+        v = a[g]
+        le = v <= pivots[seg]
+        i_before = lo[seg] + _seg_cumsum(le, seg, starts)
+        rot = le & (i_before != g)
+        greater = ~le
+        appends = greater | rot
+        n_app = np.bincount(seg, weights=appends, minlength=len(lo)).astype(np.int64)
+        tape_start = np.cumsum(n_app) - n_app
+        slot = tape_start[seg] + _seg_cumsum(appends, seg, starts)
+        r_slot = tape_start[seg] + _seg_cumsum(rot, seg, starts)
+        src = np.arange(int(n_app.sum()))
+        tape_base = np.zeros(len(src), dtype=np.int64)
+        src[slot[rot]] = r_slot[rot]
+        tape_base[slot[greater]] = v[greater]
+        tape = _resolve_tape(src, tape_base)
+        front = tape[r_slot[rot]]
+
+        p = lo + np.add.reduceat(le.astype(np.int64), starts)
+        R = np.bincount(seg, weights=rot, minlength=len(lo)).astype(np.int64)
+        final = p != hi
+        F = 1 + (hi - lo) + R + final
+        local = 1 + _seg_cumsum(1 + rot, seg, starts)
+        done.append((lo, hi, pivots, seg, g, v, le, i_before, rot, front, local, p, final,
+                     tape[(tape_start + R)[final]], F))
+
+        # Apply the partition: <= pivot run, then pivot, then the rotated queue with its front at hi.
+        a[i_before[le]] = v[le]
+        tape_seg = np.repeat(np.arange(len(lo)), n_app)
+        t_local = np.arange(len(tape)) - tape_start[tape_seg]
+        r = R[tape_seg]
+        keep = t_local >= r
+        pos = np.where(t_local > r, p[tape_seg] + (t_local - r), hi[tape_seg])
+        a[pos[keep]] = tape[keep]
+        a[p[final]] = pivots[final]
+
+        lo, hi = np.concatenate([lo, p + 1]), np.concatenate([p - 1, hi])
+        keep = lo < hi
+        lo, hi = lo[keep], hi[keep]
+
+    if done:
+        all_lo = np.concatenate([d[0] for d in done])
+        all_hi = np.concatenate([d[1] for d in done])
+        all_F = np.concatenate([d[14] for d in done])
+        pre = np.lexsort((-all_hi, all_lo))
+        offset = np.empty(len(pre), dtype=np.int64)
+        offset[pre] = np.cumsum(all_F[pre]) - all_F[pre]
+        block = _Block(int(all_F.sum()))
+        pivot_meta = np.repeat(all_hi[pre], all_F[pre])
+        node0 = 0
+        for lo, hi, pivots, seg, g, v, le, i_before, rot, front, local, p, final, hi_val, F in done:
+            off = offset[node0:node0 + len(lo)]
+            node0 += len(lo)
+            block.highlight(off, hi)
+            cmp_pos = off[seg] + local
+            block.highlight(cmp_pos, g, hi[seg])
+            rot_pos = cmp_pos[rot] + 1
+            block.highlight(rot_pos, i_before[rot], g[rot])
+            block.swapped[rot_pos] = True
+            block.writes(rot_pos, [(i_before[rot], v[rot]), (g[rot], front)])
+            fin_pos = (off + F - 1)[final]
+            block.highlight(fin_pos, p[final], hi[final])
+            block.swapped[fin_pos] = True
+            block.writes(fin_pos, [(p[final], pivots[final]), (hi[final], hi_val)])
+            block.count(off, reads=1)
+            block.count(cmp_pos, reads=1, comparisons=1)
+            block.count(rot_pos, reads=2, writes=2, swaps=1)
+            block.count(fin_pos, reads=2, writes=2, swaps=1)
+            pivot_meta[fin_pos] = p[final]
+        ranges = np.empty((block.F, 2), dtype=np.int64)
+        ranges[:, 0] = np.repeat(all_lo[pre], all_F[pre])
+        ranges[:, 1] = np.repeat(all_hi[pre], all_F[pre])
+        block.meta["pivot"] = (np.arange(block.F), pivot_meta, "int")
+        block.meta["active_range"] = (np.arange(block.F), ranges, "tuple_int")
+        events.add(block)
+    events.final({})
+    return events.to_trace(keyframe_every)
+
+
+BATCH_TRACERS: Dict[str, Callable[..., SortTrace]] = {
+    "bubble_sort": bubble_sort_trace,
+    "insertion_sort": insertion_sort_trace,
+    "merge_sort": merge_sort_trace,
+    "quick_sort": quick_sort_trace,
+}
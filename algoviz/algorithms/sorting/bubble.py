@@ -1,15 +1,23 @@
-from typing import Generator, List, Optional, Tuple, Dict
-Frame = Tuple[List[int], Optional[Tuple[int, ...]], bool, Dict]
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import instrument
 
-def bubble_sort(data: List[int]) -> Generator[Frame, None, None]:
-    arr = data.copy()
+def bubble_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame."""
+    arr, cmp, ops = instrument(data)
+    vals = arr.values
     n = len(arr)
     for i in range(n):
         for j in range(0, n - i - 1):
-            meta = {"sorted_tail_len": i}
-            yield (arr.copy(), (j, j + 1), False, meta)
-            if arr[j] > arr[j + 1]:
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                meta = {"sorted_tail_len": i}
-                yield (arr.copy(), (j, j + 1), True, meta)
-    yield (arr.copy(), None, False, {"sorted_tail_len": n})
+            out_of_order = cmp.lt(arr[j + 1], arr[j])
+            if frames:
+                yield ((), (j, j + 1), False, {"sorted_tail_len": i, "ops": ops.snapshot()})
+            if out_of_order:
+                arr.swap(j, j + 1)
+                if frames:
+                    meta = {"sorted_tail_len": i, "ops": ops.snapshot()}
+                    yield (((j, vals[j]), (j + 1, vals[j + 1])), (j, j + 1), True, meta)
+    yield ((), None, False, {"sorted_tail_len": n, "ops": ops.snapshot()})
+
+def bubble_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, bubble_sort_deltas(data))
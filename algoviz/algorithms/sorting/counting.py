@@ -0,0 +1,38 @@
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import CountingArray, instrument
+
+def counting_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    Counts every value into a histogram over [min, max], then rewrites the
+    array bucket by bucket. Meta: "bucket" (the value being counted or
+    written), "active_range", its span of the output, and "sorted_prefix_len".
+    Histogram increments count as a read and a write; no comparisons are made.
+    """
+    arr, _, ops = instrument(data)
+    n = len(arr)
+    if n > 1:
+        values = arr[0:n]
+        lo, hi = min(values), max(values)
+        counts = CountingArray([0] * (hi - lo + 1), ops)
+        for i in range(n):
+            value = arr[i]
+            counts[value - lo] += 1
+            if frames:
+                yield ((), (i,), False, {"bucket": value, "sorted_prefix_len": 0, "ops": ops.snapshot()})
+        k = 0
+        for b in range(len(counts)):
+            size = counts[b]
+            start = k
+            for _ in range(size):
+                arr[k] = b + lo
+                k += 1
+                if frames:
+                    meta = {"bucket": b + lo, "active_range": (start, start + size - 1), "sorted_prefix_len": k,
+                            "ops": ops.snapshot()}
+                    yield (((k - 1, b + lo),), (k - 1,), True, meta)
+    yield ((), None, False, {"sorted_prefix_len": n, "ops": ops.snapshot()})
+
+def counting_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, counting_sort_deltas(data))
@@ -0,0 +1,23 @@
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+# Full frame: (values, highlight, swapped, meta) -- one array copy per step.
+Frame = Tuple[List[int], Optional[Tuple[int, ...]], bool, Dict]
+# Delta frame: (writes, highlight, swapped, meta) where writes = ((index, new_value), ...)
+Writes = Tuple[Tuple[int, int], ...]
+DeltaFrame = Tuple[Writes, Optional[Tuple[int, ...]], bool, Dict]
+
+
+def apply_writes(arr: List[int], writes: Writes) -> List[int]:
+    """Apply a delta frame's writes to arr in place and return it."""
+    for idx, val in writes:
+        arr[idx] = val
+    return arr
+
+
+def expand_deltas(data: Iterable[int], deltas: Iterable[DeltaFrame]) -> Generator[Frame, None, None]:
+    """Compatibility adapter: turn delta frames back into full (values, highlight, swapped, meta) frames."""
+    arr = list(data)
+    for writes, highlight, swapped, meta in deltas:
+        apply_writes(arr, writes)
+        yield (arr.copy(), highlight, swapped, meta)
+
@@ -0,0 +1,55 @@
+from typing import Callable, Dict, Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import Comparator, CountingArray, instrument
+
+def heap_sort_range(arr: CountingArray, cmp: Comparator, lo: int, hi: int, frames: bool,
+                    meta: Callable[[int], Dict]) -> Generator[DeltaFrame, None, None]:
+    """Heap sort arr[lo..hi] in place; meta(end) describes the frame while the heap is arr[lo..end].
+
+    Shared by heap sort and introsort's depth-limit fallback.
+    """
+    vals = arr.values
+
+    def _sift(root: int, end: int):
+        while True:
+            child = lo + 2 * (root - lo) + 1
+            if child > end:
+                return
+            if child + 1 <= end and cmp.lt(arr[child], arr[child + 1]):
+                child += 1
+            smaller = cmp.lt(arr[root], arr[child])
+            if frames:
+                yield ((), (root, child), False, meta(end))
+            if not smaller:
+                return
+            arr.swap(root, child)
+            if frames:
+                yield (((root, vals[root]), (child, vals[child])), (root, child), True, meta(end))
+            root = child
+
+    for root in range(lo + (hi - lo + 1) // 2 - 1, lo - 1, -1):
+        yield from _sift(root, hi)
+    for end in range(hi, lo, -1):
+        arr.swap(lo, end)
+        if frames:
+            yield (((lo, vals[lo]), (end, vals[end])), (lo, end), True, meta(end - 1))
+        yield from _sift(lo, end - 1)
+
+def heap_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    Meta: "active_range" is the heap still to drain and "sorted_tail_len" the
+    maximums already moved behind it.
+    """
+    arr, cmp, ops = instrument(data)
+    n = len(arr)
+
+    def _meta(end: int) -> Dict:
+        return {"active_range": (0, end), "sorted_tail_len": n - 1 - end, "ops": ops.snapshot()}
+
+    if n > 1:
+        yield from heap_sort_range(arr, cmp, 0, n - 1, frames, _meta)
+    yield ((), None, False, {"sorted_tail_len": n, "ops": ops.snapshot()})
+
+def heap_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, heap_sort_deltas(data))
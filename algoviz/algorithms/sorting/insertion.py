@@ -1,17 +1,27 @@
-from typing import Generator, List, Optional, Tuple, Dict
-Frame = Tuple[List[int], Optional[Tuple[int, ...]], bool, Dict]
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import instrument
 
-def insertion_sort(data: List[int]) -> Generator[Frame, None, None]:
-    arr = data.copy()
+def insertion_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame."""
+    arr, cmp, ops = instrument(data)
     n = len(arr)
     for i in range(1, n):
         key = arr[i]
         j = i - 1
-        yield (arr.copy(), (j, i), False, {"sorted_prefix_len": i})
-        while j >= 0 and arr[j] > key:
+        larger = cmp.lt(key, arr[j])
+        if frames:
+            yield ((), (j, i), False, {"sorted_prefix_len": i, "ops": ops.snapshot()})
+        while larger:
             arr[j + 1] = arr[j]
-            yield (arr.copy(), (j, j + 1), True, {"sorted_prefix_len": i})
+            if frames:
+                yield (((j + 1, arr.values[j]),), (j, j + 1), True, {"sorted_prefix_len": i, "ops": ops.snapshot()})
             j -= 1
+            larger = j >= 0 and cmp.lt(key, arr[j])
         arr[j + 1] = key
-        yield (arr.copy(), (j + 1,), True, {"sorted_prefix_len": i + 1})
-    yield (arr.copy(), None, False, {"sorted_prefix_len": n})
+        if frames:
+            yield (((j + 1, key),), (j + 1,), True, {"sorted_prefix_len": i + 1, "ops": ops.snapshot()})
+    yield ((), None, False, {"sorted_prefix_len": n, "ops": ops.snapshot()})
+
+def insertion_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, insertion_sort_deltas(data))
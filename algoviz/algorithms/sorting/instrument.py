@@ -0,0 +1,110 @@
+"""Exact operation counting for sorting algorithms.
+
+An algorithm reads and writes its working array through a CountingArray and
+compares elements through a Comparator, both sharing one OpCounter, so every
+read, write, comparison and swap is counted where it happens instead of being
+guessed from the frames afterwards. Generators put the running totals in each
+frame's meta under "ops" as a (reads, writes, comparisons, swaps) tuple.
+"""
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+OPS_FIELDS = ("reads", "writes", "comparisons", "swaps")
+Ops = Tuple[int, int, int, int]
+
+
+class OpCounter:
+    """Running reads/writes/comparisons/swaps totals for one sorting run."""
+
+    __slots__ = OPS_FIELDS
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.comparisons = 0
+        self.swaps = 0
+
+    def snapshot(self) -> Ops:
+        return (self.reads, self.writes, self.comparisons, self.swaps)
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(zip(OPS_FIELDS, self.snapshot()))
+
+
+class CountingArray:
+    """List proxy that counts element reads and writes.
+
+    A swap(i, j) counts as one swap plus its two reads and two writes. Slices
+    count one read or write per element. `values` is the underlying list, for
+    building frames without touching the counters.
+    """
+
+    __slots__ = ("values", "_ops")
+
+    def __init__(self, data: Iterable[int], ops: OpCounter):
+        self.values: List[int] = list(data)
+        self._ops = ops
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index):
+        value = self.values[index]
+        self._ops.reads += len(value) if isinstance(index, slice) else 1
+        return value
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            self._ops.writes += len(value)
+        else:
+            self._ops.writes += 1
+        self.values[index] = value
+
+    def swap(self, i: int, j: int) -> None:
+        values = self.values
+        values[i], values[j] = values[j], values[i]
+        ops = self._ops
+        ops.reads += 2
+        ops.writes += 2
+        ops.swaps += 1
+
+
+class Comparator:
+    """Element comparisons that count themselves; `key` maps elements before comparing."""
+
+    __slots__ = ("_ops", "_key")
+
+    def __init__(self, ops: OpCounter, key: Optional[Callable] = None):
+        self._ops = ops
+        self._key = key
+
+    def lt(self, a, b) -> bool:
+        self._ops.comparisons += 1
+        if self._key is not None:
+            return self._key(a) < self._key(b)
+        return a < b
+
+    def le(self, a, b) -> bool:
+        self._ops.comparisons += 1
+        if self._key is not None:
+            return self._key(a) <= self._key(b)
+        return a <= b
+
+
+def instrument(data: Iterable[int]) -> Tuple[CountingArray, Comparator, OpCounter]:
+    """A counting working copy of data, plus the comparator and counter that go with it."""
+    ops = OpCounter()
+    return CountingArray(data, ops), Comparator(ops), ops
+
+
+def count_ops(deltas_fn: Callable, data: Iterable[int]) -> Dict[str, int]:
+    """Count-only mode: run a *_deltas generator with frames=False and return its exact totals.
+
+    No intermediate frames are built, so this is the cheap path for large-n
+    complexity measurements.
+    """
+    last = deque(deltas_fn(list(data), frames=False), maxlen=1)
+    if not last or "ops" not in last[0][3]:
+        raise ValueError(f"{getattr(deltas_fn, '__name__', deltas_fn)} does not report operation counts.")
+    return dict(zip(OPS_FIELDS, last[0][3]["ops"]))
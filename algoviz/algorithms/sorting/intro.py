@@ -0,0 +1,103 @@
+from typing import Dict, Generator, List, Optional
+from .frames import DeltaFrame, Frame, expand_deltas
+from .heap import heap_sort_range
+from .instrument import instrument
+
+INSERTION_CUTOFF = 16
+
+def intro_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    Introsort: median-of-three quick sort that recurses into the smaller side
+    only, switches a range to heap sort once it has been partitioned
+    2·log2(n) times, and finishes ranges of INSERTION_CUTOFF or fewer with
+    insertion sort. Stack depth stays O(log n), so unlike quick_sort_deltas it
+    handles sorted input at any n. Meta: "phase", "active_range" and, while
+    partitioning, "pivot".
+    """
+    arr, cmp, ops = instrument(data)
+    vals = arr.values
+    n = len(arr)
+
+    def _meta(phase: str, lo: int, hi: int, pivot: Optional[int] = None) -> Dict:
+        meta = {"phase": phase, "active_range": (lo, hi), "ops": ops.snapshot()}
+        if pivot is not None:
+            meta["pivot"] = pivot
+        return meta
+
+    def _order(i: int, j: int, lo: int, hi: int):
+        out_of_order = cmp.lt(arr[j], arr[i])
+        if frames:
+            yield ((), (i, j), False, _meta("partition", lo, hi))
+        if out_of_order:
+            arr.swap(i, j)
+            if frames:
+                yield (((i, vals[i]), (j, vals[j])), (i, j), True, _meta("partition", lo, hi))
+
+    def _partition(lo: int, hi: int):
+        # Median of three moved to hi, then a Lomuto partition as in quick sort
+        mid = (lo + hi) // 2
+        yield from _order(lo, mid, lo, hi)
+        yield from _order(mid, hi, lo, hi)
+        yield from _order(lo, mid, lo, hi)
+        arr.swap(mid, hi)
+        if frames:
+            yield (((mid, vals[mid]), (hi, vals[hi])), (mid, hi), True, _meta("partition", lo, hi, hi))
+        pivot = arr[hi]
+        i = lo
+        for j in range(lo, hi):
+            not_greater = cmp.le(arr[j], pivot)
+            if frames:
+                yield ((), (j, hi), False, _meta("partition", lo, hi, hi))
+            if not_greater:
+                if i != j:
+                    arr.swap(i, j)
+                    if frames:
+                        yield (((i, vals[i]), (j, vals[j])), (i, j), True, _meta("partition", lo, hi, hi))
+                i += 1
+        if i != hi:
+            arr.swap(i, hi)
+            if frames:
+                yield (((i, vals[i]), (hi, vals[hi])), (i, hi), True, _meta("partition", lo, hi, i))
+        return i
+
+    def _insertion(lo: int, hi: int):
+        for i in range(lo + 1, hi + 1):
+            key = arr[i]
+            j = i - 1
+            larger = cmp.lt(key, arr[j])
+            if frames:
+                yield ((), (j, i), False, _meta("insertion", lo, hi))
+            while larger:
+                arr[j + 1] = arr[j]
+                if frames:
+                    yield (((j + 1, vals[j]),), (j, j + 1), True, _meta("insertion", lo, hi))
+                j -= 1
+                larger = j >= lo and cmp.lt(key, arr[j])
+            if j + 1 != i:
+                arr[j + 1] = key
+                if frames:
+                    yield (((j + 1, key),), (j + 1,), True, _meta("insertion", lo, hi))
+
+    def _sort(lo: int, hi: int, depth: int):
+        while hi - lo + 1 > INSERTION_CUTOFF:
+            if depth == 0:
+                yield from heap_sort_range(arr, cmp, lo, hi, frames, lambda end: _meta("heap", lo, end))
+                return
+            depth -= 1
+            p = yield from _partition(lo, hi)
+            if p - lo < hi - p:
+                yield from _sort(lo, p - 1, depth)
+                lo = p + 1
+            else:
+                yield from _sort(p + 1, hi, depth)
+                hi = p - 1
+        if lo < hi:
+            yield from _insertion(lo, hi)
+
+    if n > 1:
+        yield from _sort(0, n - 1, 2 * (n.bit_length() - 1))
+    yield ((), None, False, {"ops": ops.snapshot()})
+
+def intro_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, intro_sort_deltas(data))
@@ -1,29 +1,32 @@
-from typing import Generator, List, Optional, Tuple, Dict
-Frame = Tuple[List[int], Optional[Tuple[int, ...]], bool, Dict]
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import CountingArray, instrument
 
-def merge_sort(data: List[int]) -> Generator[Frame, None, None]:
-    arr = data.copy()
-    aux = arr.copy()
+def merge_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    Copying a range into the auxiliary buffer counts as reads and writes, and
+    every output write counts as a write; merge sort makes no swaps.
+    """
+    arr, cmp, ops = instrument(data)
+    aux = CountingArray(arr.values, ops)
 
     def _merge(lo: int, mid: int, hi: int):
         aux[lo:hi+1] = arr[lo:hi+1]
         i, j = lo, mid + 1
         for k in range(lo, hi + 1):
-            meta = {"active_range": (lo, hi)}
             if i <= mid and j <= hi:
-                yield (arr.copy(), (i, j), False, meta)
-            if i > mid:
-                arr[k] = aux[j]; j += 1
-                yield (arr.copy(), (k,), True, meta)
-            elif j > hi:
-                arr[k] = aux[i]; i += 1
-                yield (arr.copy(), (k,), True, meta)
-            elif aux[j] < aux[i]:
+                take_right = cmp.lt(aux[j], aux[i])
+                if frames:
+                    yield ((), (i, j), False, {"active_range": (lo, hi), "ops": ops.snapshot()})
+            else:
+                take_right = i > mid
+            if take_right:
                 arr[k] = aux[j]; j += 1
-                yield (arr.copy(), (k,), True, meta)
             else:
                 arr[k] = aux[i]; i += 1
-                yield (arr.copy(), (k,), True, meta)
+            if frames:
+                yield (((k, arr.values[k]),), (k,), True, {"active_range": (lo, hi), "ops": ops.snapshot()})
 
     def _sort(lo: int, hi: int):
         if lo >= hi:
@@ -35,4 +38,7 @@ def merge_sort(data: List[int]) -> Generator[Frame, None, None]:
 
     if len(arr) > 1:
         yield from _sort(0, len(arr) - 1)
-    yield (arr.copy(), None, False, {})
+    yield ((), None, False, {"ops": ops.snapshot()})
+
+def merge_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, merge_sort_deltas(data))
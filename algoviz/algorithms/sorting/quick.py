@@ -1,26 +1,37 @@
-from typing import Generator, List, Optional, Tuple, Dict
-Frame = Tuple[List[int], Optional[Tuple[int, ...]], bool, Dict]
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import instrument
 
-def quick_sort(data: List[int]) -> Generator[Frame, None, None]:
-    arr = data.copy()
+def quick_sort_deltas(data: List[int], frames: bool = True) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    The "show pivot" frame only reads the pivot; it is not a comparison.
+    """
+    arr, cmp, ops = instrument(data)
+    vals = arr.values
 
     def _partition(lo: int, hi: int):
         pivot = arr[hi]
-        meta = {"pivot": hi, "active_range": (lo, hi)}
-        yield (arr.copy(), (hi,), False, meta)  # show pivot
+        if frames:
+            yield ((), (hi,), False, {"pivot": hi, "active_range": (lo, hi), "ops": ops.snapshot()})  # show pivot
         i = lo
         for j in range(lo, hi):
-            meta = {"pivot": hi, "active_range": (lo, hi)}
-            yield (arr.copy(), (j, hi), False, meta)  # compare with pivot
-            if arr[j] <= pivot:
+            not_greater = cmp.le(arr[j], pivot)
+            if frames:
+                meta = {"pivot": hi, "active_range": (lo, hi), "ops": ops.snapshot()}
+                yield ((), (j, hi), False, meta)  # compare with pivot
+            if not_greater:
                 if i != j:
-                    arr[i], arr[j] = arr[j], arr[i]
-                    yield (arr.copy(), (i, j), True, meta)
+                    arr.swap(i, j)
+                    if frames:
+                        meta = {"pivot": hi, "active_range": (lo, hi), "ops": ops.snapshot()}
+                        yield (((i, vals[i]), (j, vals[j])), (i, j), True, meta)
                 i += 1
         if i != hi:
-            arr[i], arr[hi] = arr[hi], arr[i]
-            meta = {"pivot": i, "active_range": (lo, hi)}
-            yield (arr.copy(), (i, hi), True, meta)
+            arr.swap(i, hi)
+            if frames:
+                meta = {"pivot": i, "active_range": (lo, hi), "ops": ops.snapshot()}
+                yield (((i, vals[i]), (hi, vals[hi])), (i, hi), True, meta)
         return i
 
     def _qs(lo: int, hi: int):
@@ -31,4 +42,7 @@ def quick_sort(data: List[int]) -> Generator[Frame, None, None]:
 
     if len(arr) > 1:
         yield from _qs(0, len(arr) - 1)
-    yield (arr.copy(), None, False, {})
+    yield ((), None, False, {"ops": ops.snapshot()})
+
+def quick_sort(data: List[int]) -> Generator[Frame, None, None]:
+    return expand_deltas(data, quick_sort_deltas(data))
@@ -0,0 +1,49 @@
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import CountingArray, instrument
+
+def radix_sort_deltas(data: List[int], frames: bool = True, base: int = 10) -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    LSD radix sort of non-negative integers, one stable counting pass per
+    digit. Each pass shows the elements being counted into buckets, then the
+    buffer being copied back; the scatter into the buffer is counted but not
+    framed. Meta: "digit" (0 = least significant), "bucket", and
+    "active_range", the bucket's span of the output. No comparisons are made.
+    """
+    arr, _, ops = instrument(data)
+    n = len(arr)
+    if n and min(arr.values) < 0:
+        raise ValueError("Radix sort needs non-negative integers.")
+    largest = max(arr[0:n]) if n > 1 else 0
+    aux = CountingArray([0] * n, ops)
+    exp, digit = 1, 0
+    while n > 1 and (digit == 0 or largest // exp > 0):
+        counts = CountingArray([0] * base, ops)
+        for i in range(n):
+            b = arr[i] // exp % base
+            counts[b] += 1
+            if frames:
+                yield ((), (i,), False, {"digit": digit, "bucket": b, "ops": ops.snapshot()})
+        for b in range(1, base):
+            counts[b] += counts[b - 1]
+        ends = counts.values.copy()  # bucket b fills [ends[b] - size, ends[b])
+        for i in range(n - 1, -1, -1):
+            value = arr[i]
+            b = value // exp % base
+            counts[b] -= 1
+            aux[counts[b]] = value
+        starts = counts.values
+        for k in range(n):
+            value = aux[k]
+            arr[k] = value
+            if frames:
+                b = value // exp % base
+                meta = {"digit": digit, "bucket": b, "active_range": (starts[b], ends[b] - 1), "ops": ops.snapshot()}
+                yield (((k, value),), (k,), True, meta)
+        exp *= base
+        digit += 1
+    yield ((), None, False, {"ops": ops.snapshot()})
+
+def radix_sort(data: List[int], base: int = 10) -> Generator[Frame, None, None]:
+    return expand_deltas(data, radix_sort_deltas(data, base=base))
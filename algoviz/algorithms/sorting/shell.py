@@ -0,0 +1,57 @@
+from typing import Generator, List
+from .frames import DeltaFrame, Frame, expand_deltas
+from .instrument import instrument
+
+CIURA_GAPS = (1, 4, 10, 23, 57, 132, 301, 701)
+GAP_SEQUENCES = ("ciura", "knuth", "shell")
+
+def shell_gaps(n: int, sequence: str = "ciura") -> List[int]:
+    """Decreasing gaps below n, ending in 1: Ciura's (extended by x2.25), Knuth's 3h+1, or Shell's n/2^k."""
+    if sequence == "shell":
+        gaps, gap = [], n // 2
+        while gap > 0:
+            gaps.append(gap)
+            gap //= 2
+        return gaps or [1]
+    if sequence == "knuth":
+        gaps = [1]
+        while 3 * gaps[-1] + 1 < n:
+            gaps.append(3 * gaps[-1] + 1)
+        return gaps[::-1]
+    if sequence == "ciura":
+        gaps = list(CIURA_GAPS)
+        while gaps[-1] * 9 // 4 < n:
+            gaps.append(gaps[-1] * 9 // 4)
+        return [g for g in gaps if g < n][::-1] or [1]
+    raise ValueError(f"Unknown gap sequence {sequence!r}; expected one of {GAP_SEQUENCES}.")
+
+def shell_sort_deltas(data: List[int], frames: bool = True, gaps: str = "ciura") -> Generator[DeltaFrame, None, None]:
+    """Delta frames with exact running counts in meta["ops"]; frames=False yields only the final frame.
+
+    Gapped insertion sort for each gap of the chosen sequence. Meta: "gap" and
+    "active_range", the span the current element is being shifted across.
+    """
+    arr, cmp, ops = instrument(data)
+    n = len(arr)
+    for gap in (shell_gaps(n, gaps) if n > 1 else []):
+        for i in range(gap, n):
+            key = arr[i]
+            j = i
+            larger = cmp.lt(key, arr[j - gap])
+            if frames:
+                yield ((), (j - gap, i), False, {"gap": gap, "active_range": (j - gap, i), "ops": ops.snapshot()})
+            while larger:
+                arr[j] = arr[j - gap]
+                if frames:
+                    meta = {"gap": gap, "active_range": (j - gap, i), "ops": ops.snapshot()}
+                    yield (((j, arr.values[j]),), (j - gap, j), True, meta)
+                j -= gap
+                larger = j >= gap and cmp.lt(key, arr[j - gap])
+            if j != i:
+                arr[j] = key
+                if frames:
+                    yield (((j, key),), (j,), True, {"gap": gap, "active_range": (j, i), "ops": ops.snapshot()})
+    yield ((), None, False, {"gap": 1, "ops": ops.snapshot()})
+
+def shell_sort(data: List[int], gaps: str = "ciura") -> Generator[Frame, None, None]:
+    return expand_deltas(data, shell_sort_deltas(data, gaps=gaps))
@@ -0,0 +1,279 @@
+"""Headless benchmarks for algorithms, trace recording and figure building.
+
+    python -m algoviz.bench                      # full sweep, writes bench_results.json
+    python -m algoviz.bench --quick --baseline bench_baseline.json
+    python -m algoviz.bench --quick --startup    # add cold-start and first-render latency
+
+Each record measures, separately: generator throughput (frames/s), peak
+memory while recording a trace, figure build time and figure JSON size.
+With --startup it also measures, in fresh interpreters, cold import time of
+the heavy modules and each page's time to first paint (its header) and to
+the end of its first run.
+With --baseline, lower-is-better metrics are compared against a saved run
+and the exit code is 1 if any regressed by more than --tolerance.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algoviz.algorithms.graphs.utils import build_topology
+from algoviz.inputs import SHAPES, make_input
+from algoviz.registry import REGISTRY, AlgorithmSpec
+from algoviz.trace.graph import GraphTrace
+from algoviz.trace.sorting import SortTrace
+
+# Every registered algorithm, by spec name, so new ones are benchmarked (and baselined) without edits here
+SORTING: Dict[str, AlgorithmSpec] = {spec.name: spec for spec in REGISTRY.algorithms("sorting")}
+GRAPHS: Dict[str, AlgorithmSpec] = {spec.name: spec for spec in REGISTRY.algorithms("graphs")}
+SORT_SIZES = (50, 150, 400)
+GRID_SIDES = (6, 12, 20)
+QUICK_SORT_SIZES = (50, 150)
+QUICK_GRID_SIDES = (6, 12)
+
+STARTUP_MODULES = ("numpy", "algoviz.registry", "algoviz.trace.cache", "algoviz.components.bars",
+                   "algoviz.components.animation", "algoviz.algorithms.sorting.batch", "algoviz.trace.graph", "algoviz.complexity")
+STARTUP_PAGES = ("app.py", "pages/1_🔢_Sorting.py", "pages/2_🧭_Graphs.py", "pages/3_📈_Complexity.py")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics compared against a baseline; all are lower-is-better.
+COMPARED = ("us_per_frame", "record_peak_bytes", "figure_build_ms", "figure_json_bytes",
+            "cold_import_ms", "first_paint_ms", "first_render_ms")
+
+# Streamlit is already loaded when the server runs a page, so it is imported before the clock starts.
+_IMPORT_PROBE = """
+import time, streamlit
+t0 = time.perf_counter()
+import {module}
+print((time.perf_counter() - t0) * 1000.0)
+"""
+# Clocks start when the page's module code starts running (a one-shot profile hook on the
+# script thread), so AppTest's own setup is excluded. First paint is the page's st.title
+# call; first render is the end of its first script run.
+_PAGE_PROBE = """
+import json, sys, threading, time
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+path = {path!r}
+marks = {{}}
+def _on_call(frame, event, arg):
+    if event == "call" and frame.f_code.co_filename == path:
+        marks["start"] = time.perf_counter()
+        sys.setprofile(None)
+threading.setprofile(_on_call)
+_title = st.title
+def _marked_title(*args, **kwargs):
+    marks.setdefault("paint", time.perf_counter())
+    return _title(*args, **kwargs)
+st.title = _marked_title
+at = AppTest.from_file(path, default_timeout=300)
+at.run()
+end = time.perf_counter()
+start = marks.get("start", end)
+print(json.dumps({{"first_paint_ms": (marks["paint"] - start) * 1000.0 if "paint" in marks else None,
+                  "first_render_ms": (end - start) * 1000.0, "failed": bool(at.exception)}}))
+"""
+
+
+def _time_exhaust(frames: Iterable) -> Tuple[int, float]:
+    count = 0
+    t0 = time.perf_counter()
+    for _ in frames:
+        count += 1
+    return count, time.perf_counter() - t0
+
+
+def _peak_bytes(fn: Callable):
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def _figure_cost(build: Callable, repeat: int) -> Tuple[float, int]:
+    times = []
+    fig = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fig = build()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000.0, len(fig.to_json())
+
+
+def bench_sorting(name: str, n: int, shape: str, repeat: int = 3) -> Dict:
+    from algoviz.components.bars import make_bar_figure
+
+    spec = SORTING[name]
+    data = make_input(n, shape)
+    frames, seconds = _time_exhaust(spec.make_deltas(list(data)))
+    trace, peak = _peak_bytes(lambda: SortTrace.record(data, spec.make_deltas(list(data))))
+    values, highlight, _, _ = trace.frame(len(trace) // 2)
+    build_ms, json_bytes = _figure_cost(lambda: make_bar_figure(values, highlight=highlight, title=name), repeat)
+    return _record("sorting", name, n, shape, frames, seconds, peak, trace.nbytes, build_ms, json_bytes)
+
+
+def bench_graph(name: str, side: int, shape: str = "grid", repeat: int = 3) -> Dict:
+    from algoviz.components.graph_canvas import make_graph_figure
+
+    spec = GRAPHS[name]
+    graph = build_topology("Grid", side, side)
+    start, goal = 0, side * side - 1
+    # Seeded algorithms get the page's default seeds: the two endpoints
+    kwargs = {"sources": (start, goal)} if "seeds" in spec.meta else {}
+    frames, seconds = _time_exhaust(spec.make_deltas(graph, start=start, goal=goal, **kwargs))
+    trace, peak = _peak_bytes(lambda: GraphTrace.record_deltas(range(graph.num_nodes),
+                                                               spec.make_deltas(graph, start=start, goal=goal, **kwargs)))
+    node_colors, edge_colors, _ = trace.frame(len(trace) // 2)
+    build_ms, json_bytes = _figure_cost(
+        lambda: make_graph_figure(graph, None, title=name, node_colors=node_colors, edge_colors=edge_colors), repeat)
+    return _record("graph", name, side * side, shape, frames, seconds, peak, trace.nbytes, build_ms, json_bytes)
+
+
+def _fresh_python(code: str) -> str:
+    """Run code in a new interpreter (background warm-up off) and return its last output line."""
+    env = dict(os.environ, ALGOVIZ_WARM_UP="0")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+
+def bench_startup(repeat: int = 3) -> List[Dict]:
+    """Cold import time per module and first paint/render per page, median of `repeat` fresh interpreters."""
+    records = []
+    for module in STARTUP_MODULES:
+        times = [float(_fresh_python(_IMPORT_PROBE.format(module=module))) for _ in range(repeat)]
+        records.append({"kind": "startup", "algorithm": module, "n": 0, "shape": "import",
+                        "cold_import_ms": round(statistics.median(times), 3)})
+    for page in STARTUP_PAGES:
+        runs = [json.loads(_fresh_python(_PAGE_PROBE.format(path=os.path.join(ROOT, page)))) for _ in range(repeat)]
+        if any(r["failed"] for r in runs):
+            print(f"warning: {page} raised during its first run", file=sys.stderr)
+        paints = [r["first_paint_ms"] for r in runs if r["first_paint_ms"] is not None]
+        records.append({"kind": "startup", "algorithm": page, "n": 0, "shape": "page",
+                        "first_paint_ms": round(statistics.median(paints), 3) if paints else None,
+                        "first_render_ms": round(statistics.median(r["first_render_ms"] for r in runs), 3)})
+    return records
+
+
+def _record(kind, name, n, shape, frames, seconds, peak, trace_bytes, build_ms, json_bytes) -> Dict:
+    return {
+        "kind": kind,
+        "algorithm": name,
+        "n": n,
+        "shape": shape,
+        "frames": frames,
+        "generator_seconds": round(seconds, 6),
+        "frames_per_s": round(frames / seconds, 1) if seconds > 0 else None,
+        "us_per_frame": round(seconds / frames * 1e6, 3) if frames else None,
+        "record_peak_bytes": peak,
+        "trace_bytes": trace_bytes,
+        "figure_build_ms": round(build_ms, 3),
+        "figure_json_bytes": json_bytes,
+    }
+
+
+def run(quick: bool = False, algorithms: Optional[List[str]] = None, startup: bool = False) -> Dict:
+    sort_sizes = QUICK_SORT_SIZES if quick else SORT_SIZES
+    grid_sides = QUICK_GRID_SIDES if quick else GRID_SIDES
+    results = []
+    for name in SORTING:
+        if algorithms and name not in algorithms:
+            continue
+        for n in sort_sizes:
+            for shape in SHAPES:
+                results.append(bench_sorting(name, n, shape))
+                _progress(results[-1])
+    for name in GRAPHS:
+        if algorithms and name not in algorithms:
+            continue
+        for side in grid_sides:
+            results.append(bench_graph(name, side))
+            _progress(results[-1])
+    if startup:
+        for record in bench_startup(repeat=1 if quick else 3):
+            results.append(record)
+            _progress(record)
+    import plotly
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plotly": plotly.__version__,
+        "results": results,
+    }
+
+
+def _progress(r: Dict) -> None:
+    if r["kind"] == "startup":
+        if r["shape"] == "import":
+            print(f"startup  import {r['algorithm']:40} {r['cold_import_ms']:>9.1f} ms", file=sys.stderr)
+        else:
+            print(f"startup  page   {r['algorithm']:40} paint {r['first_paint_ms'] or 0:>9.1f} ms  "
+                  f"first render {r['first_render_ms']:>9.1f} ms", file=sys.stderr)
+        return
+    print(f"{r['kind']:8} {r['algorithm']:15} n={r['n']:<6} {r['shape']:10} "
+          f"{r['frames']:>8} frames  {r['frames_per_s'] or 0:>12,.0f} frames/s  "
+          f"peak {r['record_peak_bytes'] / 1024:>9.1f} KiB  fig {r['figure_build_ms']:>7.2f} ms  "
+          f"json {r['figure_json_bytes'] / 1024:>7.1f} KiB", file=sys.stderr)
+
+
+def _key(r: Dict) -> Tuple:
+    return (r["kind"], r["algorithm"], r["n"], r["shape"])
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """Return the metrics that got worse than baseline by more than `tolerance` (a ratio)."""
+    base = {_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current.get("results", []):
+        old = base.get(_key(r))
+        if old is None:
+            continue
+        for metric in COMPARED:
+            new_v, old_v = r.get(metric), old.get(metric)
+            if not new_v or not old_v:
+                continue
+            ratio = new_v / old_v
+            if ratio > 1.0 + tolerance:
+                regressions.append({"key": list(_key(r)), "metric": metric, "baseline": old_v, "current": new_v, "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m algoviz.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench_results.json", help="where to write machine-readable results")
+    parser.add_argument("--baseline", help="saved results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio before flagging (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="smaller sweep for CI")
+    parser.add_argument("--algorithm", action="append", dest="algorithms", help="limit to these algorithms (repeatable)")
+    parser.add_argument("--startup", action="store_true", help="also measure cold imports and first page render in fresh interpreters")
+    args = parser.parse_args(argv)
+
+    report = run(quick=args.quick, algorithms=args.algorithms, startup=args.startup)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.tolerance)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.out}", file=sys.stderr)
+
+    for reg in report.get("regressions", []):
+        print(f"REGRESSION {'/'.join(map(str, reg['key']))} {reg['metric']}: "
+              f"{reg['baseline']} -> {reg['current']} (x{reg['ratio']})", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Empirical complexity sweeps for the sorting algorithms.
+
+Each (algorithm, n, distribution, seed) cell runs the instrumented generator in
+count-only mode (frames=False), so no frames are built, and records the exact
+operation counts plus wall time. Cells are cached in the shared trace cache.
+fit_growth() fits c·f(n) for each growth model and ranks them by relative error.
+"""
+from functools import partial
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+import math
+import time
+
+import numpy as np
+
+from algoviz.algorithms.sorting.instrument import count_ops
+from algoviz.inputs import SHAPES, make_input
+from algoviz.registry import REGISTRY
+from algoviz.trace.cache import get_trace_cache
+
+MODELS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n²)": lambda n: n * n,
+}
+METRICS = ("comparisons", "reads", "writes", "seconds")
+
+
+class Measurement(NamedTuple):
+    algorithm: str
+    n: int
+    shape: str
+    seed: int
+    reads: int
+    writes: int
+    comparisons: int
+    swaps: int
+    seconds: float
+
+    @property
+    def nbytes(self) -> int:
+        return 128  # nominal: a handful of scalars in the byte-budgeted cache
+
+
+def sweep_input(n: int, shape: str, seed: int) -> List[int]:
+    """Values scale with n so "random" stays mostly distinct at large n."""
+    return make_input(n, shape, seed, high=max(100, 4 * n))
+
+
+def measure(algorithm: str, n: int, shape: str, seed: int = 0) -> Measurement:
+    """Count-only run of one cell; cached per (algorithm, n, shape, seed)."""
+    def compute() -> Measurement:
+        spec = REGISTRY.algorithm("sorting", algorithm)
+        data = sweep_input(n, shape, seed)
+        t0 = time.perf_counter()
+        ops = count_ops(partial(spec.deltas.resolve(), **spec.options), data)
+        seconds = time.perf_counter() - t0
+        return Measurement(algorithm, n, shape, seed, seconds=seconds, **ops)
+
+    return get_trace_cache().get_or_compute(("complexity", algorithm, n, shape, seed), compute)
+
+
+def sweep(algorithms: Iterable[str], sizes: Sequence[int], shapes: Iterable[str] = ("random",), seed: int = 0,
+          budget_s: float = 2.0, progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+    """Measure every cell, smallest n first, and return one row per cell.
+
+    A size is skipped ("over budget") when the last run scaled quadratically
+    would exceed budget_s. Once the recursive sorts nest deeper than Python
+    allows (e.g. quick sort on sorted input), that size and the larger ones
+    are marked "recursion limit".
+    """
+    sizes = sorted(sizes)
+    cells = [(a, s) for a in algorithms for s in shapes]
+    total, done = len(cells) * len(sizes), 0
+    rows = []
+    for algorithm, shape in cells:
+        last, too_deep = None, False
+        for n in sizes:
+            status = "ok"
+            if too_deep:
+                status = "recursion limit"
+            elif last is not None and last.seconds * (n / last.n) ** 2 > budget_s:
+                status = "over budget"
+            else:
+                try:
+                    last = measure(algorithm, n, shape, seed)
+                except RecursionError:
+                    status, too_deep = "recursion limit", True
+            if status == "ok":
+                rows.append(dict(last._asdict(), status=status))
+            else:
+                rows.append({"algorithm": algorithm, "n": n, "shape": shape, "seed": seed, "status": status})
+            done += 1
+            if progress is not None:
+                progress(done, total)
+    return rows
+
+
+def fit_growth(ns: Sequence[float], ys: Sequence[float]) -> List[Dict]:
+    """Fit y ≈ c·f(n) for each model, minimising relative error; best fit first.
+
+    Each result has the model name, the coefficient c and the RMS relative
+    error, so small and large n weigh the same.
+    """
+    n = np.asarray(ns, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    keep = (n > 1) & (y > 0)
+    n, y = n[keep], y[keep]
+    if len(n) < 2:
+        return []
+    fits = []
+    for name, f in MODELS.items():
+        r = f(n) / y
+        c = float(r.sum() / (r * r).sum())
+        err = float(np.sqrt(np.mean((c * r - 1.0) ** 2)))
+        fits.append({"model": name, "c": c, "rel_error": err})
+    fits.sort(key=lambda fit: fit["rel_error"])
+    return fits
+
+
+def power_sizes(lo_exp: int, hi_exp: int) -> List[int]:
+    return [2 ** k for k in range(lo_exp, hi_exp + 1)]
+
+
+def model_curve(model: str, c: float, ns: Sequence[float]) -> np.ndarray:
+    return c * MODELS[model](np.asarray(ns, dtype=np.float64))
+
+
+def loglog_slope(ns: Sequence[float], ys: Sequence[float]) -> float:
+    """Slope of log y against log n: about 1 for O(n), a bit above for O(n log n), 2 for O(n²)."""
+    n = np.asarray(ns, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    keep = (n > 0) & (y > 0)
+    if keep.sum() < 2:
+        return math.nan
+    return float(np.polyfit(np.log(n[keep]), np.log(y[keep]), 1)[0])
+
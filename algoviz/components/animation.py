@@ -0,0 +1,128 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import math
+
+import numpy as np
+import plotly.graph_objects as go
+
+from .bars import bar_colors, make_bar_figure
+from .graph_canvas import GraphFigure
+
+DEFAULT_MAX_PAYLOAD = 4 * 1024 * 1024  # bytes of frame data shipped to the browser
+
+
+def pick_steps(total_steps: int, bytes_per_frame: int, max_bytes: int = DEFAULT_MAX_PAYLOAD) -> List[int]:
+    """Evenly subsample step indices so the frames fit in max_bytes; always keeps the last step."""
+    if total_steps <= 0:
+        return []
+    budget_frames = max(2, max_bytes // max(1, bytes_per_frame))
+    stride = max(1, math.ceil(total_steps / budget_frames))
+    steps = list(range(0, total_steps, stride))
+    if steps[-1] != total_steps - 1:
+        steps.append(total_steps - 1)
+    return steps
+
+
+class FramesFigure(go.Figure):
+    """A go.Figure whose animation frames are plain dicts.
+
+    Plotly validates every go.Frame property by property, and st.plotly_chart
+    re-validates a dict figure the same way, which costs seconds for a few
+    thousand frames. Here only the base figure (data, layout, controls) is
+    validated; to_dict() passes the frames through as they are.
+    """
+
+    def __init__(self, figure=None, plain_frames: Sequence[Dict] = ()):
+        super().__init__(figure)
+        self._plain_frames = list(plain_frames)
+
+    @property
+    def frames(self) -> Tuple[Dict, ...]:
+        return tuple(self._plain_frames)
+
+    def to_dict(self) -> Dict:
+        res = super().to_dict()
+        if self._plain_frames:
+            res["frames"] = list(self._plain_frames)
+        return res
+
+    def __reduce__(self):
+        return (self.__class__, (super().to_dict(), self._plain_frames))
+
+
+def _animation_controls(fig: go.Figure, names: List[str], frame_ms: int) -> None:
+    play = dict(label="▶", method="animate",
+                args=[None, dict(frame=dict(duration=frame_ms, redraw=True), transition=dict(duration=0), fromcurrent=True, mode="immediate")])
+    pause = dict(label="⏸", method="animate",
+                 args=[[None], dict(frame=dict(duration=0, redraw=False), transition=dict(duration=0), mode="immediate")])
+    fig.update_layout(
+        updatemenus=[dict(type="buttons", direction="left", showactive=False, x=0.0, y=-0.02,
+                          xanchor="left", yanchor="top", pad=dict(t=10, r=10), buttons=[play, pause])],
+        sliders=[dict(active=0, x=0.1, len=0.9, y=-0.02, yanchor="top", pad=dict(t=10),
+                      currentvalue=dict(prefix="Step "),
+                      steps=[dict(label=name, method="animate",
+                                  args=[[name], dict(frame=dict(duration=0, redraw=True), transition=dict(duration=0), mode="immediate")])
+                             for name in names])],
+    )
+    fig.update_layout(margin=dict(l=10, r=10, t=45, b=80))
+
+
+def _frame(name: str, patch: Dict, trace_index: int, title: str) -> Dict:
+    return {"name": name, "data": [patch], "traces": [trace_index], "layout": {"title": {"text": title}}}
+
+
+def make_bar_animation(trace, title: str,
+                       colorize: Optional[Callable[[List[int], Tuple], np.ndarray]] = None,
+                       max_bytes: int = DEFAULT_MAX_PAYLOAD, frame_ms: int = 50) -> FramesFigure:
+    """Pack a SortTrace into one Plotly figure with frames so the browser animates locally.
+
+    Frames only carry the per-step y-values and bar colors; steps are subsampled
+    to stay within max_bytes, and each frame highlights everything touched since
+    the previous one. colorize(values, frame) returns the frame's PALETTE codes
+    (see AlgorithmSpec.colorize).
+    """
+    n = trace.n
+    # ~3 digit values plus 9 char color strings, with JSON separators
+    steps = pick_steps(len(trace), 16 * n + 200, max_bytes)
+    frames = []
+    prev = None
+    for step in steps:
+        if prev is None or step == prev + 1:
+            frame = trace.frame(step)
+        else:
+            _, highlight, swapped, meta = trace.span(prev, step)
+            frame = (trace.values_at(step).tolist(), highlight, swapped, meta)
+        prev = step
+        values, highlight = frame[0], frame[1]
+        codes = colorize(values, frame) if colorize else None
+        patch = {"type": "bar", "y": values, "marker": {"color": bar_colors(n, highlight, codes=codes)}}
+        frames.append(_frame(str(step), patch, 0, f"{title}: Step {step}"))
+    first = trace.frame(steps[0]) if steps else (trace.initial.tolist(), None, False, {})
+    fig = make_bar_figure(first[0], highlight=first[1], title=f"{title}: Step 0",
+                          codes=colorize(first[0], first) if colorize and steps else None)
+    fig = FramesFigure(fig, frames)
+    _animation_controls(fig, [f["name"] for f in frames], frame_ms)
+    return fig
+
+
+def make_graph_animation(positions, edges, trace, title: str,
+                         max_bytes: int = DEFAULT_MAX_PAYLOAD, frame_ms: int = 80) -> FramesFigure:
+    """Pack a GraphTrace into one Plotly figure with frames that only patch node colors
+    (marker colors, or the heatmap cells for large grids)."""
+    gfig = GraphFigure(positions, edges)
+    # Node order in the figure may differ from the trace's node order.
+    index = {nid: i for i, nid in enumerate(trace.node_ids.tolist())}
+    order = np.asarray([index[nid] for nid in gfig.node_ids], dtype=np.int64)
+    # Register every trace color up front so all frames share one palette/colorscale.
+    gfig.trace_codes(np.zeros(0, dtype=np.uint8), trace.palette)
+    per_node = 2 if gfig.lod == "heatmap" else 10
+    steps = pick_steps(len(trace), per_node * len(gfig.node_ids) + 400, max_bytes)
+    frames = []
+    for step in steps:
+        codes = gfig.trace_codes(trace.codes_at(step)[order], trace.palette)
+        meta = trace.meta_at(step)
+        frames.append(_frame(str(step), gfig.node_patch_dict(codes), gfig.node_trace,
+                             f"{title}: Step {step}" + (" — FOUND!" if meta.get("found") else "")))
+    fig = gfig.update(title=f"{title}: Step 0", node_colors=trace.node_colors_at(0) if len(trace) else None)
+    fig = FramesFigure(fig, frames)
+    _animation_controls(fig, [f["name"] for f in frames], frame_ms)
+    return fig
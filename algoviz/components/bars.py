@@ -1,31 +1,85 @@
-from typing import Iterable, Optional, Tuple, Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
 import plotly.graph_objects as go
 
-def make_bar_figure(values: Iterable[int],
-                    highlight: Optional[Tuple[int, ...]] = None,
-                    title: str = "",
-                    colors_override: Optional[Dict[int, str]] = None) -> go.Figure:
-    """Create a Plotly bar chart.
-    - highlight: indices to emphasize (red)
-    - colors_override: dict {index: hex_color} for custom regions (e.g., sorted prefix/suffix, pivot)
+BASE_COLOR = "#94a3b8"  # slate-400
+HIGHLIGHT_COLOR = "#ef4444"    # red-500
+
+# Region palette: AlgorithmSpec.regions name a color, colorizers emit its code
+PALETTE = (BASE_COLOR, "#10b981", "#60a5fa", "#f59e0b", HIGHLIGHT_COLOR)
+REGION_CODES = {"sorted": 1, "active": 2, "pivot": 3}
+_PALETTE = np.array(PALETTE, dtype=object)
+
+
+def region_codes(n: int, meta: Dict, regions: Sequence[Tuple[str, str, str]]) -> np.ndarray:
+    """Palette codes for one frame; each (meta key, shape, color) region is a single slice assignment.
+
+    Shapes: "prefix" and "suffix" take a length, "range" an inclusive (lo, hi)
+    and "index" one position. Later regions paint over earlier ones.
     """
-    x = list(range(len(values)))
-    base_color = "#94a3b8"  # slate-400
-    hi_color = "#ef4444"    # red-500
+    codes = np.zeros(n, dtype=np.uint8)
+    for key, shape, color in regions:
+        value = meta.get(key)
+        if value is None:
+            continue
+        code = REGION_CODES[color]
+        if shape == "prefix":
+            codes[:max(0, int(value))] = code
+        elif shape == "suffix":
+            if int(value) > 0:
+                codes[max(0, n - int(value)):] = code
+        elif shape == "range":
+            lo, hi = value
+            codes[max(0, int(lo)):max(0, int(hi) + 1)] = code
+        elif shape == "index":
+            if 0 <= int(value) < n:
+                codes[int(value)] = code
+        else:
+            raise ValueError(f"Unknown region shape {shape!r}.")
+    return codes
+
 
-    colors = [base_color for _ in x]
+def bar_colors(n: int,
+               highlight: Optional[Tuple[int, ...]] = None,
+               colors_override: Optional[Dict[int, str]] = None,
+               codes: Optional[np.ndarray] = None) -> List[str]:
+    """Per-bar colors: base (or palette codes), then overrides, then highlight (takes precedence)."""
+    if codes is not None:
+        colors = _PALETTE[codes]
+        if highlight:
+            hl = np.asarray(highlight, dtype=np.int64)
+            colors[hl[(hl >= 0) & (hl < n)]] = HIGHLIGHT_COLOR
+            highlight = None
+        colors = colors.tolist()
+    else:
+        colors = [BASE_COLOR] * n
 
     # Apply custom color overrides first
     if colors_override:
         for idx, col in colors_override.items():
-            if 0 <= idx < len(colors):
+            if 0 <= idx < n:
                 colors[idx] = col
 
     # Then apply highlight (takes precedence)
     if highlight is not None:
         for idx in highlight:
-            if 0 <= idx < len(colors):
-                colors[idx] = hi_color
+            if 0 <= idx < n:
+                colors[idx] = HIGHLIGHT_COLOR
+    return colors
+
+def make_bar_figure(values: Iterable[int],
+                    highlight: Optional[Tuple[int, ...]] = None,
+                    title: str = "",
+                    colors_override: Optional[Dict[int, str]] = None,
+                    codes: Optional[np.ndarray] = None) -> go.Figure:
+    """Create a Plotly bar chart.
+    - highlight: indices to emphasize (red)
+    - colors_override: dict {index: hex_color} for custom regions (e.g., sorted prefix/suffix, pivot)
+    - codes: per-bar PALETTE codes from a colorizer, instead of colors_override
+    """
+    values = list(values)
+    x = list(range(len(values)))
+    colors = bar_colors(len(values), highlight, colors_override, codes)
 
     fig = go.Figure(
         data=[
@@ -46,3 +100,39 @@ def make_bar_figure(values: Iterable[int],
         height=420,
     )
     return fig
+
+class BarFigure:
+    """Bar chart built once per dataset; update() patches only what changed.
+
+    The x axis and layout are created in __init__. Each frame then reassigns
+    y-values, marker colors and the title only when they differ from the
+    previous frame.
+    """
+
+    def __init__(self, values: Iterable[int], title: str = ""):
+        self._values = list(values)
+        self._colors = bar_colors(len(self._values))
+        self._title = title
+        self.fig = make_bar_figure(self._values, title=title)
+
+    def update(self, values: Iterable[int],
+               highlight: Optional[Tuple[int, ...]] = None,
+               title: str = "",
+               colors_override: Optional[Dict[int, str]] = None,
+               codes: Optional[np.ndarray] = None) -> go.Figure:
+        values = list(values)
+        if len(values) != len(self._values):
+            raise ValueError("BarFigure is bound to a fixed number of bars; build a new one for new data.")
+        colors = bar_colors(len(values), highlight, colors_override, codes)
+        bar = self.fig.data[0]
+        with self.fig.batch_update():
+            if values != self._values:
+                bar.y = values
+                self._values = values
+            if colors != self._colors:
+                bar.marker.color = colors
+                self._colors = colors
+            if title != self._title:
+                self.fig.layout.title.text = title
+                self._title = title
+        return self.fig
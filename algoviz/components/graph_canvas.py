@@ -1,70 +1,252 @@
 from typing import Dict, List, Tuple, Optional, Set
+import numpy as np
 import plotly.graph_objects as go
 
+from algoviz.algorithms.graphs.csr import CSRGraph
+
 # Types
-# positions: Dict[int, Tuple[float,float]]
+# positions: Dict[int, Tuple[float,float]]  (or a CSRGraph, with edges=None)
 # edges: List[Tuple[int,int]]
 
+BASE_NODE_COLOR = "#94a3b8"  # grey
+WALL_NODE_COLOR = "#1e293b"  # isolated nodes of a CSRGraph, e.g. the blocked cells of an obstacle grid
+LOD_NODE_THRESHOLD = 2500  # above this, drop labels/edges and draw with WebGL or a heatmap
+
+def _csr_geometry(graph: CSRGraph):
+    """Node and edge coordinates for a CSRGraph; edge segments are separated by NaN gaps."""
+    xy = graph.positions
+    e = graph.edge_array()
+    seg = np.full((len(e), 3, 2), np.nan)
+    seg[:, 0] = xy[e[:, 0]]
+    seg[:, 1] = xy[e[:, 1]]
+    seg = seg.reshape(-1, 2)
+    return xy[:, 0], xy[:, 1], list(range(graph.num_nodes)), seg[:, 0], seg[:, 1]
+
 def make_graph_figure(positions: Dict[int, Tuple[float,float]],
-                      edges: List[Tuple[int,int]],
+                      edges: Optional[List[Tuple[int,int]]],
                       title: str = "",
                       node_colors: Optional[Dict[int, str]] = None,
-                      edge_colors: Optional[Dict[Tuple[int,int], str]] = None) -> go.Figure:
+                      edge_colors: Optional[Dict[Tuple[int,int], str]] = None,
+                      lod: Optional[str] = None) -> go.Figure:
     """Create a clean Plotly figure for an undirected graph."""
-    node_x = []
-    node_y = []
-    node_ids = []
-    for nid, (x, y) in positions.items():
-        node_x.append(x)
-        node_y.append(y)
-        node_ids.append(nid)
-
-    base_node_color = "#94a3b8"  # grey
-    colors = [node_colors.get(n, base_node_color) if node_colors else base_node_color for n in node_ids]
-
-    # Edge traces
-    edge_x = []
-    edge_y = []
-    edge_line_colors = []
-    for (u, v) in edges:
-        x0, y0 = positions[u]
-        x1, y1 = positions[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        if edge_colors and (u, v) in edge_colors:
-            edge_line_colors.append(edge_colors[(u, v)])
-        elif edge_colors and (v, u) in edge_colors:
-            edge_line_colors.append(edge_colors[(v, u)])
+    return GraphFigure(positions, edges, lod=lod).update(title=title, node_colors=node_colors, edge_colors=edge_colors)
+
+class GraphFigure:
+    """Graph figure whose static geometry is built once per graph.
+
+    Edge coordinates, node positions, labels and layout are created in
+    __init__; update() only patches node colors and the title, and only
+    when they changed since the previous frame.
+
+    Level of detail (`lod`, picked from the node count when None):
+      "full"    - edges, SVG markers and id labels (small graphs);
+      "webgl"   - Scattergl markers only, no labels or edges;
+      "heatmap" - one Heatmap cell per node for row-major grids from build_grid_graph.
+    Node colors are kept as palette codes so large frames patch a single array.
+    Isolated nodes of a CSRGraph (obstacle cells) show WALL_NODE_COLOR wherever
+    they would otherwise show the base color.
+    """
+
+    def __init__(self, positions: Dict[int, Tuple[float,float]], edges: Optional[List[Tuple[int,int]]] = None,
+                 lod: Optional[str] = None):
+        if isinstance(positions, CSRGraph):
+            xy = positions.positions
+            node_ids = list(range(positions.num_nodes))
         else:
-            edge_line_colors.append("#475569")  # slate-600
-
-    fig = go.Figure()
-
-    # Draw edges as a single scattergl trace for performance
-    fig.add_trace(go.Scatter(x=edge_x, y=edge_y,
-                               mode="lines",
-                               line=dict(width=2),
-                               hoverinfo="none",
-                               showlegend=False))
-
-    # Draw nodes
-    fig.add_trace(go.Scatter(
-        x=node_x, y=node_y,
-        mode="markers+text",
-        text=[str(n) for n in node_ids],
-        textposition="top center",
-        marker=dict(size=16, color=colors, line=dict(width=2, color="#0f1115")),
-        hoverinfo="text",
-        showlegend=False
-    ))
-
-    fig.update_layout(
-        title=title,
-        margin=dict(l=10, r=10, t=45, b=10),
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False),
-        plot_bgcolor="#0f1115",
-        paper_bgcolor="#0f1115",
-    )
-    fig.update_yaxes(scaleanchor="x", scaleratio=1)
-    return fig
+            node_ids = list(positions.keys())
+            xy = np.asarray(list(positions.values()), dtype=np.float64).reshape(-1, 2)
+        self.node_ids = node_ids
+        self._index = {nid: i for i, nid in enumerate(node_ids)}
+        grid = _grid_shape(xy, node_ids)
+        if lod is None:
+            lod = "full" if len(node_ids) <= LOD_NODE_THRESHOLD else ("heatmap" if grid else "webgl")
+        if lod == "heatmap" and grid is None:
+            raise ValueError("heatmap rendering needs a row-major grid layout")
+        self.lod = lod
+        self._grid = grid
+
+        self._palette = [BASE_NODE_COLOR]
+        self._code_of = {BASE_NODE_COLOR: 0}
+        self._walls = None
+        if isinstance(positions, CSRGraph):
+            walls = np.diff(positions.offsets) == 0
+            if walls.any() and positions.num_nodes > 1:
+                self._walls = walls
+                self._code(WALL_NODE_COLOR)
+        self._codes = self._with_walls(np.zeros(len(node_ids), dtype=np.uint8))
+        self._title = ""
+        fig = go.Figure()
+
+        if lod == "full":
+            if isinstance(positions, CSRGraph):
+                _, _, _, edge_x, edge_y = _csr_geometry(positions)
+            else:
+                # Edge traces
+                edge_x = []
+                edge_y = []
+                for (u, v) in edges:
+                    x0, y0 = positions[u]
+                    x1, y1 = positions[v]
+                    edge_x += [x0, x1, None]
+                    edge_y += [y0, y1, None]
+
+            # All edges share one line trace, so per-edge colors are not drawn
+            fig.add_trace(go.Scatter(x=edge_x, y=edge_y,
+                                       mode="lines",
+                                       line=dict(width=2),
+                                       hoverinfo="none",
+                                       showlegend=False))
+
+            # Draw nodes
+            fig.add_trace(go.Scatter(
+                x=xy[:, 0].tolist(), y=xy[:, 1].tolist(),
+                mode="markers+text",
+                text=[str(n) for n in node_ids],
+                textposition="top center",
+                marker=dict(size=16, color=self._colors(self._codes), line=dict(width=2, color="#0f1115")),
+                hoverinfo="text",
+                showlegend=False
+            ))
+            self.node_trace = 1
+        elif lod == "webgl":
+            size = float(np.clip(600.0 / max(1.0, len(node_ids)) ** 0.5, 2.0, 10.0))
+            fig.add_trace(go.Scattergl(
+                x=xy[:, 0], y=xy[:, 1],
+                mode="markers",
+                marker=dict(size=size, color=self._colors(self._codes)),
+                hoverinfo="skip",
+                showlegend=False
+            ))
+            self.node_trace = 0
+        else:
+            rows, cols = grid
+            fig.add_trace(go.Heatmap(
+                z=self._codes.reshape(rows, cols),
+                x=np.arange(cols, dtype=np.float64), y=-np.arange(rows, dtype=np.float64),
+                zmin=-0.5, zmax=len(self._palette) - 0.5, colorscale=_discrete_colorscale(self._palette),
+                showscale=False, hoverinfo="skip",
+            ))
+            self.node_trace = 0
+
+        fig.update_layout(
+            title="",
+            margin=dict(l=10, r=10, t=45, b=10),
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False),
+            plot_bgcolor="#0f1115",
+            paper_bgcolor="#0f1115",
+        )
+        fig.update_yaxes(scaleanchor="x", scaleratio=1)
+        self.fig = fig
+
+    def _code(self, color: Optional[str]) -> int:
+        if color is None:
+            return 0
+        code = self._code_of.get(color)
+        if code is None:
+            code = self._code_of[color] = len(self._palette)
+            self._palette.append(color)
+        return code
+
+    def _with_walls(self, codes: np.ndarray) -> np.ndarray:
+        if self._walls is not None:
+            codes = codes.copy()
+            codes[self._walls & (codes == 0)] = self._code_of[WALL_NODE_COLOR]
+        return codes
+
+    def _colors(self, codes: np.ndarray) -> List[str]:
+        return np.asarray(self._palette, dtype=object)[codes].tolist()
+
+    def node_patch(self, codes: np.ndarray):
+        """Trace object carrying only the node colors for `codes` (figure palette codes)."""
+        patch = self.node_patch_dict(codes)
+        kind = patch.pop("type")
+        return {"heatmap": go.Heatmap, "scattergl": go.Scattergl, "scatter": go.Scatter}[kind](**patch)
+
+    def node_patch_dict(self, codes: np.ndarray) -> Dict:
+        """node_patch() as a plain dict, skipping Plotly's per-object validation (for animation frames)."""
+        codes = self._with_walls(codes)
+        if self.lod == "heatmap":
+            rows, cols = self._grid
+            k = len(self._palette)
+            return {"type": "heatmap", "z": codes.reshape(rows, cols), "zmin": -0.5, "zmax": k - 0.5,
+                    "colorscale": _discrete_colorscale(self._palette)}
+        return {"type": "scattergl" if self.lod == "webgl" else "scatter", "marker": {"color": self._colors(codes)}}
+
+    def trace_codes(self, codes: np.ndarray, palette: List[Optional[str]]) -> np.ndarray:
+        """Translate a GraphTrace's palette codes (0 = base) into this figure's codes."""
+        lut = np.asarray([self._code(c) for c in palette], dtype=np.uint8)
+        return lut[codes]
+
+    def _paint(self, codes: np.ndarray) -> None:
+        codes = self._with_walls(codes)
+        if np.array_equal(codes, self._codes):
+            return
+        patch = self.node_patch(codes)
+        node = self.fig.data[self.node_trace]
+        if self.lod == "heatmap":
+            node.z = patch.z
+            node.zmax = patch.zmax
+            node.colorscale = patch.colorscale
+        else:
+            node.marker.color = patch.marker.color
+        self._codes = codes
+
+    def _set_title(self, title: Optional[str]) -> None:
+        if title is not None and title != self._title:
+            self.fig.layout.title.text = title
+            self._title = title
+
+    def update(self, title: str = "",
+               node_colors: Optional[Dict[int, str]] = None,
+               edge_colors: Optional[Dict[Tuple[int,int], str]] = None) -> go.Figure:
+        """Patch node colors and title; edge_colors is accepted for frame compatibility."""
+        codes = np.zeros(len(self.node_ids), dtype=np.uint8)
+        for nid, color in (node_colors or {}).items():
+            codes[self._index[nid]] = self._code(color)
+        with self.fig.batch_update():
+            self._paint(codes)
+            self._set_title(title)
+        return self.fig
+
+    def set_codes(self, codes: np.ndarray, palette: List[Optional[str]], title: Optional[str] = None) -> go.Figure:
+        """Paint a GraphTrace step directly from its codes (trace.codes_at); node order must match."""
+        with self.fig.batch_update():
+            self._paint(self.trace_codes(codes, palette))
+            self._set_title(title)
+        return self.fig
+
+    def apply_changes(self, changes: Dict[int, Optional[str]], title: Optional[str] = None) -> go.Figure:
+        """Patch only the nodes whose color changed (None = back to base color)."""
+        with self.fig.batch_update():
+            if changes:
+                codes = self._codes.copy()
+                for nid, color in changes.items():
+                    codes[self._index[nid]] = self._code(color)
+                self._paint(codes)
+            self._set_title(title)
+        return self.fig
+
+
+def _grid_shape(xy: np.ndarray, node_ids: List[int]) -> Optional[Tuple[int, int]]:
+    """(rows, cols) if node i sits at (i % cols, -(i // cols)), the build_grid_graph layout."""
+    n = len(node_ids)
+    if n == 0 or not np.array_equal(np.asarray(node_ids), np.arange(n)):
+        return None
+    cols = int(np.count_nonzero(xy[:, 1] == xy[0, 1]))
+    if cols == 0 or n % cols:
+        return None
+    r, c = np.divmod(np.arange(n), cols)
+    if np.array_equal(xy[:, 0], c) and np.array_equal(xy[:, 1], -r):
+        return n // cols, cols
+    return None
+
+
+def _discrete_colorscale(palette: List[str]) -> List[Tuple[float, str]]:
+    """Colorscale that maps integer code i (with zmin=-0.5, zmax=k-0.5) to palette[i]."""
+    k = len(palette)
+    scale = []
+    for i, color in enumerate(palette):
+        scale.append((i / k, color))
+        scale.append(((i + 1) / k, color))
+    return scale
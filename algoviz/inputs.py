@@ -0,0 +1,18 @@
+"""Input arrays shared by the benchmarks and the complexity explorer."""
+from typing import List
+import numpy as np
+
+SHAPES = ("random", "sorted", "reversed", "few_unique")
+
+
+def make_input(n: int, shape: str, seed: int = 0, high: int = 100) -> List[int]:
+    rng = np.random.default_rng(seed)
+    if shape == "random":
+        return rng.integers(low=1, high=high, size=n).tolist()
+    if shape == "sorted":
+        return np.sort(rng.integers(low=1, high=high, size=n)).tolist()
+    if shape == "reversed":
+        return np.sort(rng.integers(low=1, high=high, size=n))[::-1].tolist()
+    if shape == "few_unique":
+        return rng.integers(low=1, high=5, size=n).tolist()
+    raise ValueError(f"Unknown input shape: {shape}")
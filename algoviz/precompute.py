@@ -0,0 +1,118 @@
+"""Precompute trace files at deploy time so the pages replay them from disk.
+
+    python -m algoviz.precompute                          # the default catalog into ./traces
+    python -m algoviz.precompute --algorithm quick_sort --size 100000 --seed 42
+    python -m algoviz.precompute --catalog catalog.json --out /srv/traces
+
+Each catalog entry is a sorting run {"algorithm", "n", "seed"} on the Sorting
+page's random input, or a graph run {"algorithm", "rows", "cols", "topology",
+"seed", "start", "goal"} on a Graphs page topology, plus "density" for
+obstacle grids and "sources" (the extra seeds) for multi-source BFS. Files
+are named after the pages' trace cache keys (see algoviz.trace.store), so a
+page that is asked for the same algorithm, data and endpoints memory-maps
+the file instead of recording the trace. Existing files are skipped unless
+--force is given.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+import time
+
+from algoviz.algorithms.graphs.utils import build_topology
+from algoviz.inputs import make_input
+from algoviz.registry import REGISTRY
+from algoviz.trace.cache import array_digest
+from algoviz.trace.graph import GraphTrace, graph_signature
+from algoviz.trace.store import DEFAULT_DIR, TraceStore
+
+# The pages' default settings: array sizes around the slider default, seed 42, and the 6 x 8 grid
+DEFAULT_SIZES = (40, 150, 500)
+DEFAULT_SEEDS = (42,)
+
+
+def default_catalog() -> List[Dict]:
+    entries = [{"algorithm": spec.name, "n": n, "seed": seed}
+               for spec in REGISTRY.algorithms("sorting") for n in DEFAULT_SIZES for seed in DEFAULT_SEEDS]
+    entries += [{"algorithm": spec.name, "rows": 6, "cols": 8, "topology": "Grid", "seed": 0, "start": 0, "goal": 47}
+                for spec in REGISTRY.algorithms("graphs")]
+    return entries
+
+
+def sort_input(n: int, seed: int) -> List[int]:
+    """The Sorting page's "Start / Regenerate Data" array for this size and seed."""
+    return make_input(n, "random", seed)
+
+
+def precompute_entry(entry: Dict, store: TraceStore, force: bool = False) -> Tuple[str, bool]:
+    """Record and save one catalog entry; returns (path, written)."""
+    if "n" in entry:
+        spec = REGISTRY.algorithm("sorting", entry["algorithm"])
+        data = sort_input(int(entry["n"]), int(entry.get("seed", 0)))
+        key = ("sort", spec.label, array_digest(data))
+        if key in store and not force:
+            return store.path_for(key), False
+        trace = spec.record(data)
+        info = {"algorithm": spec.label, "n": len(data), "seed": int(entry.get("seed", 0))}
+        return store.save(key, trace, info), True
+    spec = REGISTRY.algorithm("graphs", entry["algorithm"])
+    rows, cols = int(entry["rows"]), int(entry["cols"])
+    graph = build_topology(entry.get("topology", "Grid"), rows, cols, seed=int(entry.get("seed", 0)),
+                           density=float(entry.get("density", 0.25)))
+    start = int(entry.get("start", 0))
+    goal = entry.get("goal")
+    goal = rows * cols - 1 if goal is None else int(goal)
+    key = ("graph", spec.label, graph_signature(graph), start, goal)
+    kwargs, info = {}, {}
+    if "seeds" in spec.meta:  # the Graphs page's seeded runs: start, goal and the extra seeds
+        extra = tuple(dict.fromkeys(int(v) for v in entry.get("sources", ())))
+        key += extra
+        kwargs["sources"] = (start, goal) + extra
+        info["sources"] = list(extra)
+    if key in store and not force:
+        return store.path_for(key), False
+    trace = GraphTrace.record_deltas(range(graph.num_nodes), spec.make_deltas(graph, start=start, goal=goal, **kwargs))
+    info.update({"algorithm": spec.label, "start": start, "goal": goal, "topology": entry.get("topology", "Grid"),
+                 "rows": rows, "cols": cols, "seed": int(entry.get("seed", 0))})
+    return store.save(key, trace, info, graph), True
+
+
+def precompute(entries: Iterable[Dict], store: TraceStore, force: bool = False) -> List[str]:
+    written = []
+    for entry in entries:
+        t0 = time.perf_counter()
+        path, wrote = precompute_entry(entry, store, force)
+        if wrote:
+            written.append(path)
+        status = f"{time.perf_counter() - t0:6.2f}s  {os.path.getsize(path) / 1e6:8.2f} MB" if wrote else "exists"
+        print(f"{status:>24}  {os.path.basename(path)}", file=sys.stderr)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m algoviz.precompute", description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=DEFAULT_DIR, help="trace directory (the pages read ALGOVIZ_TRACE_DIR)")
+    parser.add_argument("--catalog", help="JSON list of catalog entries (default: the built-in catalog)")
+    parser.add_argument("--algorithm", action="append", dest="algorithms", help="sorting algorithm name (repeatable)")
+    parser.add_argument("--size", action="append", type=int, dest="sizes", help="array size (repeatable)")
+    parser.add_argument("--seed", action="append", type=int, dest="seeds", help="input seed (repeatable)")
+    parser.add_argument("--force", action="store_true", help="rewrite files that already exist")
+    args = parser.parse_args(argv)
+
+    if args.catalog:
+        with open(args.catalog) as f:
+            entries = json.load(f)
+    elif args.algorithms or args.sizes or args.seeds:
+        names = args.algorithms or [spec.name for spec in REGISTRY.algorithms("sorting")]
+        entries = [{"algorithm": name, "n": n, "seed": seed}
+                   for name in names for n in (args.sizes or DEFAULT_SIZES) for seed in (args.seeds or DEFAULT_SEEDS)]
+    else:
+        entries = default_catalog()
+    written = precompute(entries, TraceStore(args.out), force=args.force)
+    print(f"Wrote {len(written)} of {len(entries)} traces to {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
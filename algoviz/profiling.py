@@ -0,0 +1,112 @@
+"""Opt-in stage timers for the pages' render loop.
+
+A StageProfiler lives in each session's state and times the stages of a
+frame: "trace" (cache lookup or recording), "next" (the step's frame from
+the trace, or from the live producer), "colors", "figure", "plotly_chart"
+(Plotly serialization and sending the chart) and "sleep" (playback
+pacing). It keeps the last `window` samples of each stage for rolling
+p50/p95. While disabled, stage() returns a shared no-op context, so the
+cost is one attribute check.
+
+ALGOVIZ_PROFILE=1 enables the timers by default. ALGOVIZ_PROFILE_LOG=<path>
+appends one JSON line per rendered run of every session to that file, for
+offline analysis under load.
+"""
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Deque, Dict, Iterator, List, Optional
+import json
+import os
+import threading
+import time
+
+STAGES = ("trace", "next", "colors", "figure", "plotly_chart", "sleep")
+DEFAULT_ENABLED = os.environ.get("ALGOVIZ_PROFILE", "") not in ("", "0")
+LOG_PATH = os.environ.get("ALGOVIZ_PROFILE_LOG") or None
+
+_NULL = nullcontext()
+_log_lock = threading.Lock()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class StageProfiler:
+    """Rolling per-stage latencies of one session's page runs."""
+
+    def __init__(self, page: str, session: Optional[str] = None, window: int = 256,
+                 enabled: bool = DEFAULT_ENABLED, log_path: Optional[str] = LOG_PATH):
+        self.page = page
+        self.session = session
+        self.window = window
+        self.enabled = enabled
+        self.log_path = log_path
+        self.samples: Dict[str, Deque[float]] = {}
+        self.runs = 0
+        self._run: Dict[str, float] = {}  # stage seconds of the current run
+        self._notes: Dict[str, Any] = {}
+
+    def stage(self, name: str) -> ContextManager:
+        """Time the with-block as `name`; repeated stages within one run add up."""
+        return self._timed(name) if self.enabled else _NULL
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._run[name] = self._run.get(name, 0.0) + time.perf_counter() - t0
+
+    def note(self, **info: Any) -> None:
+        """Attach context (step, algorithm, n, ...) to the current run's log line."""
+        if self.enabled:
+            self._notes.update(info)
+
+    def tick(self) -> None:
+        """Close the current run: fold its stage times into the windows and log them."""
+        if not self._run:
+            self._notes = {}
+            return
+        for name, seconds in self._run.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(seconds)
+        self.runs += 1
+        if self.log_path:
+            line = {"t": time.time(), "page": self.page, "session": self.session, **self._notes,
+                    "stages_ms": {name: round(s * 1000.0, 3) for name, s in self._run.items()}}
+            with _log_lock, open(self.log_path, "a") as fp:
+                fp.write(json.dumps(line, default=str) + "\n")
+        self._run = {}
+        self._notes = {}
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.runs = 0
+        self._run = {}
+        self._notes = {}
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per stage, in STAGES order: samples, last, p50, p95 and max in ms."""
+        rows = []
+        for name in sorted(self.samples, key=lambda s: (STAGES.index(s) if s in STAGES else len(STAGES), s)):
+            values = list(self.samples[name])
+            ordered = sorted(values)
+            rows.append({"stage": name, "n": len(values), "last_ms": round(values[-1] * 1000.0, 2),
+                         "p50_ms": round(percentile(ordered, 50) * 1000.0, 2),
+                         "p95_ms": round(percentile(ordered, 95) * 1000.0, 2),
+                         "max_ms": round(ordered[-1] * 1000.0, 2)})
+        return rows
+
+    def to_json(self) -> str:
+        """Summary plus the raw windows (ms), for a download button."""
+        return json.dumps({"page": self.page, "session": self.session, "runs": self.runs, "window": self.window,
+                           "summary": self.summary(),
+                           "samples_ms": {name: [round(s * 1000.0, 3) for s in values]
+                                          for name, values in self.samples.items()}}, indent=1)
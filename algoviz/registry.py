@@ -0,0 +1,279 @@
+"""Lazy plugin registry.
+
+Algorithm generators, batch tracers and Plotly renderers are registered by
+"module:attr" path and imported on first use. Pages bind these references at
+the top instead of importing numpy, plotly and every algorithm module, so a
+page paints its header and sidebar before the heavy imports run, and only
+the algorithm actually played gets imported.
+
+Algorithms are registered as AlgorithmSpecs: besides the generator, a spec
+declares the meta keys its frames carry, how those keys color the bars and
+which HUD metrics to show, so the pages dispatch through the spec and a new
+algorithm only needs a register_algorithm() call.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import importlib
+import os
+import threading
+
+
+def load(path: str) -> Any:
+    """Import "package.module:attr" (or just "package.module") and return the object."""
+    module_name, _, attr = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+class LazyRef:
+    """Stand-in for a module or object that is imported on first call or attribute access."""
+
+    __slots__ = ("path", "_target")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._target: Any = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            self._target = load(self.path)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"LazyRef({self.path!r}{', loaded' if self.loaded else ''})"
+
+
+def lazy(path: str) -> LazyRef:
+    return LazyRef(path)
+
+
+Region = Tuple[str, str, str]  # (meta key, "prefix" | "suffix" | "range" | "index", palette color name)
+HudMetric = Tuple[str, Tuple[str, ...]]  # (label, meta keys shown joined by " / ")
+
+DEFAULT_COLORIZER = "algoviz.components.bars:region_codes"
+
+
+class AlgorithmSpec:
+    """One algorithm as the pages see it: how to run it and how to read its frames.
+
+    `deltas` is the frame generator and `trace` an optional batch tracer that
+    records the same frames with NumPy. `options` are extra generator keyword
+    arguments (e.g. the A* heuristic). `meta` lists the keys its frames' meta
+    carries, `regions` maps those keys to colored bar regions, `hud` picks the
+    metrics to show, and `baseline` names an algorithm to compare finished runs
+    against. The colorizer turns one frame's meta into a NumPy array of palette
+    codes (see algoviz.components.bars.region_codes).
+    """
+
+    __slots__ = ("kind", "name", "label", "deltas", "trace", "options", "meta", "regions", "hud", "baseline",
+                 "colorizer")
+
+    def __init__(self, kind: str, name: str, label: str, deltas: str, trace: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None, meta: Sequence[str] = (),
+                 regions: Sequence[Region] = (), hud: Sequence[HudMetric] = (), baseline: Optional[str] = None,
+                 colorizer: str = DEFAULT_COLORIZER):
+        self.kind = kind
+        self.name = name
+        self.label = label
+        self.deltas = LazyRef(deltas)
+        self.trace = LazyRef(trace) if trace else None
+        self.options = dict(options or {})
+        self.meta = tuple(meta)
+        self.regions = tuple(regions)
+        self.hud = tuple(hud)
+        self.baseline = baseline
+        self.colorizer = LazyRef(colorizer)
+
+    def make_deltas(self, *args, **kwargs):
+        """Start the delta-frame generator, with the spec's options filled in."""
+        return self.deltas(*args, **self.options, **kwargs)
+
+    def record(self, data):
+        """Sorting trace for data: the batch tracer when there is one, else the recorded generator."""
+        if self.trace is not None:
+            return self.trace(data)
+        return load("algoviz.trace.sorting:SortTrace").record(data, self.make_deltas(list(data)))
+
+    def colorize(self, n: int, meta: Dict):
+        """Palette codes (np.uint8, one per bar) for a frame's meta."""
+        return self.colorizer(n, meta, self.regions)
+
+    def hud_values(self, meta: Dict) -> List[Tuple[str, str]]:
+        return [(label, " / ".join(str(meta.get(key, "—")) for key in keys)) for label, keys in self.hud]
+
+    def __repr__(self) -> str:
+        return f"AlgorithmSpec({self.kind!r}, {self.name!r})"
+
+
+class Registry:
+    """Named groups of lazy references, e.g. registry.ref("sorting", "bubble_sort"), plus algorithm specs."""
+
+    def __init__(self):
+        self._groups: Dict[str, Dict[str, LazyRef]] = {}
+        self._algorithms: Dict[str, Dict[str, AlgorithmSpec]] = {}
+        self._warm_lock = threading.Lock()
+        self._warm_thread: Optional[threading.Thread] = None
+
+    def register(self, group: str, name: str, path: str) -> LazyRef:
+        ref = LazyRef(path)
+        self._groups.setdefault(group, {})[name] = ref
+        return ref
+
+    def register_algorithm(self, spec: AlgorithmSpec) -> AlgorithmSpec:
+        """Add an algorithm; its generator is also reachable as ref(spec.kind, spec.name)."""
+        self._algorithms.setdefault(spec.kind, {})[spec.name] = spec
+        self._groups.setdefault(spec.kind, {})[spec.name] = spec.deltas
+        if spec.trace is not None:
+            self._groups.setdefault(f"{spec.kind}_trace", {})[spec.name] = spec.trace
+        return spec
+
+    def algorithm(self, kind: str, name: str) -> AlgorithmSpec:
+        """Spec by name or label, e.g. algorithm("sorting", "Quick Sort")."""
+        specs = self._algorithms.get(kind, {})
+        spec = specs.get(name)
+        if spec is None:
+            spec = next((s for s in specs.values() if s.label == name), None)
+        if spec is None:
+            raise KeyError(f"No {kind} algorithm named {name!r}")
+        return spec
+
+    def algorithms(self, kind: str) -> List[AlgorithmSpec]:
+        return list(self._algorithms.get(kind, {}).values())
+
+    def labels(self, kind: str) -> List[str]:
+        return [spec.label for spec in self.algorithms(kind)]
+
+    def ref(self, group: str, name: str) -> LazyRef:
+        try:
+            return self._groups[group][name]
+        except KeyError:
+            raise KeyError(f"No {group} plugin named {name!r}") from None
+
+    def get(self, group: str, name: str) -> Any:
+        return self.ref(group, name).resolve()
+
+    def names(self, group: str) -> List[str]:
+        return list(self._groups.get(group, {}))
+
+    def refs(self, groups: Optional[Iterable[str]] = None) -> List[LazyRef]:
+        groups = self._groups if groups is None else groups
+        return [ref for group in groups for ref in self._groups.get(group, {}).values()]
+
+    def loaded(self) -> List[str]:
+        return [ref.path for ref in self.refs() if ref.loaded]
+
+    def warm_up(self, groups: Optional[Iterable[str]] = None) -> Optional[threading.Thread]:
+        """Resolve references on a daemon thread, once per process.
+
+        Called after the landing page has painted, so the first page a user
+        opens finds numpy, plotly and the algorithms already imported. Set
+        ALGOVIZ_WARM_UP=0 to keep every import on first use.
+        """
+        if os.environ.get("ALGOVIZ_WARM_UP", "1") == "0":
+            return None
+        with self._warm_lock:
+            if self._warm_thread is None:
+                refs = self.refs(groups)
+                self._warm_thread = threading.Thread(target=_resolve_all, args=(refs,), name="algoviz-warm-up", daemon=True)
+                self._warm_thread.start()
+            return self._warm_thread
+
+
+def _resolve_all(refs: List[LazyRef]) -> None:
+    for ref in refs:
+        try:
+            ref.resolve()
+        except Exception:
+            pass  # the page that needs it will raise the import error itself
+
+
+REGISTRY = Registry()
+
+_SORTING = {
+    "bubble_sort": ("Bubble Sort", ("sorted_tail_len",), [("sorted_tail_len", "suffix", "sorted")]),
+    "insertion_sort": ("Insertion Sort", ("sorted_prefix_len",), [("sorted_prefix_len", "prefix", "sorted")]),
+    "merge_sort": ("Merge Sort", ("active_range",), [("active_range", "range", "active")]),
+    "quick_sort": ("Quick Sort", ("active_range", "pivot"),
+                   [("active_range", "range", "active"), ("pivot", "index", "pivot")]),
+}
+for _name, (_label, _meta, _regions) in _SORTING.items():
+    REGISTRY.register_algorithm(AlgorithmSpec(
+        "sorting", _name, _label, f"algoviz.algorithms.sorting.{_name.split('_')[0]}:{_name}_deltas",
+        trace=f"algoviz.algorithms.sorting.batch:{_name}_trace", meta=_meta + ("ops",), regions=_regions))
+
+# No batch tracer: traces are recorded from the generators
+_ACTIVE = ("active_range", "range", "active")
+for _spec in (
+    AlgorithmSpec("sorting", "heap_sort", "Heap Sort", "algoviz.algorithms.sorting.heap:heap_sort_deltas",
+                  meta=("active_range", "sorted_tail_len", "ops"),
+                  regions=[_ACTIVE, ("sorted_tail_len", "suffix", "sorted")]),
+    AlgorithmSpec("sorting", "shell_sort", "Shell Sort (Ciura gaps)", "algoviz.algorithms.sorting.shell:shell_sort_deltas",
+                  options={"gaps": "ciura"}, meta=("gap", "active_range", "ops"), regions=[_ACTIVE],
+                  hud=[("Gap", ("gap",))]),
+    AlgorithmSpec("sorting", "shell_sort_knuth", "Shell Sort (Knuth gaps)",
+                  "algoviz.algorithms.sorting.shell:shell_sort_deltas", options={"gaps": "knuth"},
+                  meta=("gap", "active_range", "ops"), regions=[_ACTIVE], hud=[("Gap", ("gap",))]),
+    AlgorithmSpec("sorting", "shell_sort_shell", "Shell Sort (n/2^k gaps)",
+                  "algoviz.algorithms.sorting.shell:shell_sort_deltas", options={"gaps": "shell"},
+                  meta=("gap", "active_range", "ops"), regions=[_ACTIVE], hud=[("Gap", ("gap",))]),
+    AlgorithmSpec("sorting", "radix_sort", "Radix Sort (LSD)", "algoviz.algorithms.sorting.radix:radix_sort_deltas",
+                  meta=("digit", "bucket", "active_range", "ops"), regions=[_ACTIVE],
+                  hud=[("Digit / Bucket", ("digit", "bucket"))]),
+    AlgorithmSpec("sorting", "counting_sort", "Counting Sort", "algoviz.algorithms.sorting.counting:counting_sort_deltas",
+                  meta=("bucket", "active_range", "sorted_prefix_len", "ops"),
+                  regions=[("sorted_prefix_len", "prefix", "sorted"), _ACTIVE], hud=[("Bucket", ("bucket",))]),
+    AlgorithmSpec("sorting", "intro_sort", "Introsort", "algoviz.algorithms.sorting.intro:intro_sort_deltas",
+                  meta=("phase", "active_range", "pivot", "ops"), regions=[_ACTIVE, ("pivot", "index", "pivot")],
+                  hud=[("Phase", ("phase",))]),
+):
+    REGISTRY.register_algorithm(_spec)
+
+_SEARCH_META = ("visited", "queue", "heap_ops", "found", "pop", "pop_dist", "relax", "relax_dist", "path")
+_SEARCH_HUD = [("Visited / Queue", ("visited", "queue")), ("Expanded / Heap ops", ("visited", "heap_ops"))]
+for _spec in (
+    AlgorithmSpec("graphs", "bfs", "BFS", "algoviz.algorithms.graphs.bfs:bfs_deltas",
+                  meta=("visited", "frontier", "found", "path"), hud=[("Visited / Frontier", ("visited", "frontier"))]),
+    AlgorithmSpec("graphs", "dfs", "DFS", "algoviz.algorithms.graphs.dfs:dfs_deltas",
+                  meta=("visited", "stack", "found", "path"), hud=[("Visited / Stack", ("visited", "stack"))]),
+    AlgorithmSpec("graphs", "dijkstra", "Dijkstra", "algoviz.algorithms.graphs.dijkstra:dijkstra_deltas",
+                  meta=_SEARCH_META, hud=_SEARCH_HUD),
+    AlgorithmSpec("graphs", "astar", "A* (Manhattan)", "algoviz.algorithms.graphs.astar:astar_deltas",
+                  options={"heuristic": "manhattan"}, meta=_SEARCH_META,
+                  hud=_SEARCH_HUD, baseline="dijkstra"),
+    AlgorithmSpec("graphs", "astar_euclidean", "A* (Euclidean)", "algoviz.algorithms.graphs.astar:astar_deltas",
+                  options={"heuristic": "euclidean"}, meta=_SEARCH_META,
+                  hud=_SEARCH_HUD, baseline="dijkstra"),
+    AlgorithmSpec("graphs", "bidirectional_bfs", "Bidirectional BFS",
+                  "algoviz.algorithms.graphs.bidirectional:bidirectional_bfs_deltas",
+                  meta=("visited", "frontier", "forward", "backward", "found", "path"),
+                  hud=[("Visited / Frontier", ("visited", "frontier")), ("Forward / Backward", ("forward", "backward"))],
+                  baseline="bfs"),
+    AlgorithmSpec("graphs", "bidirectional_dijkstra", "Bidirectional Dijkstra",
+                  "algoviz.algorithms.graphs.bidirectional:bidirectional_dijkstra_deltas",
+                  meta=("visited", "queue", "heap_ops", "forward", "backward", "found", "path"),
+                  hud=[("Visited / Queue", ("visited", "queue")),
+                       ("Forward / Backward / Heap ops", ("forward", "backward", "heap_ops"))],
+                  baseline="dijkstra"),
+    # "seeds" in meta: the page passes start, goal and its extra seeds as `sources`
+    AlgorithmSpec("graphs", "multi_source_bfs", "Multi-source BFS",
+                  "algoviz.algorithms.graphs.bidirectional:multi_source_bfs_deltas",
+                  meta=("visited", "frontier", "level", "seeds", "found", "relax", "relax_dist"),
+                  hud=[("Visited / Frontier", ("visited", "frontier")), ("Level / Seeds", ("level", "seeds"))]),
+):
+    REGISTRY.register_algorithm(_spec)
+
+REGISTRY.register("renderers", "make_bar_figure", "algoviz.components.bars:make_bar_figure")
+REGISTRY.register("renderers", "BarFigure", "algoviz.components.bars:BarFigure")
+REGISTRY.register("renderers", "make_bar_animation", "algoviz.components.animation:make_bar_animation")
+REGISTRY.register("renderers", "make_graph_figure", "algoviz.components.graph_canvas:make_graph_figure")
+REGISTRY.register("renderers", "GraphFigure", "algoviz.components.graph_canvas:GraphFigure")
+REGISTRY.register("renderers", "make_graph_animation", "algoviz.components.animation:make_graph_animation")
@@ -0,0 +1,314 @@
+"""Per-session memory accounting and eviction for the Streamlit pages.
+
+Each page run calls track_page() with the session-state keys that hold its
+heavy, rebuildable values: datasets, figures, graphs and live producers. The
+small keys stay in place: algorithm, input seed or digest, graph parameters
+and step. Every few seconds the process-wide SessionManager sizes every
+tracked session and compacts some of them, dropping their heavy keys:
+
+- sessions idle for longer than ALGOVIZ_SESSION_IDLE_S (default 900 s),
+- sessions whose browser has disconnected,
+- the least recently used sessions, while the total is above
+  ALGOVIZ_SESSION_MB (default 512).
+
+A session whose script is running is never touched. When a compacted page
+runs again, track_page() returns True, and the page rebuilds what it dropped
+from its small keys. Traces come from the shared trace cache or trace store,
+and inputs are regenerated from their seed.
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+import types
+import weakref
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("ALGOVIZ_SESSION_MB", "512")) * 1024 * 1024)
+DEFAULT_IDLE_S = float(os.environ.get("ALGOVIZ_SESSION_IDLE_S", "900"))
+SWEEP_EVERY_S = 5.0
+
+_SAMPLE = 32  # elements sized per container; the rest are extrapolated
+_MAX_DEPTH = 8
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+           types.GeneratorType, weakref.ref)
+
+
+def approx_nbytes(obj: Any, _seen: Optional[Set[int]] = None, _depth: int = 0) -> int:
+    """Rough deep size of a session-state value.
+
+    Arrays, traces and graphs report their own `nbytes`. Plotly figures
+    count their trace and layout data. Large containers are sized from a
+    sample of their elements, and other objects through their attributes.
+    Threads, locks, functions and generators count as their shell only.
+    Objects reached twice are counted once.
+    """
+    seen = set() if _seen is None else _seen
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int) and not isinstance(obj, type):
+        return nbytes
+    size = sys.getsizeof(obj, 64)
+    if (_depth >= _MAX_DEPTH or isinstance(obj, (str, bytes, bytearray, int, float, complex, bool))
+            or isinstance(obj, _OPAQUE) or type(obj).__module__ in ("threading", "_thread")):
+        return size
+    if isinstance(obj, (dict, set, frozenset)):
+        sample = list(itertools.islice(obj.items() if isinstance(obj, dict) else obj, _SAMPLE))
+    elif isinstance(obj, (list, tuple, collections.deque)):
+        step = max(1, len(obj) // _SAMPLE)
+        sample = [obj[i] for i in range(0, min(len(obj), step * _SAMPLE), step)]
+    elif hasattr(obj, "to_plotly_json") and hasattr(obj, "_data"):
+        return size + approx_nbytes(obj._data, seen, _depth + 1) + approx_nbytes(getattr(obj, "_layout", None), seen,
+                                                                                  _depth + 1)
+    else:
+        attrs = dict(getattr(obj, "__dict__", {}))
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                attrs[slot] = getattr(obj, slot)
+        return size + sum(approx_nbytes(v, seen, _depth + 1) for v in attrs.values())
+    if not sample:
+        return size
+    sampled = sum(approx_nbytes(item, seen, _depth + 1) for item in sample)
+    return size + sampled * len(obj) // len(sample)
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), else the peak RSS where available."""
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SessionUsage(NamedTuple):
+    session_id: str
+    pages: List[str]
+    last_page: str
+    idle_s: float
+    nbytes: int
+    by_key: Dict[str, int]
+    busy: bool
+    compactions: int
+
+
+class _Session:
+    __slots__ = ("state", "thread", "heavy", "last_page", "last_seen", "nbytes", "by_key", "compacted",
+                 "compactions")
+
+    def __init__(self, state: Any):
+        self.state = state
+        self.thread: Optional["weakref.ref[threading.Thread]"] = None
+        self.heavy: Dict[str, Sequence[str]] = {}  # page -> keys it drops on compaction
+        self.last_page = ""
+        self.last_seen = time.monotonic()
+        self.nbytes = 0
+        self.by_key: Dict[str, int] = {}
+        self.compacted: Set[str] = set()  # pages whose keys were dropped since their last run
+        self.compactions = 0
+
+    @property
+    def busy(self) -> bool:
+        thread = self.thread() if self.thread is not None else None
+        return thread is not None and thread.is_alive()
+
+
+class SessionManager:
+    """Tracks the session state of every Streamlit session in the process and compacts idle ones.
+
+    `state` is the session's state mapping (it must support `in`, item
+    access and `del`). It is only read or changed while the session's script
+    thread is not running.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, idle_s: float = DEFAULT_IDLE_S,
+                 sweep_every_s: float = SWEEP_EVERY_S):
+        self.max_bytes = int(max_bytes)
+        self.idle_s = float(idle_s)
+        self.sweep_every_s = float(sweep_every_s)
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.RLock()
+        self._last_sweep = 0.0
+        self.bytes = 0
+        self.idle_compactions = 0
+        self.ceiling_compactions = 0
+        self.closed_sessions = 0
+
+    def track(self, session_id: str, state: Any, page: str, heavy: Iterable[str]) -> bool:
+        """Record a run of `page`; True when its heavy keys were dropped since its last run in this session."""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.state is not state:
+                session = self._sessions[session_id] = _Session(state)
+            session.thread = weakref.ref(threading.current_thread())
+            session.heavy[page] = tuple(heavy)
+            session.last_page = page
+            session.last_seen = now
+            resumed = page in session.compacted
+            session.compacted.discard(page)
+            if now - self._last_sweep >= self.sweep_every_s:
+                self.sweep()
+        return resumed
+
+    def sweep(self, active: Optional[Set[str]] = None) -> None:
+        """Size every session, then compact closed, idle and (over the ceiling) least recently used ones.
+
+        `active` is the set of connected session ids, when the runtime knows them.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            if active is None:
+                active = _active_sessions(self._sessions)
+            for session_id, session in list(self._sessions.items()):
+                if active is not None and session_id not in active and not session.busy:
+                    self._compact(session)
+                    del self._sessions[session_id]
+                    self.closed_sessions += 1
+                    continue
+                self._measure(session)
+                if not session.busy and now - session.last_seen > self.idle_s and self._heavy_bytes(session):
+                    self._compact(session)
+                    self.idle_compactions += 1
+            self.bytes = sum(s.nbytes for s in self._sessions.values())
+            for session in sorted(self._sessions.values(), key=lambda s: s.last_seen):
+                if self.bytes <= self.max_bytes:
+                    break
+                if session.busy or not self._heavy_bytes(session):
+                    continue
+                self.bytes -= self._compact(session)
+                self.ceiling_compactions += 1
+
+    def compact_idle(self, idle_s: float = 0.0) -> int:
+        """Compact every session that is not running and has been idle for at least idle_s; returns how many."""
+        now = time.monotonic()
+        count = 0
+        with self._lock:
+            for session in self._sessions.values():
+                self._measure(session)
+                if not session.busy and now - session.last_seen >= idle_s and self._heavy_bytes(session):
+                    self.bytes -= self._compact(session)
+                    count += 1
+        return count
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self.sweep()
+
+    def usage(self) -> List[SessionUsage]:
+        """Per-session sizes from the last sweep, most recently seen first."""
+        now = time.monotonic()
+        with self._lock:
+            return [SessionUsage(sid, list(s.heavy), s.last_page, now - s.last_seen, s.nbytes, dict(s.by_key), s.busy,
+                                 s.compactions)
+                    for sid, s in sorted(self._sessions.items(), key=lambda item: -item[1].last_seen)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "idle_s": self.idle_s,
+                "idle_compactions": self.idle_compactions,
+                "ceiling_compactions": self.ceiling_compactions,
+                "closed_sessions": self.closed_sessions,
+            }
+
+    def _measure(self, session: _Session) -> None:
+        seen: Set[int] = set()
+        by_key = {}
+        try:
+            values = getattr(session.state, "filtered_state", None)
+            if values is None:
+                values = {key: session.state[key] for key in list(session.state)}
+            for key, value in values.items():
+                by_key[str(key)] = approx_nbytes(value, seen)
+        except (KeyError, RuntimeError):  # the session started a run while being sized; keep the last numbers
+            return
+        session.by_key = by_key
+        session.nbytes = sum(by_key.values())
+
+    def _heavy_keys(self, session: _Session) -> Set[str]:
+        return {key for keys in session.heavy.values() for key in keys}
+
+    def _heavy_bytes(self, session: _Session) -> int:
+        return sum(session.by_key.get(key, 0) for key in self._heavy_keys(session))
+
+    def _compact(self, session: _Session) -> int:
+        """Drop the session's heavy keys, stopping any live producer among them; returns the bytes released."""
+        released = 0
+        for key in self._heavy_keys(session):
+            if key not in session.state:
+                continue
+            value = session.state[key]
+            for part in (value, *(value.values() if isinstance(value, dict) else ())):
+                cancel = getattr(part, "cancel", None)
+                if callable(cancel):
+                    cancel()
+            del session.state[key]
+            released += session.by_key.pop(key, 0)
+        session.nbytes -= released
+        session.compacted.update(session.heavy)
+        session.compactions += 1
+        return released
+
+
+def _active_sessions(sessions: Dict[str, _Session]) -> Optional[Set[str]]:
+    """Ids of the tracked sessions that still have a browser connected, or None outside a Streamlit server."""
+    try:
+        from streamlit.runtime import Runtime
+    except ImportError:
+        return None
+    if not Runtime.exists():
+        return None
+    runtime = Runtime.instance()
+    return {session_id for session_id in sessions if runtime.is_active_session(session_id)}
+
+
+_manager: Optional[SessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Process-wide manager shared by every Streamlit session."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = SessionManager()
+    return _manager
+
+
+def current_session_id() -> Optional[str]:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def track_page(page: str, heavy: Iterable[str]) -> bool:
+    """Register this run of a page with the session manager; True when its heavy keys must be rebuilt.
+
+    Call it before the page's _init_state(). Outside a Streamlit script run it does nothing.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return False
+    # The session's long-lived SessionState, not the per-run thread-safe wrapper around it
+    state = getattr(ctx.session_state, "_state", ctx.session_state)
+    return get_session_manager().track(ctx.session_id, state, page, heavy)
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("ALGOVIZ_TRACE_CACHE_MB", "256")) * 1024 * 1024)
+
+
+def array_digest(data) -> str:
+    """Stable content hash of an integer array, used in cache keys."""
+    arr = np.ascontiguousarray(np.asarray(data, dtype=np.int64))
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(arr.shape).encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+class TraceCache:
+    """Thread-safe LRU cache of recorded traces bounded by a byte budget.
+
+    Values must expose `nbytes`. Concurrent requests for the same missing key
+    wait for the first one to finish instead of recording the trace twice.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = int(getattr(value, "nbytes", 0))
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            if size > self.max_bytes:
+                return  # too large to keep; caller still gets the value
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.bytes += size
+            self._evict_locked()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        event = None
+        while True:
+            with self._lock:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self.misses += 1
+                    event = self._inflight[key] = threading.Event()
+                    break
+            waiter.wait()
+            with self._lock:
+                if key not in self._entries:
+                    # Producer failed or the value was too large to cache: compute it ourselves.
+                    self.misses += 1
+                    break
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            if event is not None:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def _evict_locked(self) -> None:
+        while self.bytes > self.max_bytes and self._entries:
+            key, _ = self._entries.popitem(last=False)
+            self.bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[TraceCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_trace_cache() -> TraceCache:
+    """Process-wide cache shared by every Streamlit session."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TraceCache()
+    return _cache
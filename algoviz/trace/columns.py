@@ -0,0 +1,128 @@
+from typing import Any, Dict, List, Optional
+import mmap
+
+import numpy as np
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, tuple) and value and all(isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool) for v in value):
+        return "tuple_float" if any(isinstance(v, (float, np.floating)) for v in value) else "tuple_int"
+    return "object"
+
+
+_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64, "tuple_int": np.int64, "tuple_float": np.float64,
+           "category": np.int32}
+
+
+def resident_nbytes(*arrays: np.ndarray) -> int:
+    """Bytes the arrays hold in process memory; views of a memory-mapped file count as 0."""
+    total = 0
+    for a in arrays:
+        base = a
+        while base is not None and not isinstance(base, (np.memmap, mmap.mmap)):
+            base = getattr(base, "base", None)
+        if base is None:
+            total += a.nbytes
+    return total
+
+
+class MetaColumns:
+    """Sparse columnar store for per-frame meta dicts.
+
+    Each key keeps the sorted steps it appears in plus a value array, so a
+    frame's meta is rebuilt with one binary search per key. Scalars and
+    fixed-length numeric tuples are stored as NumPy columns, strings as int32
+    codes into a per-key category list, and anything else (e.g. a final path
+    list) falls back to an object column.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, tuple] = {}  # key -> (steps list, values list)
+        self.steps: Dict[str, np.ndarray] = {}
+        self.values: Dict[str, np.ndarray] = {}
+        self.kinds: Dict[str, str] = {}
+        self.categories: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_arrays(cls, columns: Dict[str, tuple], categories: Optional[Dict[str, List[str]]] = None) -> "MetaColumns":
+        """Build directly from {key: (steps, values, kind)} columns, e.g. from a batch engine or a trace file."""
+        meta = cls()
+        for key, (steps, values, kind) in columns.items():
+            meta.steps[key] = np.asarray(steps, dtype=np.int64)
+            meta.values[key] = np.asarray(values, dtype=_DTYPES.get(kind, object))
+            meta.kinds[key] = kind
+        meta.categories.update(categories or {})
+        return meta
+
+    def append(self, step: int, meta: Dict) -> None:
+        for key, value in meta.items():
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = ([], [])
+                self.kinds[key] = _kind(value)
+            pending[0].append(step)
+            pending[1].append(value)
+
+    def freeze(self) -> "MetaColumns":
+        """Convert pending Python lists into NumPy columns."""
+        for key, (steps, values) in self._pending.items():
+            kind = self.kinds[key]
+            if kind == "object" and all(isinstance(v, str) for v in values):
+                cats = self.categories[key] = list(dict.fromkeys(values))
+                index = {c: i for i, c in enumerate(cats)}
+                self.kinds[key] = "category"
+                self.steps[key] = np.asarray(steps, dtype=np.int64)
+                self.values[key] = np.fromiter((index[v] for v in values), dtype=np.int32, count=len(values))
+                continue
+            if kind == "object" or (kind.startswith("tuple") and len({len(v) for v in values}) != 1):
+                kind = self.kinds[key] = "object"
+                col = np.empty(len(values), dtype=object)
+                col[:] = values
+            else:
+                try:
+                    col = np.asarray(values, dtype=_DTYPES[kind])
+                except (TypeError, ValueError):
+                    kind = self.kinds[key] = "object"
+                    col = np.empty(len(values), dtype=object)
+                    col[:] = values
+            self.steps[key] = np.asarray(steps, dtype=np.int64)
+            self.values[key] = col
+        self._pending = {}
+        return self
+
+    def get(self, step: int) -> Dict:
+        meta = {}
+        for key, steps in self.steps.items():
+            pos = int(np.searchsorted(steps, step))
+            if pos < len(steps) and steps[pos] == step:
+                meta[key] = self._to_python(key, self.values[key][pos])
+        return meta
+
+    def _to_python(self, key: str, value: Any) -> Any:
+        kind = self.kinds[key]
+        if kind == "bool":
+            return bool(value)
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+        if kind == "tuple_int":
+            return tuple(int(v) for v in value)
+        if kind == "tuple_float":
+            return tuple(float(v) for v in value)
+        if kind == "category":
+            return self.categories[key][int(value)]
+        return value
+
+    @property
+    def nbytes(self) -> int:
+        return resident_nbytes(*self.steps.values(), *self.values.values())
+
+    def keys(self) -> List[str]:
+        return list(self.steps.keys())
@@ -0,0 +1,180 @@
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import hashlib
+
+import numpy as np
+
+from algoviz.algorithms.graphs.csr import CSRGraph
+from algoviz.algorithms.graphs.frames import color_deltas
+from .columns import MetaColumns, resident_nbytes
+
+
+def graph_signature(positions, edges: Optional[List[Tuple[int, int]]] = None,
+                    weights: Optional[Dict[Tuple[int, int], float]] = None) -> str:
+    """Stable content hash of a graph's node positions, edges and weights (dict form or CSRGraph), used in cache keys."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(positions, CSRGraph):
+        parts = [positions.positions, positions.offsets, positions.indices]
+        if positions.weights is not None:
+            parts.append(positions.weights)
+    else:
+        parts = [np.asarray(list(positions.keys()), dtype=np.int64),
+                 np.asarray(list(positions.values()), dtype=np.float64),
+                 np.asarray(edges, dtype=np.int64)]
+        if weights is not None:
+            parts.append(np.asarray([weights.get(e, 1.0) for e in edges], dtype=np.float64))
+    for a in parts:
+        h.update(str(a.shape).encode())
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+
+class GraphTrace:
+    """A graph traversal recorded once into compact NumPy columns.
+
+    Node colors are palette-coded (uint8, 0 = base color) and stored as the
+    per-step changes against the previous frame, with a full keyframe of node
+    codes every `keyframe_every` steps. Meta goes into sparse columns and the
+    rarely used edge colors into a step -> dict map.
+    """
+
+    def __init__(self, node_ids: np.ndarray, palette: List[Optional[str]], change_offsets: np.ndarray,
+                 change_idx: np.ndarray, change_code: np.ndarray, keyframes: np.ndarray, keyframe_every: int,
+                 meta: MetaColumns, edge_colors: Dict[int, Dict]):
+        self.node_ids = node_ids
+        self.palette = palette
+        self.change_offsets = change_offsets
+        self.change_idx = change_idx
+        self.change_code = change_code
+        self.keyframes = keyframes
+        self.keyframe_every = keyframe_every
+        self.meta = meta
+        self.edge_colors = edge_colors
+
+    @classmethod
+    def record(cls, nodes: Iterable[Hashable], frames: Iterable[Tuple], keyframe_every: Optional[int] = None) -> "GraphTrace":
+        """Run a full-frame graph generator to completion and store its trace.
+
+        `frames` yields the usual (positions, edges, node_colors, edge_colors, meta) tuples.
+        """
+        return cls.record_deltas(nodes, color_deltas(frames), keyframe_every)
+
+    @classmethod
+    def record_deltas(cls, nodes: Iterable[Hashable], deltas: Iterable[Tuple], keyframe_every: Optional[int] = None) -> "GraphTrace":
+        """Store a delta-frame generator's (changes, edge_colors, meta) tuples; O(changes) per step."""
+        node_ids = list(nodes)
+        index = {nid: i for i, nid in enumerate(node_ids)}
+        V = len(node_ids)
+        if keyframe_every is None:
+            keyframe_every = max(64, V)
+        palette: List[Optional[str]] = [None]
+        codes: Dict[Optional[str], int] = {None: 0}
+        state = bytearray(V)
+        change_offsets = array("q", [0])
+        change_idx = array("q")
+        change_code = array("B")
+        keyframes: List[bytes] = []
+        meta = MetaColumns()
+        edge_colors: Dict[int, Dict] = {}
+
+        step = 0
+        for changes, e_colors, m in deltas:
+            if step % keyframe_every == 0:
+                keyframes.append(bytes(state))
+            for nid, color in changes.items():
+                code = codes.get(color)
+                if code is None:
+                    code = codes[color] = len(palette)
+                    palette.append(color)
+                i = index[nid]
+                if state[i] != code:
+                    state[i] = code
+                    change_idx.append(i)
+                    change_code.append(code)
+            change_offsets.append(len(change_idx))
+            if e_colors:
+                edge_colors[step] = dict(e_colors)
+            if m:
+                meta.append(step, m)
+            step += 1
+
+        return cls(
+            node_ids=np.asarray(node_ids, dtype=np.int64),
+            palette=palette,
+            change_offsets=np.frombuffer(change_offsets, dtype=np.int64).copy(),
+            change_idx=np.frombuffer(change_idx, dtype=np.int64).astype(np.int32),
+            change_code=np.frombuffer(change_code, dtype=np.uint8).copy(),
+            keyframes=np.frombuffer(b"".join(keyframes), dtype=np.uint8).reshape(len(keyframes), V).copy(),
+            keyframe_every=keyframe_every,
+            meta=meta.freeze(),
+            edge_colors=edge_colors,
+        )
+
+    def __len__(self) -> int:
+        return len(self.change_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.node_ids, self.change_offsets, self.change_idx, self.change_code, self.keyframes)
+        return resident_nbytes(*arrays) + self.meta.nbytes + 200 * sum(len(e) for e in self.edge_colors.values())
+
+    def codes_at(self, step: int) -> np.ndarray:
+        """Palette code of every node (in node_ids order) at `step`."""
+        if not 0 <= step < len(self):
+            raise IndexError("step out of range")
+        k = step // self.keyframe_every
+        codes = self.keyframes[k].copy()
+        lo = self.change_offsets[k * self.keyframe_every]
+        hi = self.change_offsets[step + 1]
+        if hi > lo:
+            idx = self.change_idx[lo:hi][::-1]
+            code = self.change_code[lo:hi][::-1]
+            uniq, first = np.unique(idx, return_index=True)
+            codes[uniq] = code[first]
+        return codes
+
+    def node_colors_at(self, step: int) -> Dict[int, str]:
+        codes = self.codes_at(step)
+        nz = np.flatnonzero(codes)
+        return {int(self.node_ids[i]): self.palette[codes[i]] for i in nz}
+
+    def changes_at(self, step: int) -> Dict[int, Optional[str]]:
+        """Node color changes from step - 1 to `step` (None = back to base color)."""
+        lo, hi = self.change_offsets[step], self.change_offsets[step + 1]
+        return {int(self.node_ids[i]): self.palette[c] for i, c in zip(self.change_idx[lo:hi], self.change_code[lo:hi])}
+
+    def distances_at(self, step: int) -> Dict[int, float]:
+        """Distance table at `step`, rebuilt on demand from the "relax"/"relax_dist" events
+        (inf for nodes not reached yet)."""
+        if not 0 <= step < len(self):
+            raise IndexError("step out of range")
+        dist = np.full(len(self.node_ids), np.inf)
+        steps = self.meta.steps.get("relax")
+        if steps is not None:
+            k = int(np.searchsorted(steps, step, side="right"))
+            order = np.argsort(self.node_ids, kind="stable")
+            rows = order[np.searchsorted(self.node_ids[order], self.meta.values["relax"][:k])]
+            np.minimum.at(dist, rows, self.meta.values["relax_dist"][:k])
+        return dict(zip(self.node_ids.tolist(), dist.tolist()))
+
+    def change_count(self, lo: int, hi: int) -> int:
+        """Number of recorded node color changes in steps lo+1..hi."""
+        return int(self.change_offsets[hi + 1] - self.change_offsets[lo + 1])
+
+    def changes_between(self, lo: int, hi: int) -> Dict[int, Optional[str]]:
+        """Net node color changes from step lo to step hi (last change per node wins)."""
+        if hi == lo + 1:
+            return self.changes_at(hi)
+        c_lo, c_hi = self.change_offsets[lo + 1], self.change_offsets[hi + 1]
+        if c_hi == c_lo:
+            return {}
+        uniq, first = np.unique(self.change_idx[c_lo:c_hi][::-1], return_index=True)
+        code = self.change_code[c_lo:c_hi][::-1][first]
+        return {int(self.node_ids[i]): self.palette[c] for i, c in zip(uniq, code)}
+
+    def meta_at(self, step: int) -> Dict:
+        return self.meta.get(step)
+
+    def frame(self, step: int) -> Tuple[Dict[int, str], Dict, Dict]:
+        """(node_colors, edge_colors, meta) at `step`; positions/edges live with the graph."""
+        return self.node_colors_at(step), self.edge_colors.get(step, {}), self.meta_at(step)
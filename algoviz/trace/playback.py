@@ -0,0 +1,42 @@
+import math
+import time
+from typing import Optional
+
+
+class PlaybackClock:
+    """Wall-clock pacing for playing back a recorded trace.
+
+    The run advances at `steps_per_s` (from a per-step speed, or from a target
+    duration for the whole trace) and is rendered at most `fps` times a second.
+    Each tick jumps to the step that is due now, so steps in between are merged
+    into one rendered frame and a slow render drops frames instead of
+    stretching the run. total_steps is None for a live stream of unknown
+    length, which needs a per-step speed.
+    """
+
+    def __init__(self, total_steps: Optional[int], start_step: int = 0, fps: float = 20.0,
+                 step_ms: Optional[float] = None, duration_s: Optional[float] = None,
+                 now: Optional[float] = None):
+        if duration_s and total_steps is not None:
+            remaining = max(1, total_steps - 1 - start_step)
+            self.steps_per_s = remaining / duration_s
+        else:
+            self.steps_per_s = 1000.0 / max(1.0, step_ms or 50.0)
+        self.total_steps = total_steps
+        self.fps = fps
+        self.frame_s = max(1.0 / fps, 1.0 / self.steps_per_s)
+        self.start_step = start_step
+        self.t0 = time.perf_counter() if now is None else now
+        self.last_tick = self.t0
+
+    def wait(self, now: Optional[float] = None) -> float:
+        """Seconds to sleep before the next frame is due."""
+        now = time.perf_counter() if now is None else now
+        return max(0.0, self.last_tick + self.frame_s - now)
+
+    def step_at(self, current: int, now: Optional[float] = None) -> int:
+        """Step to show now: where the clock says the run should be, and at least one past `current`."""
+        now = time.perf_counter() if now is None else now
+        self.last_tick = now
+        due = max(current + 1, self.start_step + math.floor((now - self.t0) * self.steps_per_s))
+        return due if self.total_steps is None else min(self.total_steps - 1, due)
@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+import threading
+import time
+
+
+class TraceProducer:
+    """Runs a frame generator on a worker thread into a bounded ring buffer.
+
+    The worker blocks while the buffer is full (back-pressure), so at most
+    `capacity` frames are held per consumer. Consumers take() frames in order
+    without waiting on the algorithm. cancel() stops the worker at its next
+    frame; a producer nobody has read from for `idle_timeout` seconds cancels
+    itself so abandoned sessions do not keep threads alive.
+    """
+
+    def __init__(self, frames: Iterable, capacity: int = 4096, idle_timeout: float = 300.0,
+                 name: str = "trace-producer"):
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self._frames = frames
+        self._buf: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._last_take = time.monotonic()
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.produced = 0
+        self.consumed = 0
+        self.full_waits = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        frames = iter(self._frames)
+        try:
+            for frame in frames:
+                with self._cond:
+                    while len(self._buf) >= self.capacity and not self._cancelled:
+                        self.full_waits += 1
+                        self._cond.wait(timeout=1.0)
+                        if time.monotonic() - self._last_take > self.idle_timeout:
+                            self._cancelled = True
+                    if self._cancelled:
+                        break
+                    self._buf.append(frame)
+                    self.produced += 1
+                    self._cond.notify_all()
+        except Exception as exc:  # surfaced to the page through .error
+            self.error = exc
+        finally:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+            with self._cond:
+                self.done = True
+                self.finished = time.perf_counter()
+                self._cond.notify_all()
+
+    def take(self, max_frames: int, timeout: float = 0.0) -> List[Any]:
+        """Up to max_frames buffered frames in order; waits up to `timeout` s only if none are ready."""
+        with self._cond:
+            self._last_take = time.monotonic()
+            if not self._buf and timeout > 0 and not self.done:
+                self._cond.wait_for(lambda: self._buf or self.done, timeout)
+            k = min(max_frames, len(self._buf))
+            out = [self._buf.popleft() for _ in range(k)]
+            self.consumed += k
+            if k:
+                self._cond.notify_all()
+            return out
+
+    def cancel(self, join_timeout: float = 1.0) -> None:
+        with self._cond:
+            self._cancelled = True
+            self._buf.clear()
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(join_timeout)
+
+    @property
+    def depth(self) -> int:
+        return len(self._buf)
+
+    @property
+    def exhausted(self) -> bool:
+        """The generator finished and every frame was taken."""
+        return self.done and not self._buf
+
+    def stats(self) -> Dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "depth": self.depth,
+            "capacity": self.capacity,
+            "produced": self.produced,
+            "consumed": self.consumed,
+            "producer_full_waits": self.full_waits,
+            "frames_per_s": round(self.produced / elapsed, 1) if elapsed > 0 else None,
+            "done": self.done,
+        }
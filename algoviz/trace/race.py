@@ -0,0 +1,85 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+import os
+import threading
+
+from algoviz.registry import REGISTRY
+from .cache import TraceCache, array_digest, get_trace_cache
+from .sorting import SortTrace
+from .store import get_trace_store
+
+DEFAULT_WORKERS = int(os.environ.get("ALGOVIZ_RACE_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+
+def _record_columns(tracer: str, data: List[int]) -> Dict:
+    """Pool worker: record one trace and ship back only its event columns."""
+    return REGISTRY.algorithm("sorting", tracer).record(data).to_columns()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_race_pool() -> ProcessPoolExecutor:
+    """Process-wide worker pool shared by every Streamlit session (ALGOVIZ_RACE_WORKERS to size it)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=DEFAULT_WORKERS)
+    return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def record_race(tracers: Dict[str, str], data: List[int], cache: Optional[TraceCache] = None) -> Dict[str, SortTrace]:
+    """Traces of several sorting algorithms on the same data, recorded in parallel.
+
+    `tracers` maps a label to a registered sorting algorithm name. Traces
+    already in the cache (under the Sorting page's ("sort", label, digest) keys)
+    or precomputed in the trace store are reused; the rest are recorded in the
+    process pool and cached. If the pool is unavailable the missing traces are
+    recorded in this process instead.
+    """
+    if cache is None:
+        cache = get_trace_cache()
+    digest = array_digest(data)
+    keys = {label: ("sort", label, digest) for label in tracers}
+    store = get_trace_store()
+    for label in tracers:
+        if keys[label] not in cache:
+            stored = store.load(keys[label])
+            if stored is not None:
+                cache.put(keys[label], stored.trace)
+    futures: Dict[str, Future] = {}
+    try:
+        pool = get_race_pool()
+        for label, tracer in tracers.items():
+            if keys[label] not in cache:
+                futures[label] = pool.submit(_record_columns, tracer, list(data))
+    except (BrokenProcessPool, OSError, RuntimeError):
+        _reset_pool()
+        futures = {}
+
+    def compute(label: str):
+        future = futures.get(label)
+        if future is None:
+            return lambda: REGISTRY.algorithm("sorting", tracers[label]).record(data)
+        return lambda: SortTrace.from_columns(**future.result())
+
+    results = {}
+    for label in tracers:
+        try:
+            results[label] = cache.get_or_compute(keys[label], compute(label))
+        except BrokenProcessPool:
+            _reset_pool()
+            futures.clear()
+            results[label] = cache.get_or_compute(keys[label], compute(label))
+    return results
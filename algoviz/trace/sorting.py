@@ -0,0 +1,224 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from algoviz.algorithms.sorting.frames import DeltaFrame, Frame
+from algoviz.algorithms.sorting.instrument import OPS_FIELDS
+from .columns import MetaColumns, resident_nbytes
+
+
+def _apply_writes(arr: np.ndarray, idx: np.ndarray, val: np.ndarray) -> None:
+    """Apply a run of writes in place; later writes to the same index win."""
+    if len(idx):
+        uniq, first = np.unique(idx[::-1], return_index=True)
+        arr[uniq] = val[::-1][first]
+
+
+class SortTrace:
+    """A sorting run recorded once into compact NumPy columns.
+
+    Per step it stores the write indices/values (CSR-style via write_offsets),
+    the highlight pair (-1 padded), the swapped flag and the meta dict. A full
+    keyframe of the array is kept every `keyframe_every` steps, so seeking to
+    any step copies one keyframe and replays at most that many deltas.
+
+    Exact operation counts from instrumented generators (meta["ops"]) are kept
+    as an (F, 4) cumulative `ops` column of reads/writes/comparisons/swaps
+    rather than in the meta store; meta_at() puts them back.
+    """
+
+    def __init__(self, initial: np.ndarray, write_offsets: np.ndarray, write_idx: np.ndarray,
+                 write_val: np.ndarray, highlight: np.ndarray, highlight_len: np.ndarray,
+                 swapped: np.ndarray, meta: MetaColumns, keyframes: np.ndarray, keyframe_every: int,
+                 ops: Optional[np.ndarray] = None):
+        self.initial = initial
+        self.write_offsets = write_offsets
+        self.write_idx = write_idx
+        self.write_val = write_val
+        self.highlight = highlight
+        self.highlight_len = highlight_len
+        self.swapped = swapped
+        self.meta = meta
+        self.keyframes = keyframes
+        self.keyframe_every = keyframe_every
+        if ops is not None and len(ops) and ops[-1].max() < 2 ** 31:
+            ops = ops.astype(np.int32, copy=False)  # totals only grow, so the last row bounds the column
+        self.ops = ops
+        if ops is not None:
+            self.cmp_cum = ops[:, 2]
+            self.swap_cum = ops[:, 3]
+            return
+        # Uninstrumented generator: estimate the HUD counters from the frames. Frame 0
+        # is the primed start state and is not counted.
+        has_hl = highlight_len > 0
+        cmp_step = (~swapped) & has_hl
+        swap_step = swapped.copy()
+        if len(swapped):
+            cmp_step[0] = False
+            swap_step[0] = False
+        self.cmp_cum = np.cumsum(cmp_step, dtype=np.int64)
+        self.swap_cum = np.cumsum(swap_step, dtype=np.int64)
+
+    @classmethod
+    def record(cls, data: Iterable[int], deltas: Iterable[DeltaFrame], keyframe_every: Optional[int] = None) -> "SortTrace":
+        """Run a delta generator to completion and store its trace."""
+        arr = list(data)
+        initial = np.asarray(arr, dtype=np.int64)
+        n = len(arr)
+        if keyframe_every is None:
+            keyframe_every = max(64, n)
+        write_offsets = array("q", [0])
+        write_idx = array("q")
+        write_val = array("q")
+        highlight = array("q")
+        highlight_len = array("b")
+        swapped = array("b")
+        meta = MetaColumns()
+        ops = array("q")
+        keyframes: List[List[int]] = []
+
+        step = 0
+        for writes, hl, sw, m in deltas:
+            if step % keyframe_every == 0:
+                keyframes.append(arr.copy())
+            for idx, val in writes:
+                arr[idx] = val
+                write_idx.append(idx)
+                write_val.append(val)
+            write_offsets.append(len(write_idx))
+            if hl is None:
+                highlight.extend((-1, -1))
+                highlight_len.append(0)
+            else:
+                highlight.extend((hl[0], hl[1] if len(hl) > 1 else -1))
+                highlight_len.append(len(hl))
+            swapped.append(bool(sw))
+            if "ops" in m:
+                ops.extend(m["ops"])
+                m = {k: v for k, v in m.items() if k != "ops"}
+            if m:
+                meta.append(step, m)
+            step += 1
+
+        return cls(
+            initial=initial,
+            write_offsets=np.frombuffer(write_offsets, dtype=np.int64).copy(),
+            write_idx=np.frombuffer(write_idx, dtype=np.int64).astype(np.int32),
+            write_val=np.frombuffer(write_val, dtype=np.int64).copy(),
+            highlight=np.frombuffer(highlight, dtype=np.int64).astype(np.int32).reshape(-1, 2),
+            highlight_len=np.frombuffer(highlight_len, dtype=np.int8).copy(),
+            swapped=np.frombuffer(swapped, dtype=np.int8).astype(bool),
+            meta=meta.freeze(),
+            keyframes=np.asarray(keyframes, dtype=np.int64).reshape(len(keyframes), n),
+            keyframe_every=keyframe_every,
+            ops=np.frombuffer(ops, dtype=np.int64).reshape(-1, 4).copy() if len(ops) == 4 * step else None,
+        )
+
+    @classmethod
+    def from_columns(cls, initial: np.ndarray, write_offsets: np.ndarray, write_idx: np.ndarray,
+                     write_val: np.ndarray, highlight: np.ndarray, highlight_len: np.ndarray,
+                     swapped: np.ndarray, meta: MetaColumns, keyframe_every: Optional[int] = None,
+                     ops: Optional[np.ndarray] = None) -> "SortTrace":
+        """Build a trace from ready-made event columns, computing the keyframes by replaying the writes."""
+        initial = np.asarray(initial, dtype=np.int64)
+        n = len(initial)
+        if keyframe_every is None:
+            keyframe_every = max(64, n)
+        kf_steps = range(0, len(swapped), keyframe_every)
+        keyframes = np.empty((len(kf_steps), n), dtype=np.int64)
+        arr = initial.copy()
+        prev = 0
+        for k, step in enumerate(kf_steps):
+            lo, hi = write_offsets[prev], write_offsets[step]
+            _apply_writes(arr, write_idx[lo:hi], write_val[lo:hi])
+            keyframes[k] = arr
+            prev = step
+        return cls(initial, write_offsets, write_idx, write_val, highlight, highlight_len,
+                   swapped, meta, keyframes, keyframe_every, ops)
+
+    def to_columns(self) -> Dict:
+        """Event columns only (no keyframes or counters): the compact form for pickling
+        across processes; SortTrace.from_columns(**cols) rebuilds the rest."""
+        return {
+            "initial": self.initial, "write_offsets": self.write_offsets, "write_idx": self.write_idx,
+            "write_val": self.write_val, "highlight": self.highlight, "highlight_len": self.highlight_len,
+            "swapped": self.swapped, "meta": self.meta, "keyframe_every": self.keyframe_every, "ops": self.ops,
+        }
+
+    def __len__(self) -> int:
+        return len(self.swapped)
+
+    @property
+    def n(self) -> int:
+        return len(self.initial)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.initial, self.write_offsets, self.write_idx, self.write_val, self.highlight,
+                  self.highlight_len, self.swapped, self.keyframes)
+        arrays += (self.cmp_cum, self.swap_cum) if self.ops is None else (self.ops,)
+        return resident_nbytes(*arrays) + self.meta.nbytes
+
+    def values_at(self, step: int) -> np.ndarray:
+        """Array state after the writes of `step` have been applied."""
+        if not 0 <= step < len(self):
+            raise IndexError("step out of range")
+        k = step // self.keyframe_every
+        arr = self.keyframes[k].copy()
+        lo = self.write_offsets[k * self.keyframe_every]
+        hi = self.write_offsets[step + 1]
+        _apply_writes(arr, self.write_idx[lo:hi], self.write_val[lo:hi])
+        return arr
+
+    def highlight_at(self, step: int) -> Optional[Tuple[int, ...]]:
+        k = int(self.highlight_len[step])
+        if k == 0:
+            return None
+        return tuple(int(v) for v in self.highlight[step, :k])
+
+    def writes_at(self, step: int) -> Tuple[Tuple[int, int], ...]:
+        lo, hi = self.write_offsets[step], self.write_offsets[step + 1]
+        return tuple(zip(self.write_idx[lo:hi].tolist(), self.write_val[lo:hi].tolist()))
+
+    def meta_at(self, step: int) -> Dict:
+        meta = self.meta.get(step)
+        if self.ops is not None:
+            meta["ops"] = tuple(self.ops[step].tolist())
+        return meta
+
+    def counts_at(self, step: int) -> Tuple[int, int]:
+        """(comparisons, swaps) up to `step`: exact when instrumented, else estimated from the frames."""
+        return int(self.cmp_cum[step]), int(self.swap_cum[step])
+
+    def ops_at(self, step: int) -> Optional[Dict[str, int]]:
+        """Exact reads/writes/comparisons/swaps up to `step`, or None for an uninstrumented trace."""
+        if self.ops is None:
+            return None
+        return dict(zip(OPS_FIELDS, self.ops[step].tolist()))
+
+    def delta_at(self, step: int) -> DeltaFrame:
+        return (self.writes_at(step), self.highlight_at(step), bool(self.swapped[step]), self.meta_at(step))
+
+    def span(self, lo: int, hi: int) -> DeltaFrame:
+        """Steps lo+1..hi merged into one delta frame, for playback that skips steps.
+
+        Writes are netted (last write per index wins), the highlight is every index
+        compared or written in the span, swapped is set if any step swapped, and meta
+        is hi's. HUD counters stay exact through ops_at(hi).
+        """
+        if hi == lo + 1:
+            return self.delta_at(hi)
+        w_lo, w_hi = self.write_offsets[lo + 1], self.write_offsets[hi + 1]
+        idx, val = self.write_idx[w_lo:w_hi], self.write_val[w_lo:w_hi]
+        writes: Tuple[Tuple[int, int], ...] = ()
+        if len(idx):
+            uniq, first = np.unique(idx[::-1], return_index=True)
+            writes = tuple(zip(uniq.tolist(), val[::-1][first].tolist()))
+        hl = self.highlight[lo + 1:hi + 1].reshape(-1)
+        touched = np.union1d(hl[hl >= 0], idx)
+        highlight = tuple(touched.tolist()) if len(touched) else None
+        return (writes, highlight, bool(self.swapped[lo + 1:hi + 1].any()), self.meta_at(hi))
+
+    def frame(self, step: int) -> Frame:
+        """Full (values, highlight, swapped, meta) frame at `step`."""
+        return (self.values_at(step).tolist(), self.highlight_at(step), bool(self.swapped[step]), self.meta_at(step))
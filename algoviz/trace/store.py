@@ -0,0 +1,224 @@
+"""Binary trace files (.avt) that replay straight from disk.
+
+Layout: the 8-byte magic, a little-endian uint64 header length, a UTF-8 JSON
+header, then fixed-width little-endian columns, each starting on a 64-byte
+boundary. The header records the trace kind ("sort" or "graph"), free-form
+info (algorithm label, endpoints, ...), and for every column its offset from
+the start of the data section, dtype and shape. Sorting files hold the input
+array, the event columns, the keyframes and the ops counters. Graph files
+hold the CSR graph and the color-change columns. Meta is stored as step and
+value columns; string meta becomes int32 category codes, and the few
+free-form values (e.g. a final path) go into the header.
+
+load_trace() memory-maps the file once and hands out views of it, so opening
+a trace costs the header parse. Seeking touches one keyframe and the events
+after it, and the OS page cache bounds resident memory.
+"""
+from typing import Any, BinaryIO, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+import io
+import json
+import os
+import re
+import struct
+import threading
+
+import numpy as np
+
+from algoviz.algorithms.graphs.csr import CSRGraph
+from .columns import MetaColumns
+from .graph import GraphTrace
+from .sorting import SortTrace
+
+MAGIC = b"AVTRACE1"
+FORMAT_VERSION = 1
+ALIGN = 64
+SUFFIX = ".avt"
+DEFAULT_DIR = os.environ.get("ALGOVIZ_TRACE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "traces")
+
+_SORT_COLUMNS = ("initial", "write_offsets", "write_idx", "write_val", "highlight", "highlight_len", "swapped",
+                 "keyframes")
+_GRAPH_COLUMNS = ("node_ids", "change_offsets", "change_idx", "change_code", "keyframes")
+
+
+class StoredTrace(NamedTuple):
+    trace: Union[SortTrace, GraphTrace]
+    info: Dict[str, Any]
+    graph: Optional[CSRGraph] = None  # the input graph, for graph traces
+
+
+def _pad(size: int) -> int:
+    return -size % ALIGN
+
+
+def _columns(trace, graph: Optional[CSRGraph]) -> Tuple[str, Dict[str, np.ndarray], Dict[str, Any]]:
+    """Kind, fixed-width columns and the JSON-only extras of a trace."""
+    extra: Dict[str, Any] = {"keyframe_every": int(trace.keyframe_every)}
+    if isinstance(trace, SortTrace):
+        kind = "sort"
+        cols = {name: getattr(trace, name) for name in _SORT_COLUMNS}
+        if trace.ops is not None:
+            cols["ops"] = trace.ops
+    elif isinstance(trace, GraphTrace):
+        kind = "graph"
+        cols = {name: getattr(trace, name) for name in _GRAPH_COLUMNS}
+        extra["palette"] = trace.palette
+        extra["edge_colors"] = [[step, [[*edge, color] for edge, color in colors.items()]]
+                                for step, colors in trace.edge_colors.items()]
+        if graph is not None:
+            cols.update({"graph.positions": graph.positions, "graph.offsets": graph.offsets,
+                         "graph.indices": graph.indices})
+            if graph.weights is not None:
+                cols["graph.weights"] = graph.weights
+    else:
+        raise TypeError(f"Cannot store a {type(trace).__name__}.")
+    meta, free = {}, {}
+    for key, kind_ in trace.meta.kinds.items():
+        cols[f"meta.{key}.steps"] = trace.meta.steps[key]
+        if kind_ == "object":
+            free[key] = trace.meta.values[key].tolist()
+        else:
+            cols[f"meta.{key}.values"] = trace.meta.values[key]
+        meta[key] = {"kind": kind_, "categories": trace.meta.categories.get(key)}
+    extra["meta"] = meta
+    extra["meta_objects"] = free
+    return kind, cols, extra
+
+
+def write_trace(fp: BinaryIO, trace, info: Optional[Dict[str, Any]] = None, graph: Optional[CSRGraph] = None) -> None:
+    """Write a SortTrace or GraphTrace (plus its input graph) to a binary stream."""
+    kind, cols, extra = _columns(trace, graph)
+    layout, offset = {}, 0
+    for name, col in cols.items():
+        col = np.ascontiguousarray(col)
+        cols[name] = col.astype(col.dtype.newbyteorder("<"), copy=False)
+        layout[name] = [offset, cols[name].dtype.str, list(col.shape)]
+        offset += col.nbytes + _pad(col.nbytes)
+    header = json.dumps({"format": FORMAT_VERSION, "kind": kind, "info": info or {}, "columns": layout, **extra},
+                        separators=(",", ":")).encode()
+    fp.write(MAGIC)
+    fp.write(struct.pack("<Q", len(header)))
+    fp.write(header)
+    fp.write(b"\0" * _pad(len(MAGIC) + 8 + len(header)))
+    for col in cols.values():
+        fp.write(col.tobytes())
+        fp.write(b"\0" * _pad(col.nbytes))
+
+
+def save_trace(path: str, trace, info: Optional[Dict[str, Any]] = None, graph: Optional[CSRGraph] = None) -> str:
+    """Write atomically (temp file, then rename) so readers never map a half-written file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fp:
+        write_trace(fp, trace, info, graph)
+    os.replace(tmp, path)
+    return path
+
+
+def dumps_trace(trace, info: Optional[Dict[str, Any]] = None, graph: Optional[CSRGraph] = None) -> bytes:
+    buf = io.BytesIO()
+    write_trace(buf, trace, info, graph)
+    return buf.getvalue()
+
+
+def _parse(buf: np.ndarray) -> StoredTrace:
+    """Rebuild a trace whose columns are views into buf (a uint8 memmap or buffer)."""
+    if bytes(buf[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not an algoviz trace file.")
+    (size,) = struct.unpack("<Q", bytes(buf[len(MAGIC):len(MAGIC) + 8]))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buf[start:start + size]))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported trace format {header.get('format')!r}.")
+    data = start + size + _pad(start + size)
+
+    def col(name: str) -> np.ndarray:
+        offset, dtype, shape = header["columns"][name]
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        lo = data + offset
+        return buf[lo:lo + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    columns = {}
+    for key, spec in header["meta"].items():
+        if spec["kind"] == "object":
+            objects = header["meta_objects"][key]
+            values = np.empty(len(objects), dtype=object)
+            for i, value in enumerate(objects):
+                values[i] = value
+        else:
+            values = col(f"meta.{key}.values")
+        columns[key] = (col(f"meta.{key}.steps"), values, spec["kind"])
+    meta = MetaColumns.from_arrays(columns, {k: v["categories"] for k, v in header["meta"].items() if v["categories"]})
+
+    keyframe_every = header["keyframe_every"]
+    if header["kind"] == "sort":
+        ops = col("ops") if "ops" in header["columns"] else None
+        trace = SortTrace(*(col(name) for name in _SORT_COLUMNS[:-1]), meta, col("keyframes"), keyframe_every, ops)
+        return StoredTrace(trace, header["info"])
+    edge_colors = {step: {(u, v): color for u, v, color in colors} for step, colors in header["edge_colors"]}
+    trace = GraphTrace(col("node_ids"), header["palette"], col("change_offsets"), col("change_idx"),
+                       col("change_code"), col("keyframes"), keyframe_every, meta, edge_colors)
+    graph = None
+    if "graph.positions" in header["columns"]:
+        weights = col("graph.weights") if "graph.weights" in header["columns"] else None
+        graph = CSRGraph(col("graph.positions"), col("graph.offsets"), col("graph.indices"), weights)
+    return StoredTrace(trace, header["info"], graph)
+
+
+def load_trace(path: str) -> StoredTrace:
+    """Memory-map a trace file; columns are read from disk as replay touches them."""
+    return _parse(np.memmap(path, dtype=np.uint8, mode="r"))
+
+
+def loads_trace(data: bytes) -> StoredTrace:
+    """Trace from an in-memory file (e.g. an upload); columns are views of `data`."""
+    return _parse(np.frombuffer(data, dtype=np.uint8))
+
+
+def trace_filename(key: Tuple[Hashable, ...]) -> str:
+    """Readable, filesystem-safe name for a trace cache key, e.g. ("sort", "Quick Sort", digest)."""
+    parts = [re.sub(r"[^a-z0-9]+", "-", str(part).lower()).strip("-") or "x" for part in key]
+    return "__".join(parts) + SUFFIX
+
+
+class TraceStore:
+    """Directory of precomputed trace files, addressed by the pages' trace cache keys."""
+
+    def __init__(self, directory: str = DEFAULT_DIR):
+        self.directory = directory
+
+    def path_for(self, key: Tuple[Hashable, ...]) -> str:
+        return os.path.join(self.directory, trace_filename(key))
+
+    def __contains__(self, key: Tuple[Hashable, ...]) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def load(self, key: Tuple[Hashable, ...]) -> Optional[StoredTrace]:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        return load_trace(path)
+
+    def save(self, key: Tuple[Hashable, ...], trace, info: Optional[Dict[str, Any]] = None,
+             graph: Optional[CSRGraph] = None) -> str:
+        return save_trace(self.path_for(key), trace, info, graph)
+
+    def files(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(SUFFIX))
+
+
+_store: Optional[TraceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_trace_store() -> TraceStore:
+    """Process-wide store (ALGOVIZ_TRACE_DIR, default ./traces next to the package)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TraceStore()
+    return _store
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from algoviz.registry import REGISTRY
+
 st.set_page_config(page_title="Algorithm Visualizer", page_icon="🧠", layout="wide")
 st.title("🧠 Algorithm Visualizer (Python + Streamlit)")
 st.write(
@@ -14,3 +16,7 @@ st.write(
     "- The codebase is **modular**: add algorithms without touching much UI."
 )
 st.info("Open the **Sorting** page from the left sidebar to try it out.")
+
+# The landing page has painted: import numpy, plotly and the algorithms in the background
+# so the first page a visitor opens does not pay for them.
+REGISTRY.warm_up()
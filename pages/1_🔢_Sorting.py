@@ -1,160 +1,465 @@
 import time
-import numpy as np
 import streamlit as st
 
-from algoviz.components.bars import make_bar_figure
-from algoviz.algorithms.sorting.bubble import bubble_sort
-from algoviz.algorithms.sorting.insertion import insertion_sort
-from algoviz.algorithms.sorting.merge import merge_sort
-from algoviz.algorithms.sorting.quick import quick_sort
+from algoviz.algorithms.sorting.instrument import OPS_FIELDS
+from algoviz.registry import REGISTRY, lazy, load
+from algoviz.profiling import DEFAULT_ENABLED as PROFILE_DEFAULT, StageProfiler
+from algoviz.sessions import current_session_id, track_page
+from algoviz.trace.playback import PlaybackClock
+from algoviz.trace.producer import TraceProducer
+
+# numpy, plotly and the algorithm modules load on first use, after the header and sidebar have painted
+make_bar_animation = REGISTRY.ref("renderers", "make_bar_animation")
+BarFigure = REGISTRY.ref("renderers", "BarFigure")
+make_bar_figure = REGISTRY.ref("renderers", "make_bar_figure")
+array_digest = lazy("algoviz.trace.cache:array_digest")
+make_input = lazy("algoviz.inputs:make_input")
+trace_store = lazy("algoviz.trace.store")
+get_trace_cache = lazy("algoviz.trace.cache:get_trace_cache")
+record_race = lazy("algoviz.trace.race:record_race")
 
 st.set_page_config(page_title="Sorting Visualizer", page_icon="🔢", layout="wide")
 
 st.title("🔢 Sorting Visualizer")
-st.caption("Bubble, Insertion, Merge, and Quick Sort with playback controls + Stats HUD & Colored Regions.")
+st.caption("Comparison sorts from bubble to introsort plus radix and counting sort, with playback controls + Stats HUD & Colored Regions.")
+
+LIVE = "Live (background producer)"
+RACE_TRACERS = {spec.label: spec.name for spec in REGISTRY.algorithms("sorting")}
+RACE_DEFAULT = ["Bubble Sort", "Insertion Sort", "Merge Sort", "Quick Sort"]
+HEAVY_KEYS = ("data", "bar_fig", "live", "race_figs")  # dropped when the session is compacted, rebuilt by _resume()
 
 def _init_state():
     if "algo" not in st.session_state:
         st.session_state.algo = "Bubble Sort"
     if "data" not in st.session_state:
         st.session_state.data = None
-    if "gen" not in st.session_state:
-        st.session_state.gen = None
-    if "current" not in st.session_state:
-        st.session_state.current = None  # (values, highlight, swapped, meta?)
+    if "data_digest" not in st.session_state:
+        st.session_state.data_digest = None  # traces live in the shared cache, keyed by (algo, digest)
+    if "data_source" not in st.session_state:
+        st.session_state.data_source = None  # (size, seed) the data was generated from; None for imported data
+    if "bar_fig" not in st.session_state:
+        st.session_state.bar_fig = None  # (data_digest, BarFigure) built once per dataset
     if "playing" not in st.session_state:
         st.session_state.playing = False
     if "step" not in st.session_state:
         st.session_state.step = 0
-    if "finished" not in st.session_state:
-        st.session_state.finished = False
-    if "cmp_count" not in st.session_state:
-        st.session_state.cmp_count = 0
-    if "swap_count" not in st.session_state:
-        st.session_state.swap_count = 0
+    if "clock" not in st.session_state:
+        st.session_state.clock = None  # (pacing settings, PlaybackClock) while playing
+    if "play_from" not in st.session_state:
+        st.session_state.play_from = None  # step shown before the last playback tick
+    if "live" not in st.session_state:
+        st.session_state.live = None  # live playback state: producer thread plus the consumed array/counters
+    if "race_step" not in st.session_state:
+        st.session_state.race_step = 0  # shared step for every algorithm in race view
+    if "race_figs" not in st.session_state:
+        st.session_state.race_figs = None  # (data_digest, {algorithm: BarFigure})
+    if "profiler" not in st.session_state:
+        st.session_state.profiler = StageProfiler("sorting", current_session_id())  # opt-in render stage timers
+
+def _live_cancel():
+    if st.session_state.get("live") is not None:
+        st.session_state.live["producer"].cancel()
+        st.session_state.live = None
+
+def _on_algo_change():
+    st.session_state.step = 0
+    st.session_state.playing = False
+    _live_cancel()
+
+def _on_import():
+    # Adopt an exported .avt trace: its input array becomes the dataset and the trace goes into the cache
+    upload = st.session_state.trace_upload
+    if upload is None:
+        return
+    try:
+        stored = trace_store.loads_trace(upload.getvalue())
+        if not isinstance(stored.trace, trace_store.SortTrace):
+            raise ValueError("this is a graph trace; import it on the Graphs page")
+        label = REGISTRY.algorithm("sorting", stored.info.get("algorithm", "")).label
+    except (KeyError, ValueError) as e:
+        st.error(f"Could not import trace: {e}")
+        return
+    _live_cancel()
+    data = stored.trace.initial.tolist()
+    st.session_state.data = data
+    st.session_state.data_digest = array_digest(data)
+    st.session_state.data_source = None
+    st.session_state.algo = label
+    st.session_state.step = 0
+    st.session_state.playing = False
+    get_trace_cache().put(("sort", label, st.session_state.data_digest), stored.trace)
 
+resumed = track_page("sorting", HEAVY_KEYS)
 _init_state()
+prof = st.session_state.profiler
+prof.tick()  # the previous run, including its playback sleep, is one sample
 
 with st.sidebar:
     st.header("Controls")
-    size = st.slider("Array size", min_value=10, max_value=150, value=40, step=5)
-    speed_ms = st.slider("Speed (ms per step)", min_value=10, max_value=500, value=50, step=10)
+    view = st.radio("View", ["Single algorithm", "Race"], index=0, horizontal=True,
+                    help="Race plays several algorithms on the same data side by side.")
+    racers = st.multiselect("Racers", list(RACE_TRACERS), default=RACE_DEFAULT, disabled=view != "Race")
+    size = st.slider("Array size", min_value=10, max_value=1000, value=40, step=5,
+                     help="Quadratic sorts record about n² steps; heap, shell, radix, counting and introsort stay near n log n.")
+    pacing = st.radio("Pacing", ["Speed per step", "Fixed duration"], index=0, horizontal=True,
+                      help="Fixed duration plays the whole run in the given time, skipping steps as needed.")
+    speed_ms = st.slider("Speed (ms per step)", min_value=10, max_value=500, value=50, step=10,
+                         disabled=pacing != "Speed per step")
+    duration_s = st.number_input("Run duration (s)", min_value=1.0, max_value=600.0, value=10.0, step=1.0,
+                                 disabled=pacing != "Fixed duration")
+    max_fps = st.slider("Max frame rate (FPS)", min_value=1, max_value=60, value=20, step=1,
+                        help="Steps due between two rendered frames are merged into one; counters stay exact.")
     seed = st.number_input("Random seed", min_value=0, value=42, step=1)
-    algo = st.selectbox("Algorithm", ["Bubble Sort", "Insertion Sort", "Merge Sort", "Quick Sort"], index=0, key="algo")
+    algo = st.selectbox("Algorithm", REGISTRY.labels("sorting"), index=0, key="algo", on_change=_on_algo_change)
 
-    cols = st.columns(4)
+    cols = st.columns(5)
     play_pause = cols[0].button("▶/⏸", help="Play/Pause")
-    step_btn   = cols[1].button("⏭ Step", help="Advance one step and pause")
-    reset_btn  = cols[2].button("🔁 Reset", help="Reset to start state")
-    stop_btn   = cols[3].button("⏹ Stop", help="Stop playback")
+    back_btn   = cols[1].button("⏮", help="Step back one frame and pause")
+    step_btn   = cols[2].button("⏭", help="Advance one step and pause")
+    reset_btn  = cols[3].button("🔁", help="Reset to start state")
+    stop_btn   = cols[4].button("⏹", help="Stop playback")
 
     start_btn = st.button("🎬 Start / Regenerate Data", use_container_width=True)
 
+    playback = st.radio("Playback", ["Server (step-by-step)", "Browser (animation)", LIVE], index=0,
+                        help="Browser mode ships the whole trace as Plotly frames and animates locally. "
+                             "Live mode runs the algorithm on a worker thread and plays frames as they arrive.")
+    buffer_frames = st.number_input("Live buffer (frames)", min_value=64, max_value=65536, value=4096, step=64,
+                                    disabled=playback != LIVE)
+    payload_mb = st.number_input("Animation payload budget (MB)", min_value=0.5, max_value=50.0,
+                                 value=load("algoviz.components.animation:DEFAULT_MAX_PAYLOAD") / (1024 * 1024), step=0.5,
+                                 disabled=playback != "Browser (animation)")
+
+    with st.expander("Trace cache"):
+        st.json(get_trace_cache().stats())
+    with st.expander("Trace file"):
+        st.file_uploader("Import trace (.avt)", type=["avt"], key="trace_upload", on_change=_on_import)
+        export_slot = st.empty()
+    with st.expander("Profiling"):
+        prof.enabled = st.checkbox("Time render stages", value=PROFILE_DEFAULT, key="profile",
+                                   help="Rolling p50/p95 per stage in a HUD panel; ALGOVIZ_PROFILE_LOG also appends "
+                                        "every run to a JSON-lines file")
+        if st.button("Reset timings"):
+            prof.reset()
+        st.download_button("Export timings (JSON)", data=prof.to_json, file_name="sorting-stage-timings.json",
+                           mime="application/json", on_click="ignore", disabled=not prof.samples)
+
 def _make_data(n, seed_val):
-    rng = np.random.default_rng(int(seed_val))
-    return rng.integers(low=1, high=100, size=n).tolist()
-
-def _make_generator(algo_name, data):
-    if algo_name == "Bubble Sort":
-        return bubble_sort(data)
-    elif algo_name == "Insertion Sort":
-        return insertion_sort(data)
-    elif algo_name == "Merge Sort":
-        return merge_sort(data)
-    elif algo_name == "Quick Sort":
-        return quick_sort(data)
-    else:
-        raise ValueError("Algorithm not implemented.")
+    # Same arrays as algoviz.precompute's catalog, so precomputed traces match by digest
+    return make_input(n, "random", int(seed_val))
+
+def _get_trace():
+    """Recorded trace for the current algorithm and data, shared across sessions via the trace cache."""
+    if st.session_state.data is None:
+        return None
+    algo_name = st.session_state.algo
+    data = st.session_state.data
+    key = ("sort", algo_name, st.session_state.data_digest)
+
+    def compute():
+        # A precomputed file is memory-mapped; otherwise record it (batch engine when the algorithm has one)
+        stored = trace_store.get_trace_store().load(key)
+        return stored.trace if stored is not None else REGISTRY.algorithm("sorting", algo_name).record(data)
+
+    return get_trace_cache().get_or_compute(key, compute)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _bar_animation(key, max_bytes, frame_ms, _trace):
+    """Browser-playback figure of one trace, built once per payload budget and speed and shared across sessions."""
+    algo_name = key[1]
+    return make_bar_animation(_trace, algo_name,
+                              colorize=lambda values, frame: _colors_for_frame(values, algo_name, frame),
+                              max_bytes=max_bytes, frame_ms=frame_ms)
+
+def _seek(trace, step):
+    st.session_state.step = max(0, min(int(step), len(trace) - 1))
+
+def _on_scrub():
+    st.session_state.step = int(st.session_state.scrub)
+    st.session_state.playing = False
 
-def _prime_generator():
-    try:
-        st.session_state.current = next(st.session_state.gen)
-        st.session_state.step = 0
-        st.session_state.finished = False
-        st.session_state.cmp_count = 0
-        st.session_state.swap_count = 0
-    except StopIteration:
-        st.session_state.current = None
-        st.session_state.finished = True
-
-def _update_stats_from_frame(frame):
-    # frame can be 3-tuple or 4-tuple
-    if frame is None:
-        return
-    if len(frame) >= 3:
-        _, highlight, swapped = frame[0], frame[1], frame[2]
-        if swapped:
-            st.session_state.swap_count += 1
-        elif highlight is not None:
-            st.session_state.cmp_count += 1
-
-def _advance_once():
-    if st.session_state.gen is None or st.session_state.finished:
+def _colors_for_frame(values, algo_name, frame):
+    # Palette codes for the frame's colored regions, as declared by the algorithm's spec
+    meta = frame[3] if frame is not None and len(frame) >= 4 and isinstance(frame[3], dict) else {}
+    return REGISTRY.algorithm("sorting", algo_name).colorize(len(values), meta)
+
+def _hud_header(step, meta):
+    # Algorithm and step, then any counters the algorithm's spec declares (gap, digit / bucket, phase)
+    shown = REGISTRY.algorithm("sorting", st.session_state.algo).hud_values(meta)
+    cols = st.columns(2 + len(shown))
+    cols[0].metric("Algorithm", st.session_state.algo)
+    cols[1].metric("Step", step)
+    for col, (label, value) in zip(cols[2:], shown):
+        col.metric(label, value)
+
+def _trace_ops(trace, step):
+    """HUD counters at `step`. Imported files may carry no ops column: comparisons and swaps then come
+    from the frames (SortTrace.counts_at) and reads/writes are unknown."""
+    ops = trace.ops_at(step)
+    if ops is None:
+        comparisons, swaps = trace.counts_at(step)
+        ops = {"reads": "n/a", "writes": "n/a", "comparisons": comparisons, "swaps": swaps}
+    return ops
+
+def _ops_metrics(ops):
+    # Exact counts from the instrumented array and comparator, not guessed from the frames
+    for col, key in zip(st.columns(4), ("comparisons", "swaps", "reads", "writes")):
+        col.metric(key.capitalize(), ops[key])
+
+def _stage_hud():
+    # Rolling latency per render stage; the current run is added once it is over
+    if prof.enabled:
+        with st.expander(f"⏱ Stage latency (last {prof.window} runs)"):
+            st.dataframe(prof.summary(), use_container_width=True, hide_index=True)
+
+def _live_consume(live, frames):
+    """Apply consumed delta frames; several frames in one tick are merged into one rendered frame."""
+    touched = set()
+    for writes, hl, sw, meta in frames:
+        live["step"] += 1
+        for idx, val in writes:
+            live["values"][idx] = val
+            touched.add(idx)
+        if hl is not None:
+            touched.update(hl)
+        if "ops" in meta:
+            live["ops"] = dict(zip(OPS_FIELDS, meta["ops"]))
+        live["meta"] = meta
+        live["swapped"] = bool(sw)
+        live["highlight"] = hl
+    live["merged"] = len(frames)
+    if len(frames) > 1:
+        live["highlight"] = tuple(sorted(touched)) or None
+
+def _live_start():
+    data = st.session_state.data
+    producer = TraceProducer(REGISTRY.algorithm("sorting", st.session_state.algo).make_deltas(data), capacity=int(buffer_frames))
+    live = {"key": (st.session_state.algo, st.session_state.data_digest), "producer": producer,
+            "values": list(data), "step": -1, "ops": dict.fromkeys(OPS_FIELDS, 0), "highlight": None, "swapped": False,
+            "meta": {}, "merged": 0, "lag": 0}
+    _live_consume(live, producer.take(1, timeout=1.0))
+    return live
+
+def _resume():
+    """Rebuild the dataset of a compacted session: the input of its cached trace, else regenerated from its seed."""
+    digest = st.session_state.data_digest
+    if digest is None:
         return
-    try:
-        frame = next(st.session_state.gen)
-        st.session_state.current = frame
-        st.session_state.step += 1
-        _update_stats_from_frame(frame)
-    except StopIteration:
-        st.session_state.finished = True
-        st.session_state.playing = False
+    key = ("sort", st.session_state.algo, digest)
+    trace = get_trace_cache().get(key)
+    if trace is None:
+        stored = trace_store.get_trace_store().load(key)
+        trace = stored.trace if stored is not None else None
+    data = trace.initial.tolist() if trace is not None else None
+    if data is None and st.session_state.data_source is not None:
+        data = _make_data(*st.session_state.data_source)
+    if data is not None and array_digest(data) == digest:
+        st.session_state.data = data
+        st.toast("Session restored.")
+    else:
+        st.session_state.data_digest = None
+        st.session_state.step = 0
+        st.info("This session was idle and its imported data was released; import it again or click Start.")
 
-def _colors_for_frame(values, algo_name, frame):
-    # Build color overrides dict {index: color}
-    overrides = {}
-    # Parse meta if present
-    meta = {}
-    if frame is not None and len(frame) >= 4 and isinstance(frame[3], dict):
-        meta = frame[3]
-
-    green = "#10b981"  # sorted regions
-    blue  = "#60a5fa"  # active range
-    amber = "#f59e0b"  # pivot
-
-    n = len(values)
-
-    if algo_name == "Bubble Sort":
-        tail = meta.get("sorted_tail_len")
-        if isinstance(tail, int) and tail > 0:
-            start = max(0, n - tail)
-            for idx in range(start, n):
-                overrides[idx] = green
-
-    if algo_name == "Insertion Sort":
-        pref = meta.get("sorted_prefix_len")
-        if isinstance(pref, int) and pref > 0:
-            end = min(n, pref)
-            for idx in range(0, end):
-                overrides[idx] = green
-
-    if algo_name in ("Merge Sort", "Quick Sort"):
-        ar = meta.get("active_range")
-        if isinstance(ar, tuple) and len(ar) == 2:
-            lo, hi = ar
-            lo = max(0, int(lo)); hi = min(n - 1, int(hi))
-            for idx in range(lo, hi + 1):
-                overrides[idx] = blue
-
-    if algo_name == "Quick Sort":
-        pv = meta.get("pivot")
-        if isinstance(pv, int) and 0 <= pv < n:
-            overrides[pv] = amber
-
-    return overrides
+if resumed:
+    _resume()
 
 # --- Button Actions ---
 if start_btn:
+    _live_cancel()
     st.session_state.data = _make_data(size, seed)
-    st.session_state.gen = _make_generator(st.session_state.algo, st.session_state.data)
-    _prime_generator()
+    st.session_state.data_digest = array_digest(st.session_state.data)
+    st.session_state.data_source = (int(size), int(seed))
+    st.session_state.step = 0
     st.session_state.playing = False
     st.toast("New data generated. Ready to play.")
 
+def _on_race_scrub():
+    st.session_state.race_step = int(st.session_state.race_scrub)
+    st.session_state.playing = False
+
+if view == "Race":
+    # Traces come from the shared cache; missing ones are recorded in parallel in a process pool.
+    if st.session_state.data is None:
+        fig = make_bar_figure(_make_data(size, seed), title="Race — Ready")
+        st.plotly_chart(fig, use_container_width=True)
+        st.info("Click **Start / Regenerate Data** to create a dataset and enable playback.")
+        st.stop()
+    _live_cancel()
+    if not racers:
+        st.warning("Pick at least one algorithm to race.")
+        st.stop()
+    with prof.stage("trace"):
+        traces = record_race({label: RACE_TRACERS[label] for label in racers}, st.session_state.data)
+    total = max(len(t) for t in traces.values())
+    if start_btn or reset_btn:
+        st.session_state.race_step = 0
+        st.session_state.playing = False
+    if stop_btn:
+        st.session_state.playing = False
+    if play_pause:
+        if st.session_state.race_step >= total - 1 and not st.session_state.playing:
+            st.session_state.race_step = 0
+        st.session_state.playing = not st.session_state.playing
+    if step_btn or back_btn:
+        st.session_state.race_step += 1 if step_btn else -1
+        st.session_state.playing = False
+    if not st.session_state.playing:
+        st.session_state.clock = None
+        st.session_state.play_from = None
+    st.session_state.race_step = max(0, min(st.session_state.race_step, total - 1))
+    step = st.session_state.race_step
+    play_from = st.session_state.play_from
+    finished = step >= total - 1
+
+    if st.session_state.race_figs is None or st.session_state.race_figs[0] != st.session_state.data_digest:
+        st.session_state.race_figs = (st.session_state.data_digest, {})
+    figs = st.session_state.race_figs[1]
+    for name in traces:
+        if name not in figs:
+            figs[name] = BarFigure(st.session_state.data)
+    _stage_hud()
+    grid = [col for _ in range(0, len(traces), 2) for col in st.columns(2)]
+    for col, (name, trace) in zip(grid, traces.items()):
+        here = min(step, len(trace) - 1)
+        with prof.stage("next"):
+            if play_from is not None and min(play_from, len(trace) - 1) < here - 1:
+                _, highlight, swapped, meta = trace.span(min(play_from, len(trace) - 1), here)
+                frame = (trace.values_at(here).tolist(), highlight, swapped, meta)
+            else:
+                frame = trace.frame(here)
+            ops = _trace_ops(trace, here)
+        done = here >= len(trace) - 1
+        with col:
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Comparisons", ops["comparisons"])
+            m2.metric("Swaps", ops["swaps"])
+            m3.metric("Writes", ops["writes"])
+            m4.metric("Status", f"done at {len(trace) - 1}" if done else "running")
+            with prof.stage("colors"):
+                codes = _colors_for_frame(frame[0], name, frame)
+            with prof.stage("figure"):
+                fig = figs[name].update(frame[0], highlight=frame[1], title=name, codes=codes)
+            with prof.stage("plotly_chart"):
+                st.plotly_chart(fig, use_container_width=True, key=f"race_{name}")
+
+    st.session_state.race_scrub = step
+    st.slider("Scrub", min_value=0, max_value=max(1, total - 1), key="race_scrub", on_change=_on_race_scrub,
+              disabled=total < 2, help="Jump every algorithm to the same step")
+    prof.note(view="race", step=step, racers=len(traces), n=len(st.session_state.data))
+
+    if st.session_state.playing and not finished:
+        settings = ("race", pacing, int(speed_ms), float(duration_s), int(max_fps))
+        if st.session_state.clock is None or st.session_state.clock[0] != settings:
+            clock = PlaybackClock(total, start_step=step, fps=max_fps,
+                                  step_ms=speed_ms if pacing == "Speed per step" else None,
+                                  duration_s=duration_s if pacing == "Fixed duration" else None)
+            st.session_state.clock = (settings, clock)
+        clock = st.session_state.clock[1]
+        with prof.stage("sleep"):
+            time.sleep(clock.wait())
+        st.session_state.play_from = step
+        st.session_state.race_step = clock.step_at(step)
+        st.rerun()
+    elif st.session_state.playing:
+        st.session_state.playing = False
+    if finished:
+        st.success(f"Done! Finishing order: {', '.join(sorted(traces, key=lambda n: len(traces[n])))}.")
+    st.stop()
+
+if playback == LIVE:
+    # Frames come from a worker thread; nothing is recorded, so playback only moves forward.
+    if st.session_state.data is None:
+        fig = make_bar_figure(_make_data(size, seed), title=f"{st.session_state.algo} — Ready")
+        st.plotly_chart(fig, use_container_width=True)
+        st.info("Click **Start / Regenerate Data** to create a dataset and enable playback.")
+        st.stop()
+    if reset_btn or stop_btn:
+        _live_cancel()
+        st.session_state.playing = False
+    live = st.session_state.live
+    if live is not None and live["key"] != (st.session_state.algo, st.session_state.data_digest):
+        _live_cancel()
+        live = None
+    if live is None:
+        live = st.session_state.live = _live_start()
+    producer = live["producer"]
+    if producer.error is not None:
+        st.error(f"Algorithm failed: {producer.error!r}")
+    if play_pause:
+        st.session_state.playing = not st.session_state.playing
+    if back_btn:
+        st.warning("Live playback only moves forward; use Server playback to step back.")
+    if step_btn:
+        with prof.stage("next"):
+            _live_consume(live, producer.take(1, timeout=1.0))
+        st.session_state.playing = False
+    if not st.session_state.playing:
+        st.session_state.clock = None
+    finished = producer.exhausted
+
+    _hud_header(max(0, live["step"]), live["meta"])
+    _ops_metrics(live["ops"])
+    d1, d2, d3, d4 = st.columns(4)
+    d1.metric("Buffer depth", f"{producer.depth} / {producer.capacity}")
+    d2.metric("Producer lag", f"{live['lag']} frames", help="Frames that were due at the last tick but not produced yet")
+    d3.metric("Produced", producer.produced)
+    d4.metric("Producer", "done" if producer.done else "running")
+    _stage_hud()
+
+    values = live["values"]
+    frame = (values, live["highlight"], live["swapped"], live["meta"])
+    if live["merged"] > 1:
+        label = f"Step {live['step']} — {live['merged']} merged"
+    else:
+        label = f"Step {max(0, live['step'])} — {'Swap' if live['swapped'] else 'Compare' if live['highlight'] is not None else '...' }"
+    with prof.stage("colors"):
+        codes = _colors_for_frame(values, st.session_state.algo, frame)
+    with prof.stage("figure"):
+        if st.session_state.bar_fig is None or st.session_state.bar_fig[0] != st.session_state.data_digest:
+            st.session_state.bar_fig = (st.session_state.data_digest, BarFigure(st.session_state.data))
+        fig = st.session_state.bar_fig[1].update(values, highlight=live["highlight"],
+                                                 title=f"{st.session_state.algo}: {label}", codes=codes)
+    with prof.stage("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(label)
+    prof.note(view="live", step=live["step"], algorithm=st.session_state.algo, n=len(values))
+
+    if st.session_state.playing and not finished:
+        settings = (st.session_state.algo, int(speed_ms), int(max_fps))
+        if st.session_state.clock is None or st.session_state.clock[0] != settings:
+            # Total length is unknown while streaming, so pacing is always per step.
+            clock = PlaybackClock(None, start_step=live["step"], fps=max_fps, step_ms=speed_ms)
+            st.session_state.clock = (settings, clock)
+        clock = st.session_state.clock[1]
+        with prof.stage("sleep"):
+            time.sleep(clock.wait())
+        due = clock.step_at(live["step"]) - live["step"]
+        with prof.stage("next"):
+            frames = producer.take(due, timeout=0.05)
+            live["lag"] = 0 if producer.done else due - len(frames)
+            _live_consume(live, frames)
+        st.rerun()
+    elif st.session_state.playing:
+        st.session_state.playing = False
+    if finished:
+        st.success(f"Done! Sorted {len(st.session_state.data)} values in {live['step']} visual steps.")
+    st.stop()
+
+_live_cancel()  # left live mode
+
+with prof.stage("trace"):
+    trace = _get_trace()
+if trace is not None:
+    info = {"algorithm": st.session_state.algo, "n": trace.n}
+    export_slot.download_button("Export trace (.avt)", data=lambda: trace_store.dumps_trace(trace, info),
+                                file_name=trace_store.trace_filename((st.session_state.algo, trace.n)),
+                                mime="application/octet-stream", on_click="ignore")
+finished = trace is not None and st.session_state.step >= len(trace) - 1
+
 if reset_btn:
-    if st.session_state.data is not None:
-        st.session_state.gen = _make_generator(st.session_state.algo, st.session_state.data)
-        _prime_generator()
+    if trace is not None:
+        st.session_state.step = 0
         st.session_state.playing = False
         st.toast("Reset to start.")
     else:
@@ -164,64 +469,102 @@ if stop_btn:
     st.session_state.playing = False
 
 if play_pause:
-    if st.session_state.current is None and st.session_state.data is None:
+    if trace is None:
         st.warning("Click Start to generate data first.")
     else:
+        if finished and not st.session_state.playing:
+            st.session_state.step = 0
         st.session_state.playing = not st.session_state.playing
 
-if step_btn:
-    if st.session_state.current is None:
-        if st.session_state.data is None:
-            st.warning("Click Start to generate data first.")
-        else:
-            st.session_state.gen = _make_generator(st.session_state.algo, st.session_state.data)
-            _prime_generator()
+if step_btn or back_btn:
+    if trace is None:
+        st.warning("Click Start to generate data first.")
     else:
-        _advance_once()
+        _seek(trace, st.session_state.step + (1 if step_btn else -1))
     st.session_state.playing = False
 
+if not st.session_state.playing:
+    st.session_state.clock = None
+    st.session_state.play_from = None
+
+if trace is not None:
+    _seek(trace, st.session_state.step)
+    finished = st.session_state.step >= len(trace) - 1
+    ops = _trace_ops(trace, st.session_state.step)
+    hud_meta = trace.meta_at(st.session_state.step)
+else:
+    ops = dict.fromkeys(OPS_FIELDS, 0)
+    hud_meta = {}
+
 # --- HUD (Stats) ---
 hud = st.container()
 with hud:
-    c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Algorithm", st.session_state.algo)
-    c2.metric("Step", st.session_state.step)
-    c3.metric("Comparisons", st.session_state.cmp_count)
-    c4.metric("Writes/Swaps", st.session_state.swap_count)
+    _hud_header(st.session_state.step, hud_meta)
+    _ops_metrics(ops)
+    _stage_hud()
 
 # --- Render ---
-if st.session_state.data is None:
+if trace is None:
     preview = _make_data(size, seed)
-    fig = make_bar_figure(preview, title=f"{st.session_state.algo} — Ready")
-    st.plotly_chart(fig, use_container_width=True)
+    with prof.stage("figure"):
+        fig = make_bar_figure(preview, title=f"{st.session_state.algo} — Ready")
+    with prof.stage("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
     st.info("Click **Start / Regenerate Data** to create a dataset and enable playback.")
+elif playback == "Browser (animation)":
+    st.session_state.playing = False
+    with prof.stage("figure"):  # frames, colors included
+        fig = _bar_animation(("sort", st.session_state.algo, st.session_state.data_digest),
+                             int(payload_mb * 1024 * 1024), int(speed_ms), trace)
+    with prof.stage("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(fig.frames)} of {len(trace)} steps packed for in-browser playback.")
 else:
-    if st.session_state.gen is None:
-        st.session_state.gen = _make_generator(st.session_state.algo, st.session_state.data)
-        _prime_generator()
-
-    frame = st.session_state.current
-    # Normalize frame to 4-tuple-like
-    if frame is not None and len(frame) == 3:
-        values, highlight, swapped = frame
-        meta = {}
-    elif frame is not None and len(frame) >= 4:
-        values, highlight, swapped, meta = frame[0], frame[1], frame[2], frame[3]
-    else:
-        values, highlight, swapped, meta = st.session_state.data, None, False, {}
-
-    overrides = _colors_for_frame(values, st.session_state.algo, frame)
-    label = f"Step {st.session_state.step} — {'Swap' if swapped else 'Compare' if highlight is not None else '...' }"
-
-    fig = make_bar_figure(values, highlight=highlight, title=f"{st.session_state.algo}: {label}", colors_override=overrides)
-    st.plotly_chart(fig, use_container_width=True)
+    step = st.session_state.step
+    play_from = st.session_state.play_from
+    with prof.stage("next"):
+        if play_from is not None and play_from < step - 1:
+            # Playback skipped steps: show them merged into one frame
+            _, highlight, swapped, meta = trace.span(play_from, step)
+            frame = (trace.values_at(step).tolist(), highlight, swapped, meta)
+            label = f"Steps {play_from + 1}–{step} — {step - play_from} merged"
+        else:
+            frame = trace.frame(step)
+            label = f"Step {step} — {'Swap' if frame[2] else 'Compare' if frame[1] is not None else '...' }"
+    values, highlight, swapped, meta = frame
+
+    with prof.stage("colors"):
+        codes = _colors_for_frame(values, st.session_state.algo, frame)
+
+    with prof.stage("figure"):
+        if st.session_state.bar_fig is None or st.session_state.bar_fig[0] != st.session_state.data_digest:
+            st.session_state.bar_fig = (st.session_state.data_digest, BarFigure(st.session_state.data))
+        fig = st.session_state.bar_fig[1].update(values, highlight=highlight, title=f"{st.session_state.algo}: {label}",
+                                                 codes=codes)
+    with prof.stage("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
     st.caption(label)
 
-    if st.session_state.playing and not st.session_state.finished:
-        delay = max(10, int(speed_ms)) / 1000.0
-        time.sleep(delay)
-        _advance_once()
+    prof.note(view="server", step=step, algorithm=st.session_state.algo, n=len(values))
+    st.session_state.scrub = st.session_state.step
+    st.slider("Scrub", min_value=0, max_value=max(1, len(trace) - 1), key="scrub", on_change=_on_scrub,
+              disabled=len(trace) < 2, help="Jump to any recorded step")
+
+    if st.session_state.playing and not finished:
+        settings = (st.session_state.algo, pacing, int(speed_ms), float(duration_s), int(max_fps))
+        if st.session_state.clock is None or st.session_state.clock[0] != settings:
+            clock = PlaybackClock(len(trace), start_step=st.session_state.step, fps=max_fps,
+                                  step_ms=speed_ms if pacing == "Speed per step" else None,
+                                  duration_s=duration_s if pacing == "Fixed duration" else None)
+            st.session_state.clock = (settings, clock)
+        clock = st.session_state.clock[1]
+        with prof.stage("sleep"):
+            time.sleep(clock.wait())
+        st.session_state.play_from = st.session_state.step
+        _seek(trace, clock.step_at(st.session_state.step))
         st.rerun()
+    elif st.session_state.playing:
+        st.session_state.playing = False
 
-    if st.session_state.finished:
+    if finished:
         st.success(f"Done! Sorted {len(st.session_state.data)} values in {st.session_state.step} visual steps.")
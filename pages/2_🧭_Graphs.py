@@ -1,167 +1,514 @@
 import time
 import streamlit as st
 
-from algoviz.components.graph_canvas import make_graph_figure
-from algoviz.algorithms.graphs.utils import build_grid_graph
-from algoviz.algorithms.graphs.bfs import bfs
-from algoviz.algorithms.graphs.dfs import dfs
-from algoviz.algorithms.graphs.dijkstra import dijkstra
+from algoviz.registry import REGISTRY, lazy, load
+from algoviz.profiling import DEFAULT_ENABLED as PROFILE_DEFAULT, StageProfiler
+from algoviz.sessions import current_session_id, track_page
+from algoviz.trace.playback import PlaybackClock
+from algoviz.trace.producer import TraceProducer
+
+# numpy, plotly and the algorithm modules load on first use, after the header and sidebar have painted
+make_graph_animation = REGISTRY.ref("renderers", "make_graph_animation")
+GraphFigure = REGISTRY.ref("renderers", "GraphFigure")
+make_graph_figure = REGISTRY.ref("renderers", "make_graph_figure")
+build_topology = lazy("algoviz.algorithms.graphs.utils:build_topology")
+get_trace_cache = lazy("algoviz.trace.cache:get_trace_cache")
+GraphTrace = lazy("algoviz.trace.graph:GraphTrace")
+graph_signature = lazy("algoviz.trace.graph:graph_signature")
+trace_store = lazy("algoviz.trace.store")
 
 st.set_page_config(page_title="Graph Algorithms", page_icon="🧭", layout="wide")
 
+MAX_RANDOM_NODES = 5000  # k-nearest construction compares every pair of points
+LIVE = "Live (background producer)"
+HEAVY_KEYS = ("g_graph", "g_fig", "g_live")  # dropped when the session is compacted, rebuilt by _resume()
+
 st.title("🧭 Graph Algorithms")
-st.caption("BFS, DFS, and Dijkstra on a grid graph with playback controls and a stats HUD.")
+st.caption("BFS, DFS, Dijkstra and A* on grids, mazes or random graphs with playback controls and a stats HUD.")
 
 def _init_state():
     if "g_algo" not in st.session_state:
         st.session_state.g_algo = "BFS"
-    if "g_positions" not in st.session_state:
-        st.session_state.g_positions = None
-    if "g_edges" not in st.session_state:
-        st.session_state.g_edges = None
-    if "g_neighbors" not in st.session_state:
-        st.session_state.g_neighbors = None
-    if "g_gen" not in st.session_state:
-        st.session_state.g_gen = None
-    if "g_current" not in st.session_state:
-        st.session_state.g_current = None  # (positions, edges, node_colors, edge_colors, meta)
+    if "g_graph" not in st.session_state:
+        st.session_state.g_graph = None  # CSRGraph (node ids 0..N-1, weights None for unit weights)
+    if "g_signature" not in st.session_state:
+        st.session_state.g_signature = None  # traces live in the shared cache, keyed by (algo, signature, start, goal)
+    if "g_build" not in st.session_state:
+        st.session_state.g_build = None  # build_topology() arguments of the graph; None for imported graphs
+    if "g_endpoints" not in st.session_state:
+        st.session_state.g_endpoints = None  # (start, goal) used for the current trace
+    if "g_sources" not in st.session_state:
+        st.session_state.g_sources = ()  # extra seeds for seeded algorithms (multi-source BFS)
+    if "g_fig" not in st.session_state:
+        st.session_state.g_fig = None  # (signature, GraphFigure, last rendered (trace key, step))
     if "g_playing" not in st.session_state:
         st.session_state.g_playing = False
     if "g_step" not in st.session_state:
         st.session_state.g_step = 0
-    if "g_finished" not in st.session_state:
-        st.session_state.g_finished = False
+    if "g_clock" not in st.session_state:
+        st.session_state.g_clock = None  # (pacing settings, PlaybackClock) while playing
+    if "g_live" not in st.session_state:
+        st.session_state.g_live = None  # live playback state: producer thread plus its own figure
+    if "g_profiler" not in st.session_state:
+        st.session_state.g_profiler = StageProfiler("graphs", current_session_id())  # opt-in render stage timers
+
+def _live_cancel():
+    if st.session_state.get("g_live") is not None:
+        st.session_state.g_live["producer"].cancel()
+        st.session_state.g_live = None
+
+def _on_algo_change():
+    st.session_state.g_step = 0
+    st.session_state.g_playing = False
+    _live_cancel()
+
+def _seeded(name):
+    return "seeds" in REGISTRY.algorithm("graphs", name).meta
+
+def _run_key(name):
+    """Trace cache key: algorithm, graph and endpoints, plus the extra seeds for seeded algorithms."""
+    key = ("graph", name, st.session_state.g_signature) + tuple(st.session_state.g_endpoints)
+    if _seeded(name) and st.session_state.g_sources:
+        key += st.session_state.g_sources
+    return key
+
+def _parse_seeds(text, n):
+    """Distinct node ids from a comma-separated list, plus the entries that are not ids of this graph."""
+    seeds, bad = [], []
+    for part in text.replace(" ", "").split(","):
+        if part.isdigit() and int(part) < n:
+            seeds.append(int(part))
+        elif part:
+            bad.append(part)
+    return tuple(dict.fromkeys(seeds)), bad
 
+def _on_import():
+    # Adopt an exported .avt trace: its graph and endpoints become current and the trace goes into the cache
+    upload = st.session_state.g_trace_upload
+    if upload is None:
+        return
+    try:
+        stored = trace_store.loads_trace(upload.getvalue())
+        if stored.graph is None:
+            raise ValueError("this is not a graph trace; sorting traces go on the Sorting page")
+        label = REGISTRY.algorithm("graphs", stored.info.get("algorithm", "")).label
+    except (KeyError, ValueError) as e:
+        st.error(f"Could not import trace: {e}")
+        return
+    _live_cancel()
+    st.session_state.g_graph = stored.graph
+    st.session_state.g_signature = graph_signature(stored.graph)
+    st.session_state.g_build = None
+    st.session_state.g_endpoints = (int(stored.info.get("start", 0)), int(stored.info.get("goal", 0)))
+    st.session_state.g_sources = tuple(int(v) for v in stored.info.get("sources", ()))
+    st.session_state.g_algo = label
+    st.session_state.g_step = 0
+    st.session_state.g_playing = False
+    get_trace_cache().put(_run_key(label), stored.trace)
+
+resumed = track_page("graphs", HEAVY_KEYS)
 _init_state()
+prof = st.session_state.g_profiler
+prof.tick()  # the previous run, including its playback sleep, is one sample
 
 with st.sidebar:
     st.header("Graph Controls")
     cols_rc = st.columns(2)
-    rows = cols_rc[0].number_input("Rows", min_value=3, max_value=20, value=6, step=1)
-    cols = cols_rc[1].number_input("Cols", min_value=3, max_value=30, value=8, step=1)
+    rows = cols_rc[0].number_input("Rows", min_value=3, max_value=500, value=6, step=1)
+    cols = cols_rc[1].number_input("Cols", min_value=3, max_value=500, value=8, step=1)
+
+    topology = st.selectbox("Graph", load("algoviz.algorithms.graphs.utils:TOPOLOGIES"), index=0,
+                            help="Weighted grid: random weights 1-9. 8-connected: diagonal steps cost √2 "
+                                 "(use A* (Euclidean); Manhattan overestimates). Obstacles: blocked cells are drawn dark. "
+                                 "Mazes: spanning trees of the grid, so every cell is reachable. "
+                                 "Random geometric: Rows×Cols points joined within a radius (about 6 neighbors each); "
+                                 "k-nearest: joined to their 4 nearest. Both are weighted by length.")
+    graph_seed = st.number_input("Graph seed", min_value=0, max_value=10_000, value=0, step=1,
+                                 disabled=topology in ("Grid", "Grid (8-connected)"))
+    density = st.slider("Obstacle density", min_value=0.0, max_value=0.6, value=0.25, step=0.05,
+                        disabled=topology != "Grid with obstacles")
 
-    g_algo = st.selectbox("Algorithm", ["BFS", "DFS", "Dijkstra"], index=0, key="g_algo")
+    g_algo = st.selectbox("Algorithm", REGISTRY.labels("graphs"), index=0,
+                          key="g_algo", on_change=_on_algo_change)
 
     # Start & goal nodes by index (row-major id = r*cols + c)
     start = st.number_input("Start node id", min_value=0, max_value=rows*cols-1, value=0, step=1)
     goal = st.number_input("Goal node id", min_value=0, max_value=rows*cols-1, value=rows*cols-1, step=1)
+    seeds_text = st.text_input("Extra seeds", value="", placeholder="e.g. 10, 25, 40", disabled=not _seeded(g_algo),
+                               help="Comma-separated node ids; multi-source BFS grows from Start, Goal and these. "
+                                    "Applied on Build or Reset.")
 
-    cols_btn = st.columns(4)
+    cols_btn = st.columns(5)
     play_pause = cols_btn[0].button("▶/⏸", help="Play/Pause")
-    step_btn   = cols_btn[1].button("⏭ Step", help="Advance one step and pause")
-    reset_btn  = cols_btn[2].button("🔁 Reset", help="Reset to start state")
-    stop_btn   = cols_btn[3].button("⏹ Stop", help="Stop playback")
+    back_btn   = cols_btn[1].button("⏮", help="Step back one frame and pause")
+    step_btn   = cols_btn[2].button("⏭", help="Advance one step and pause")
+    reset_btn  = cols_btn[3].button("🔁", help="Reset to start state")
+    stop_btn   = cols_btn[4].button("⏹", help="Stop playback")
 
     start_btn = st.button("🎬 Build Graph & Start", use_container_width=True)
 
-def _make_generator(name, positions, edges, neighbors, s, g):
-    if name == "BFS":
-        return bfs(positions, edges, neighbors, s, g)
-    if name == "DFS":
-        return dfs(positions, edges, neighbors, s, g)
-    if name == "Dijkstra":
-        return dijkstra(positions, edges, neighbors, s, g)
-    raise ValueError("Unknown algorithm.")
+    pacing = st.radio("Pacing", ["Speed per step", "Fixed duration"], index=0, horizontal=True,
+                      help="Fixed duration plays the whole traversal in the given time, skipping steps as needed.")
+    speed_ms = st.slider("Speed (ms per step)", min_value=10, max_value=500, value=80, step=10,
+                         disabled=pacing != "Speed per step")
+    duration_s = st.number_input("Run duration (s)", min_value=1.0, max_value=600.0, value=10.0, step=1.0,
+                                 disabled=pacing != "Fixed duration")
+    max_fps = st.slider("Max frame rate (FPS)", min_value=1, max_value=60, value=20, step=1,
+                        help="Steps due between two rendered frames are merged into one; counters stay exact.")
 
-def _prime_generator():
-    try:
-        st.session_state.g_current = next(st.session_state.g_gen)
-        st.session_state.g_step = 0
-        st.session_state.g_finished = False
-    except StopIteration:
-        st.session_state.g_current = None
-        st.session_state.g_finished = True
+    playback = st.radio("Playback", ["Server (step-by-step)", "Browser (animation)", LIVE], index=0,
+                        help="Browser mode ships the whole trace as Plotly frames and animates locally. "
+                             "Live mode runs the algorithm on a worker thread and plays frames as they arrive.")
+    buffer_frames = st.number_input("Live buffer (frames)", min_value=64, max_value=65536, value=4096, step=64,
+                                    disabled=playback != LIVE)
+    payload_mb = st.number_input("Animation payload budget (MB)", min_value=0.5, max_value=50.0,
+                                 value=load("algoviz.components.animation:DEFAULT_MAX_PAYLOAD") / (1024 * 1024), step=0.5,
+                                 disabled=playback != "Browser (animation)")
 
-def _advance_once():
-    if st.session_state.g_gen is None or st.session_state.g_finished:
+    with st.expander("Trace cache"):
+        st.json(get_trace_cache().stats())
+    with st.expander("Trace file"):
+        st.file_uploader("Import trace (.avt)", type=["avt"], key="g_trace_upload", on_change=_on_import)
+        export_slot = st.empty()
+    with st.expander("Profiling"):
+        prof.enabled = st.checkbox("Time render stages", value=PROFILE_DEFAULT, key="g_profile",
+                                   help="Rolling p50/p95 per stage in a HUD panel; ALGOVIZ_PROFILE_LOG also appends "
+                                        "every run to a JSON-lines file")
+        if st.button("Reset timings"):
+            prof.reset()
+        st.download_button("Export timings (JSON)", data=prof.to_json, file_name="graphs-stage-timings.json",
+                           mime="application/json", on_click="ignore", disabled=not prof.samples)
+
+def _make_generator(name, graph, s, g):
+    """Delta frames (node color changes, edge_colors, meta) for the chosen algorithm on a CSRGraph."""
+    if _seeded(name):
+        return REGISTRY.algorithm("graphs", name).make_deltas(graph, start=s, goal=g,
+                                                              sources=(s, g) + st.session_state.g_sources)
+    return REGISTRY.algorithm("graphs", name).make_deltas(graph, start=s, goal=g)
+
+def _apply_seeds(n):
+    seeds, bad = _parse_seeds(seeds_text, n)
+    st.session_state.g_sources = seeds
+    if bad:
+        st.warning(f"Ignored seeds that are not node ids of this graph: {', '.join(bad)}")
+
+def _get_trace(name=None):
+    """Recorded trace for the current graph, algorithm and endpoints, shared across sessions via the trace cache."""
+    graph = st.session_state.g_graph
+    if graph is None:
+        return None
+    name = name or st.session_state.g_algo
+    s, g = st.session_state.g_endpoints
+    key = _run_key(name)
+
+    def compute():
+        # A precomputed file is memory-mapped; otherwise record it
+        stored = trace_store.get_trace_store().load(key)
+        if stored is not None:
+            return stored.trace
+        return GraphTrace.record_deltas(range(graph.num_nodes), _make_generator(name, graph, s, g))
+
+    return get_trace_cache().get_or_compute(key, compute)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _graph_animation(key, max_bytes, frame_ms, _graph, _trace):
+    """Browser-playback figure of one trace (key from _run_key), built once per payload budget and speed."""
+    return make_graph_animation(_graph, None, _trace, key[1], max_bytes=max_bytes, frame_ms=frame_ms)
+
+def _render_frame(trace, title):
+    """Patch the cached figure: only the net color changes when moving forward a little, else the step's full codes."""
+    sig = st.session_state.g_signature
+    if st.session_state.g_fig is None or st.session_state.g_fig[0] != sig:
+        st.session_state.g_fig = (sig, GraphFigure(st.session_state.g_graph), None)
+    _, gfig, last = st.session_state.g_fig
+    step = st.session_state.g_step
+    here = _run_key(st.session_state.g_algo)
+    if last is not None and last[0] == here and last[1] < step and trace.change_count(last[1], step) <= len(gfig.node_ids) // 4:
+        with prof.stage("colors"):
+            changes = trace.changes_between(last[1], step)
+        with prof.stage("figure"):
+            fig = gfig.apply_changes(changes, title=title)
+    elif last is not None and last[0] == here and last[1] == step:
+        with prof.stage("figure"):
+            fig = gfig.apply_changes({}, title=title)
+    else:
+        with prof.stage("colors"):
+            codes = trace.codes_at(step)
+        with prof.stage("figure"):
+            fig = gfig.set_codes(codes, trace.palette, title=title)
+    st.session_state.g_fig = (sig, gfig, (here, step))
+    return fig
+
+def _stage_hud():
+    # Rolling latency per render stage; the current run is added once it is over
+    if prof.enabled:
+        with st.expander(f"⏱ Stage latency (last {prof.window} runs)"):
+            st.dataframe(prof.summary(), use_container_width=True, hide_index=True)
+
+def _seek(trace, step):
+    st.session_state.g_step = max(0, min(int(step), len(trace) - 1))
+
+def _on_scrub():
+    st.session_state.g_step = int(st.session_state.g_scrub)
+    st.session_state.g_playing = False
+
+def _resume():
+    """Rebuild the graph of a compacted session from its build arguments, else from a precomputed trace file."""
+    if st.session_state.g_signature is None:
         return
-    try:
-        st.session_state.g_current = next(st.session_state.g_gen)
-        st.session_state.g_step += 1
-    except StopIteration:
-        st.session_state.g_finished = True
-        st.session_state.g_playing = False
+    graph = None
+    if st.session_state.g_build is not None:
+        graph = build_topology(*st.session_state.g_build[:3], seed=st.session_state.g_build[3],
+                               density=st.session_state.g_build[4])
+    else:
+        stored = trace_store.get_trace_store().load(_run_key(st.session_state.g_algo))
+        graph = stored.graph if stored is not None else None
+    if graph is not None and graph_signature(graph) == st.session_state.g_signature:
+        st.session_state.g_graph = graph
+        st.toast("Session restored.")
+    else:
+        st.session_state.g_signature = None
+        st.session_state.g_step = 0
+        st.info("This session was idle and its imported graph was released; import it again or click Build Graph & Start.")
 
-if start_btn:
-    pos, edg, nbr = build_grid_graph(int(rows), int(cols))
-    st.session_state.g_positions = pos
-    st.session_state.g_edges = edg
-    st.session_state.g_neighbors = nbr
+if resumed:
+    _resume()
 
-    st.session_state.g_gen = _make_generator(st.session_state.g_algo, pos, edg, nbr, int(start), int(goal))
-    _prime_generator()
+if start_btn and topology == "Random (k-nearest)" and rows * cols > MAX_RANDOM_NODES:
+    st.warning(f"Random graphs are limited to {MAX_RANDOM_NODES:,} nodes; lower Rows × Cols.")
+elif start_btn:
+    _live_cancel()
+    st.session_state.g_build = (topology, int(rows), int(cols), int(graph_seed), float(density))
+    graph = build_topology(*st.session_state.g_build[:3], seed=int(graph_seed), density=float(density))
+    st.session_state.g_graph = graph
+    st.session_state.g_signature = graph_signature(graph)
+    st.session_state.g_endpoints = (int(start), int(goal))
+    _apply_seeds(graph.num_nodes)
+    st.session_state.g_step = 0
     st.session_state.g_playing = False
     st.toast("Graph built. Ready to play.")
 
 if reset_btn:
-    if st.session_state.g_positions is not None:
-        st.session_state.g_gen = _make_generator(st.session_state.g_algo, st.session_state.g_positions, st.session_state.g_edges, st.session_state.g_neighbors, int(start), int(goal))
-        _prime_generator()
+    if st.session_state.g_graph is not None:
+        st.session_state.g_endpoints = (int(start), int(goal))
+        _apply_seeds(st.session_state.g_graph.num_nodes)
+        st.session_state.g_step = 0
         st.session_state.g_playing = False
         st.toast("Reset to start.")
     else:
         st.warning("Nothing to reset. Click Build Graph & Start first.")
 
+def _live_consume(live, frames):
+    """Apply consumed delta frames; several frames in one tick become one net color patch."""
+    merged = {}
+    for changes, _, meta in frames:
+        merged.update(changes)
+        live["step"] += 1
+        live["meta"] = meta
+    live["merged"] = len(frames)
+    if merged:
+        live["fig"].apply_changes(merged)
+
+def _live_start():
+    graph = st.session_state.g_graph
+    s, g = st.session_state.g_endpoints
+    producer = TraceProducer(_make_generator(st.session_state.g_algo, graph, s, g), capacity=int(buffer_frames))
+    live = {"key": _run_key(st.session_state.g_algo), "producer": producer,
+            "fig": GraphFigure(graph), "step": -1, "meta": {}, "merged": 0, "lag": 0}
+    _live_consume(live, producer.take(1, timeout=1.0))
+    return live
+
+if playback == LIVE and st.session_state.g_graph is not None:
+    # Frames come from a worker thread; nothing is recorded, so playback only moves forward.
+    if reset_btn or stop_btn:
+        _live_cancel()
+        st.session_state.g_playing = False
+    live = st.session_state.g_live
+    if live is not None and live["key"] != _run_key(st.session_state.g_algo):
+        _live_cancel()
+        live = None
+    if live is None:
+        live = st.session_state.g_live = _live_start()
+    producer = live["producer"]
+    if producer.error is not None:
+        st.error(f"Algorithm failed: {producer.error!r}")
+    if play_pause:
+        st.session_state.g_playing = not st.session_state.g_playing
+    if back_btn:
+        st.warning("Live playback only moves forward; use Server playback to step back.")
+    if step_btn:
+        with prof.stage("next"):
+            frames = producer.take(1, timeout=1.0)
+        with prof.stage("figure"):
+            _live_consume(live, frames)
+        st.session_state.g_playing = False
+    if not st.session_state.g_playing:
+        st.session_state.g_clock = None
+    finished = producer.exhausted
+    meta = live["meta"]
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Algorithm", st.session_state.g_algo)
+    c2.metric("Step", max(0, live["step"]))
+    c3.metric("Visited", meta.get("visited", 0))
+    c4.metric("Found", "yes" if meta.get("found") else "no")
+    d1, d2, d3, d4 = st.columns(4)
+    d1.metric("Buffer depth", f"{producer.depth} / {producer.capacity}")
+    d2.metric("Producer lag", f"{live['lag']} frames", help="Frames that were due at the last tick but not produced yet")
+    d3.metric("Produced", producer.produced)
+    d4.metric("Producer", "done" if producer.done else "running")
+    _stage_hud()
+
+    title = f"{st.session_state.g_algo}: Step {max(0, live['step'])}" + (" — FOUND!" if meta.get("found") else "")
+    if live["merged"] > 1:
+        title += f" ({live['merged']} merged)"
+    with prof.stage("figure"):
+        fig = live["fig"].apply_changes({}, title=title)
+    with prof.stage("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    prof.note(view="live", step=live["step"], algorithm=st.session_state.g_algo, nodes=len(live["fig"].node_ids))
+
+    if st.session_state.g_playing and not finished:
+        settings = (st.session_state.g_algo, int(speed_ms), int(max_fps))
+        if st.session_state.g_clock is None or st.session_state.g_clock[0] != settings:
+            # Total length is unknown while streaming, so pacing is always per step.
+            clock = PlaybackClock(None, start_step=live["step"], fps=max_fps, step_ms=speed_ms)
+            st.session_state.g_clock = (settings, clock)
+        clock = st.session_state.g_clock[1]
+        with prof.stage("sleep"):
+            time.sleep(clock.wait())
+        due = clock.step_at(live["step"]) - live["step"]
+        with prof.stage("next"):
+            frames = producer.take(due, timeout=0.05)
+        live["lag"] = 0 if producer.done else due - len(frames)
+        with prof.stage("figure"):
+            _live_consume(live, frames)
+        st.rerun()
+    elif st.session_state.g_playing:
+        st.session_state.g_playing = False
+    if finished:
+        if meta.get("found"):
+            st.success("Target reached! Path highlighted in yellow.")
+        else:
+            st.info("Traversal complete.")
+    st.stop()
+
+_live_cancel()  # left live mode
+with prof.stage("trace"):
+    trace = _get_trace()
+if trace is not None:
+    # The payload is built on click, on a separate thread, so it binds the graph rather than reading session state
+    s, g = st.session_state.g_endpoints
+    info = {"algorithm": st.session_state.g_algo, "start": s, "goal": g}
+    if _seeded(st.session_state.g_algo):
+        info["sources"] = list(st.session_state.g_sources)
+    export = (trace, info, st.session_state.g_graph)
+    export_slot.download_button("Export trace (.avt)", data=lambda: trace_store.dumps_trace(*export),
+                                file_name=trace_store.trace_filename((st.session_state.g_algo, len(export[2].positions), s, g)),
+                                mime="application/octet-stream", on_click="ignore")
+
 if stop_btn:
     st.session_state.g_playing = False
 
 if play_pause:
-    if st.session_state.g_current is None and st.session_state.g_positions is None:
+    if trace is None:
         st.warning("Click Build Graph & Start first.")
     else:
+        if st.session_state.g_step >= len(trace) - 1 and not st.session_state.g_playing:
+            st.session_state.g_step = 0
         st.session_state.g_playing = not st.session_state.g_playing
 
-if step_btn:
-    if st.session_state.g_current is None:
-        if st.session_state.g_positions is None:
-            st.warning("Click Build Graph & Start first.")
-        else:
-            st.session_state.g_gen = _make_generator(st.session_state.g_algo, st.session_state.g_positions, st.session_state.g_edges, st.session_state.g_neighbors, int(start), int(goal))
-            _prime_generator()
+if step_btn or back_btn:
+    if trace is None:
+        st.warning("Click Build Graph & Start first.")
     else:
-        _advance_once()
+        _seek(trace, st.session_state.g_step + (1 if step_btn else -1))
     st.session_state.g_playing = False
 
+if not st.session_state.g_playing:
+    st.session_state.g_clock = None
+
+current = None
+finished = False
+if trace is not None:
+    _seek(trace, st.session_state.g_step)
+    finished = st.session_state.g_step >= len(trace) - 1
+    with prof.stage("next"):
+        current = trace.meta_at(st.session_state.g_step)  # colors are painted from trace codes in _render_frame
+
 # HUD
 hud = st.container()
 with hud:
-    c1, c2, c3 = st.columns(3)
+    c1, c2, c3, c4 = st.columns(4)
     c1.metric("Algorithm", st.session_state.g_algo)
     c2.metric("Step", st.session_state.g_step)
-    # show a third metric based on algorithm
-    if st.session_state.g_current and len(st.session_state.g_current) >= 5:
-        meta = st.session_state.g_current[4]
-        if st.session_state.g_algo == "BFS":
-            c3.metric("Visited / Frontier", f"{meta.get('visited', 0)} / {meta.get('frontier', 0)}")
-        elif st.session_state.g_algo == "DFS":
-            c3.metric("Visited / Stack", f"{meta.get('visited', 0)} / {meta.get('stack', 0)}")
-        else:
-            c3.metric("Visited / Queue", f"{meta.get('visited', 0)} / {meta.get('queue', 0)}")
+    # metrics declared by the algorithm's spec; finished runs are compared with its baseline, if any
+    if current is not None:
+        meta = current
+        spec = REGISTRY.algorithm("graphs", st.session_state.g_algo)
+        shown = spec.hud_values(meta)
+        for i, (col, (label, value)) in enumerate(zip((c3, c4), shown)):
+            delta = None
+            if spec.baseline is not None and finished and i == len(shown) - 1:
+                ref_spec = REGISTRY.algorithm("graphs", spec.baseline)
+                ref = _get_trace(ref_spec.label)
+                ref_meta = ref.meta_at(len(ref) - 1)
+                delta = f"{meta.get('visited', 0) - ref_meta.get('visited', 0):+d} expanded"
+                if "heap_ops" in meta:
+                    delta += f", {meta['heap_ops'] - ref_meta.get('heap_ops', 0):+d} ops"
+                delta += f" vs {ref_spec.label}"
+            col.metric(label, value, delta=delta, delta_color="inverse")
     else:
         c3.metric("Status", "Idle")
+    _stage_hud()
 
 # Render
-if st.session_state.g_positions is None:
+if st.session_state.g_graph is None:
     st.info("Set **Rows/Cols**, choose an **algorithm**, then click **Build Graph & Start**.")
 else:
-    if st.session_state.g_current is None:
-        fig = make_graph_figure(st.session_state.g_positions, st.session_state.g_edges, title=f"{st.session_state.g_algo} — Ready")
-        st.plotly_chart(fig, use_container_width=True)
+    if current is None:
+        with prof.stage("figure"):
+            fig = make_graph_figure(st.session_state.g_graph, None, title=f"{st.session_state.g_algo} — Ready")
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+    elif playback == "Browser (animation)":
+        st.session_state.g_playing = False
+        with prof.stage("figure"):  # frames, colors included
+            fig = _graph_animation(_run_key(st.session_state.g_algo), int(payload_mb * 1024 * 1024), int(speed_ms),
+                                   st.session_state.g_graph, trace)
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(fig.frames)} of {len(trace)} steps packed for in-browser playback.")
     else:
-        positions, edges, node_colors, edge_colors, meta = st.session_state.g_current
+        meta = current
         title = f"{st.session_state.g_algo}: Step {st.session_state.g_step}"                + (" — FOUND!" if meta.get("found") else "")
-        fig = make_graph_figure(positions, edges, title=title, node_colors=node_colors, edge_colors=edge_colors)
-        st.plotly_chart(fig, use_container_width=True)
+        fig = _render_frame(trace, title)
+        with prof.stage("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+        prof.note(view="server", step=st.session_state.g_step, algorithm=st.session_state.g_algo,
+                  nodes=st.session_state.g_graph.num_nodes)
+
+        st.session_state.g_scrub = st.session_state.g_step
+        st.slider("Scrub", min_value=0, max_value=max(1, len(trace) - 1), key="g_scrub", on_change=_on_scrub,
+                  disabled=len(trace) < 2, help="Jump to any recorded step")
 
-    if st.session_state.g_playing and not st.session_state.g_finished:
-        # speed shares the slider from Sorting page scope, so give it a default
-        delay_ms = 80
-        time.sleep(delay_ms / 1000.0)
-        _advance_once()
+    if st.session_state.g_playing and not finished:
+        settings = (st.session_state.g_algo, pacing, int(speed_ms), float(duration_s), int(max_fps))
+        if st.session_state.g_clock is None or st.session_state.g_clock[0] != settings:
+            clock = PlaybackClock(len(trace), start_step=st.session_state.g_step, fps=max_fps,
+                                  step_ms=speed_ms if pacing == "Speed per step" else None,
+                                  duration_s=duration_s if pacing == "Fixed duration" else None)
+            st.session_state.g_clock = (settings, clock)
+        clock = st.session_state.g_clock[1]
+        with prof.stage("sleep"):
+            time.sleep(clock.wait())
+        _seek(trace, clock.step_at(st.session_state.g_step))
         st.rerun()
+    elif st.session_state.g_playing:
+        st.session_state.g_playing = False
 
-    if st.session_state.g_finished and st.session_state.g_current is not None:
-        meta = st.session_state.g_current[4] if len(st.session_state.g_current) >= 5 else {}
+    if finished and current is not None and playback != "Browser (animation)":
+        meta = current
         if meta.get("found"):
             st.success("Target reached! Path highlighted in yellow.")
         else:
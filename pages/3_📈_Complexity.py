@@ -0,0 +1,122 @@
+import streamlit as st
+
+from algoviz.registry import REGISTRY, lazy
+from algoviz.sessions import track_page
+
+# numpy, plotly and the sorting modules load on first use, after the header has painted
+go = lazy("plotly.graph_objects")
+cx = lazy("algoviz.complexity")
+
+st.set_page_config(page_title="Complexity Explorer", page_icon="📈", layout="wide")
+
+ALGORITHMS = {spec.label: spec.name for spec in REGISTRY.algorithms("sorting")}
+METRIC_LABELS = {"comparisons": "Comparisons", "reads": "Reads", "writes": "Writes", "seconds": "Wall time (s)"}
+PALETTE = ("#60a5fa", "#f59e0b", "#10b981", "#ef4444", "#a78bfa", "#f472b6", "#22d3ee", "#84cc16",
+           "#fb923c", "#64748b", "#eab308")
+COLORS = {name: PALETTE[i % len(PALETTE)] for i, name in enumerate(ALGORITHMS.values())}
+DASHES = ("solid", "dot", "dash", "dashdot")
+
+st.title("📈 Complexity Explorer")
+st.caption("Sweep array sizes and input distributions headlessly, then fit growth curves to exact operation counts and wall time.")
+
+def _init_state():
+    if "cx_rows" not in st.session_state:
+        st.session_state.cx_rows = None  # sweep result rows (see algoviz.complexity.sweep)
+    if "cx_settings" not in st.session_state:
+        st.session_state.cx_settings = None  # sweep arguments the rows belong to
+
+resumed = track_page("complexity", ("cx_rows",))
+_init_state()
+
+with st.sidebar:
+    st.header("Sweep")
+    picked = st.multiselect("Algorithms", list(ALGORITHMS), default=list(ALGORITHMS))
+    lo_exp, hi_exp = st.select_slider("Array sizes (n = 2^k)", options=list(range(4, 17)), value=(4, 12),
+                                      format_func=lambda k: f"2^{k} = {2 ** k:,}")
+    shapes = st.multiselect("Input distributions", list(cx.SHAPES), default=["random"])
+    seed = st.number_input("Seed", min_value=0, max_value=10_000, value=0, step=1)
+    budget_s = st.slider("Per-run time budget (s)", min_value=0.5, max_value=20.0, value=2.0, step=0.5,
+                         help="Larger sizes are skipped once the last run, scaled as O(n²), would exceed this")
+    run_btn = st.button("Run sweep", type="primary")
+
+st.info("Runs use count-only mode: the instrumented generators execute without building frames, "
+        "and each (algorithm, n, distribution, seed) cell is cached, so re-running a sweep is instant.")
+
+def _run_sweep(settings):
+    bar = st.progress(0.0, text="Sweeping…")
+    rows = cx.sweep(*settings[:3], seed=settings[3], budget_s=settings[4],
+                 progress=lambda done, total: bar.progress(done / total, text=f"Sweeping… {done}/{total} cells"))
+    bar.empty()
+    st.session_state.cx_rows = rows
+    st.session_state.cx_settings = settings
+
+if run_btn:
+    if not picked or not shapes:
+        st.warning("Pick at least one algorithm and one distribution.")
+    else:
+        _run_sweep(([ALGORITHMS[a] for a in picked], cx.power_sizes(lo_exp, hi_exp), list(shapes), int(seed), float(budget_s)))
+elif resumed and st.session_state.cx_settings is not None:
+    # The session was compacted while idle: replay its last sweep, mostly from the cell cache
+    _run_sweep(st.session_state.cx_settings)
+
+rows = st.session_state.cx_rows
+if rows is None:
+    st.write("Choose algorithms, sizes and distributions in the sidebar, then click **Run sweep**.")
+    st.stop()
+
+measured = [r for r in rows if r["status"] == "ok"]
+series = {}
+for r in measured:
+    series.setdefault((r["algorithm"], r["shape"]), []).append(r)
+labels = {v: k for k, v in ALGORITHMS.items()}
+shape_order = list(dict.fromkeys(r["shape"] for r in rows))
+
+def _figure(metric):
+    fig = go.Figure()
+    for (algo, shape), pts in series.items():
+        ns = [p["n"] for p in pts]
+        ys = [p[metric] for p in pts]
+        name = f"{labels[algo]} · {shape}"
+        dash = DASHES[shape_order.index(shape) % len(DASHES)]
+        fig.add_trace(go.Scatter(x=ns, y=ys, mode="lines+markers", name=name, legendgroup=name,
+                                 line=dict(color=COLORS[algo], dash=dash)))
+        fits = cx.fit_growth(ns, ys)
+        if fits:
+            best = fits[0]
+            fig.add_trace(go.Scatter(x=ns, y=cx.model_curve(best["model"], best["c"], ns), mode="lines",
+                                     name=f"{best['model']} fit", legendgroup=name, showlegend=False, opacity=0.45,
+                                     line=dict(color=COLORS[algo], dash="longdash", width=1),
+                                     hovertemplate=f"{name}: {best['model']} fit, c={best['c']:.3g}<extra></extra>"))
+    fig.update_layout(height=420, margin=dict(l=10, r=10, t=40, b=10), title=METRIC_LABELS[metric],
+                      xaxis=dict(type="log", title="n"), yaxis=dict(type="log", title=METRIC_LABELS[metric]))
+    return fig
+
+tabs = st.tabs([METRIC_LABELS[m] for m in cx.METRICS])
+for tab, metric in zip(tabs, cx.METRICS):
+    with tab:
+        st.plotly_chart(_figure(metric), use_container_width=True, key=f"cx_{metric}")
+
+# --- Comparison table ---
+table = []
+for (algo, shape), pts in series.items():
+    ns = [p["n"] for p in pts]
+    last = pts[-1]
+    row = {"Algorithm": labels[algo], "Distribution": shape, "Largest n": last["n"],
+           "Comparisons": last["comparisons"], "Reads": last["reads"], "Writes": last["writes"], "Swaps": last["swaps"],
+           "Time (ms)": round(last["seconds"] * 1000.0, 2)}
+    for metric in cx.METRICS:
+        ys = [p[metric] for p in pts]
+        fits = cx.fit_growth(ns, ys)
+        row[f"{METRIC_LABELS[metric]} fit"] = f"{fits[0]['model']} (±{fits[0]['rel_error']:.0%})" if fits else "—"
+    row["Comparisons slope"] = round(cx.loglog_slope(ns, [p["comparisons"] for p in pts]), 2)
+    table.append(row)
+st.subheader("Comparison")
+st.dataframe(table, use_container_width=True, hide_index=True)
+st.caption("Fit: the growth model c·f(n) with the lowest RMS relative error. Slope: log-log slope of comparisons "
+           "(≈1 linear, a bit above 1 for n log n, ≈2 quadratic).")
+
+skipped = [r for r in rows if r["status"] != "ok"]
+if skipped:
+    with st.expander(f"Skipped cells ({len(skipped)})"):
+        st.dataframe([{"Algorithm": labels[r["algorithm"]], "Distribution": r["shape"], "n": r["n"], "Reason": r["status"]}
+                      for r in skipped], use_container_width=True, hide_index=True)
@@ -0,0 +1,86 @@
+import os
+import time
+import streamlit as st
+
+from algoviz.registry import lazy
+from algoviz.sessions import current_session_id, get_session_manager, process_rss, track_page
+
+get_trace_cache = lazy("algoviz.trace.cache:get_trace_cache")
+get_trace_store = lazy("algoviz.trace.store:get_trace_store")
+
+st.set_page_config(page_title="Diagnostics", page_icon="🩺", layout="wide")
+
+MB = 1024 * 1024
+
+st.title("🩺 Diagnostics")
+st.caption("Process memory, the shared trace cache and what every open session holds, with controls to release it.")
+
+track_page("diagnostics", ())
+sessions = get_session_manager()
+
+def _mb(nbytes):
+    return f"{nbytes / MB:,.1f} MB"
+
+def _on_ceiling():
+    sessions.resize(int(st.session_state.dx_ceiling_mb * MB))
+
+with st.sidebar:
+    st.header("Admin")
+    st.number_input("Session memory ceiling (MB)", min_value=16, max_value=1 << 20, value=max(16, sessions.max_bytes // MB),
+                    step=16, key="dx_ceiling_mb", on_change=_on_ceiling,
+                    help="Process-wide. Least recently used sessions are compacted while their total is above it "
+                         "(ALGOVIZ_SESSION_MB).")
+    idle_min = st.number_input("Idle for at least (min)", min_value=0.0, max_value=1440.0, value=0.0, step=1.0)
+    compact_btn = st.button("Compact idle sessions", use_container_width=True,
+                            help="Drops their datasets, figures and graphs; each page rebuilds them when the session returns.")
+    clear_btn = st.button("Clear trace cache", use_container_width=True)
+    st.button("Refresh", use_container_width=True)
+
+if compact_btn:
+    st.toast(f"Compacted {sessions.compact_idle(idle_min * 60.0)} session(s).")
+if clear_btn:
+    get_trace_cache().clear()
+    st.toast("Trace cache cleared.")
+
+sessions.sweep()
+stats = sessions.stats()
+cache = get_trace_cache().stats()
+rss = process_rss()
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Process RSS", _mb(rss) if rss is not None else "n/a")
+c2.metric("Session state", _mb(stats["bytes"]), help=f"Ceiling {_mb(stats['max_bytes'])}")
+c3.metric("Trace cache", _mb(cache["bytes"]), help=f"Budget {_mb(cache['max_bytes'])}")
+c4.metric("Sessions", stats["sessions"])
+
+# --- Sessions ---
+st.subheader("Sessions")
+me = current_session_id()
+rows = []
+for usage in sessions.usage():
+    largest = sorted(usage.by_key.items(), key=lambda kv: -kv[1])[:3]
+    rows.append({"Session": usage.session_id[:8] + (" (this)" if usage.session_id == me else ""),
+                 "Pages": ", ".join(usage.pages), "Last page": usage.last_page,
+                 "Idle (s)": round(usage.idle_s, 1), "Size (MB)": round(usage.nbytes / MB, 2),
+                 "Running": usage.busy, "Compactions": usage.compactions,
+                 "Largest keys": ", ".join(f"{key} {_mb(size)}" for key, size in largest if size)})
+st.dataframe(rows, use_container_width=True, hide_index=True)
+st.caption(f"Sessions idle for more than {stats['idle_s']:,.0f} s (ALGOVIZ_SESSION_IDLE_S) are compacted to their "
+           f"algorithm, input seed and step. So far: {stats['idle_compactions']} idle, "
+           f"{stats['ceiling_compactions']} over the ceiling, {stats['closed_sessions']} closed.")
+
+mine = next((usage for usage in sessions.usage() if usage.session_id == me), None)
+if mine is not None:
+    with st.expander("This session by key"):
+        st.dataframe([{"Key": key, "Bytes": size} for key, size in sorted(mine.by_key.items(), key=lambda kv: -kv[1])],
+                     use_container_width=True, hide_index=True)
+
+# --- Traces ---
+st.subheader("Trace cache and store")
+hit_rate = cache["hits"] / max(1, cache["hits"] + cache["misses"])
+st.json(dict(cache, hit_rate=round(hit_rate, 3)))
+store = get_trace_store()
+files = store.files()
+size = sum(os.path.getsize(os.path.join(store.directory, name)) for name in files)
+st.write(f"{len(files)} precomputed trace file(s), {_mb(size)} on disk in `{store.directory}`.")
+st.caption(f"Updated {time.strftime('%H:%M:%S')}.")
@@ -0,0 +1,91 @@
+"""IndexedHeap must pop in the same order as heapq over (priority, item) pairs."""
+import heapq
+import random
+
+import pytest
+
+from algoviz.algorithms.graphs.heap import IndexedHeap
+
+
+class _Reference:
+    """heapq with lazy deletion: a decrease pushes a new entry and stale ones are skipped on pop."""
+
+    def __init__(self):
+        self.heap = []
+        self.priority = {}
+
+    def push(self, item, priority):
+        self.priority[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+
+    def pop(self):
+        while True:
+            priority, item = heapq.heappop(self.heap)
+            if self.priority.get(item) == priority:
+                del self.priority[item]
+                return priority, item
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_heapq(seed):
+    rng = random.Random(seed)
+    capacity = rng.choice((1, 5, 40))
+    heap, ref = IndexedHeap(capacity), _Reference()
+    pushes = pops = decreases = 0
+    popped = set()
+    for _ in range(400):
+        action = rng.random()
+        if action < 0.4 and len(ref.priority) < capacity:
+            item = rng.choice([i for i in range(capacity) if i not in ref.priority])
+            priority = rng.randint(0, 20)  # narrow range: plenty of ties, broken on the item id
+            heap.push(item, priority)
+            ref.push(item, priority)
+            pushes += 1
+        elif action < 0.7 and ref.priority:
+            item = rng.choice(sorted(ref.priority))
+            priority = ref.priority[item] - rng.randint(0, 5)
+            heap.decrease_key(item, priority)
+            ref.push(item, priority)
+            decreases += 1
+        elif ref.priority:
+            assert heap.peek() == min((p, i) for i, p in ref.priority.items())
+            top = heap.pop()
+            assert top == ref.pop()
+            assert top[1] not in heap
+            popped.add(top[1])
+            pops += 1
+        assert len(heap) == len(ref.priority)
+        for item in range(capacity):
+            assert (item in heap) == (item in ref.priority), item
+            if item in ref.priority:
+                assert heap.priority(item) == ref.priority[item]
+    while ref.priority:
+        assert heap.pop() == ref.pop()
+        pops += 1
+    assert len(heap) == 0 and not any(item in heap for item in popped)
+    assert (heap.pushes, heap.pops, heap.decreases) == (pushes, pops, decreases)
+    assert heap.ops == pushes + pops + decreases
+
+
+def test_push_or_decrease_and_tuple_priorities():
+    heap = IndexedHeap(4)
+    assert heap.push_or_decrease(2, (3.0, 1))
+    assert heap.push_or_decrease(0, (3.0, 2))
+    assert not heap.push_or_decrease(0, (3.0, 0))
+    assert heap.priority(0) == (3.0, 0)
+    assert [heap.pop(), heap.pop()] == [((3.0, 0), 0), ((3.0, 1), 2)]
+    assert 0 not in heap and 2 not in heap
+
+
+def test_misuse_raises():
+    heap = IndexedHeap(3)
+    heap.push(1, 5)
+    with pytest.raises(KeyError):
+        heap.push(1, 4)
+    with pytest.raises(KeyError):
+        heap.decrease_key(0, 1)
+    with pytest.raises(ValueError):
+        heap.decrease_key(1, 6)
+    heap.pop()
+    with pytest.raises(KeyError):
+        heap.decrease_key(1, 1)
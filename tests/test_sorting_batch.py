@@ -0,0 +1,38 @@
+"""The NumPy batch engine must match the *_deltas generators event for event."""
+import numpy as np
+import pytest
+
+from algoviz.algorithms.sorting.batch import bubble_sort_trace, insertion_sort_trace, merge_sort_trace, quick_sort_trace
+from algoviz.algorithms.sorting.bubble import bubble_sort_deltas
+from algoviz.algorithms.sorting.insertion import insertion_sort_deltas
+from algoviz.algorithms.sorting.merge import merge_sort_deltas
+from algoviz.algorithms.sorting.quick import quick_sort_deltas
+from algoviz.inputs import SHAPES, make_input
+from algoviz.trace.sorting import SortTrace
+
+ENGINES = [
+    (bubble_sort_trace, bubble_sort_deltas),
+    (insertion_sort_trace, insertion_sort_deltas),
+    (merge_sort_trace, merge_sort_deltas),
+    (quick_sort_trace, quick_sort_deltas),
+]
+EVENT_COLUMNS = ("write_offsets", "write_idx", "write_val", "highlight", "highlight_len", "swapped")
+
+
+@pytest.mark.parametrize("n", (0, 1, 2, 37, 300))
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("batch, deltas", ENGINES, ids=lambda f: getattr(f, "__name__", ""))
+def test_batch_trace_matches_generator(batch, deltas, shape, n):
+    data = make_input(n, shape, seed=7)
+    got = batch(data)
+    want = SortTrace.record(data, deltas(data))
+
+    assert len(got) == len(want)
+    for name in EVENT_COLUMNS:
+        np.testing.assert_array_equal(getattr(got, name), getattr(want, name), err_msg=name)
+    for i in range(len(want)):
+        assert got.meta_at(i) == want.meta_at(i), i
+        assert got.ops_at(i) == want.ops_at(i), i
+    final = got.values_at(len(got) - 1).tolist()
+    assert final == want.values_at(len(want) - 1).tolist()
+    assert final == sorted(data)